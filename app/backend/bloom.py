@@ -0,0 +1,57 @@
+import hashlib
+import math
+
+
+class BloomFilter:
+    """
+    A fixed-size Bloom filter of strings.
+
+    Membership tests never give false negatives; false positives happen at roughly
+    `error_rate` once `capacity` items have been added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        if capacity <= 0:
+            raise ValueError('Bloom filter capacity must be positive')
+        if not 0 < error_rate < 1:
+            raise ValueError('Bloom filter error rate must be between 0 and 1')
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str) -> None:
+        """
+        Add an item. Items that already appear to be members (including rare false positives)
+        do not increase `count`, so re-adding values on every sync keeps it close to the number
+        of distinct items.
+
+        Params:
+            - item (str): The item to add.
+        """
+
+        added = False
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not self._bits[position >> 3] & mask:
+                self._bits[position >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def clear(self) -> None:
+        self._bits = bytearray(len(self._bits))
+        self.count = 0
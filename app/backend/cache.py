@@ -0,0 +1,252 @@
+import asyncio
+import time
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Awaitable, Callable
+from urllib.parse import urlsplit
+
+from app.config import settings
+
+PROFILE_CACHE_URL = settings.profile_cache_url
+PROFILE_CACHE_MAX_BYTES = settings.profile_cache_max_bytes
+PROFILE_CACHE_TTL_SECONDS = settings.profile_cache_ttl_seconds
+
+
+class CacheBackend(ABC):
+    """
+    A byte-string cache shared by the requests of a worker (memory) or by all workers (Redis).
+
+    Backends never raise on lookup or store failures: a cache that is down behaves like an
+    empty cache, so requests fall back to the database.
+    """
+
+    hits = 0
+    misses = 0
+    errors = 0
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        ...
+
+    async def close(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'errors': self.errors}
+
+
+class MemoryCache(CacheBackend):
+    """
+    An in-process LRU cache bounded by the total size of its keys and values.
+    """
+
+    def __init__(self, max_bytes: int, clock: Callable[[], float] = time.monotonic):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._clock = clock
+        self._data: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._data.get(key)
+        if entry is None or self._clock() >= entry[0]:
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._remove(key)
+        if len(key) + len(value) > self.max_bytes:
+            return
+
+        self._data[key] = (self._clock() + ttl, value)
+        self.size += len(key) + len(value)
+        while self.size > self.max_bytes:
+            self._remove(next(iter(self._data)))
+
+    async def delete(self, key: str) -> None:
+        self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.size -= len(key) + len(entry[1])
+
+    def stats(self) -> dict:
+        return {**super().stats(), 'size': self.size, 'max_bytes': self.max_bytes, 'entries': len(self._data)}
+
+
+class RedisError(Exception):
+    pass
+
+
+class RedisCache(CacheBackend):
+    """
+    A cache stored in Redis (or anything speaking its protocol), shared by all workers.
+
+    Only GET, SET ... PX and DEL are needed, so the backend talks RESP over a single
+    connection per worker instead of depending on a client library. Commands are
+    serialized on that connection; it is reopened after any error.
+    """
+
+    def __init__(self, host: str, port: int = 6379, db: int = 0, password: str | None = None, timeout: float = 0.5):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._lock = asyncio.Lock()
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        if self.password is not None:
+            await self._send('AUTH', self.password)
+        if self.db:
+            await self._send('SELECT', self.db)
+
+    async def _send(self, *args) -> bytes | int | None:
+        parts = [f'*{len(args)}\r\n'.encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b'$%d\r\n%s\r\n' % (len(data), data))
+        self._writer.write(b''.join(parts))
+        await self._writer.drain()
+        return await self._read_reply()
+
+    async def _read_reply(self) -> bytes | int | None:
+        line = await self._reader.readuntil(b'\r\n')
+        prefix, payload = line[:1], line[1:-2]
+        if prefix == b'+':
+            return payload
+        if prefix == b'-':
+            raise RedisError(payload.decode())
+        if prefix == b':':
+            return int(payload)
+        if prefix == b'$':
+            length = int(payload)
+            if length < 0:
+                return None
+            return (await self._reader.readexactly(length + 2))[:-2]
+        raise RedisError(f'Unsupported reply type {prefix!r}')
+
+    async def _command(self, *args) -> bytes | int | None:
+        async with self._lock:
+            try:
+                if self._writer is None:
+                    await asyncio.wait_for(self._connect(), self.timeout)
+                return await asyncio.wait_for(self._send(*args), self.timeout)
+            except (OSError, EOFError, asyncio.IncompleteReadError, asyncio.TimeoutError, RedisError, ValueError):
+                self.errors += 1
+                await self._disconnect()
+                return None
+
+    async def _disconnect(self) -> None:
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def get(self, key: str) -> bytes | None:
+        value = await self._command('GET', key)
+        if isinstance(value, bytes):
+            self.hits += 1
+            return value
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._command('SET', key, value, 'PX', max(1, int(ttl * 1000)))
+
+    async def delete(self, key: str) -> None:
+        await self._command('DEL', key)
+
+    async def close(self) -> None:
+        async with self._lock:
+            await self._disconnect()
+
+
+def create_cache(url: str, max_bytes: int = PROFILE_CACHE_MAX_BYTES) -> CacheBackend:
+    """
+    Create a cache backend from a URL.
+
+    Params:
+        - url (str): 'memory://' for an in-process cache or 'redis://[:password@]host[:port][/db]'.
+        - max_bytes (int): The size limit of the in-process cache.
+
+    Returns:
+        - CacheBackend: The cache backend.
+
+    Raises:
+        - ValueError: If the URL scheme is not supported.
+    """
+
+    parts = urlsplit(url)
+    if parts.scheme == 'memory':
+        return MemoryCache(max_bytes)
+    if parts.scheme == 'redis':
+        db = int(parts.path.lstrip('/') or 0)
+        return RedisCache(parts.hostname or 'localhost', parts.port or 6379, db, parts.password)
+    raise ValueError(f'Unsupported cache URL \'{url}\'')
+
+
+class SingleFlight:
+    """
+    Runs at most one build per key at a time; concurrent callers for the same key wait for
+    and share the result of the build already in progress.
+
+    A build runs in the task of the caller that started it, with that caller's resources. If
+    that caller is cancelled, e.g. because its client went away, the callers waiting for it
+    are not: the first of them to wake up starts the build again.
+    """
+
+    def __init__(self):
+        self._builds: dict[str, asyncio.Future] = {}
+
+    async def run(self, key: str, build: Callable[[], Awaitable]):
+        while (future := self._builds.get(key)) is not None:
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._builds[key] = future
+        try:
+            result = await build()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as error:
+            future.set_exception(error)
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._builds[key]
+
+
+profile_cache = create_cache(PROFILE_CACHE_URL)
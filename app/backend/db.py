@@ -1,5 +1,7 @@
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import NullPool
 
 from app.config import settings
 
@@ -14,6 +16,27 @@ DATABASE_URL = f'postgresql+asyncpg://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTG
 engine = create_async_engine(DATABASE_URL)
 async_session_maker = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
+# Streaming responses read from a server-side cursor for as long as the client takes to download
+# them. They connect through an engine without a pool, so they never hold one of the pool's
+# connections and close theirs as soon as the stream ends. Their number is bounded by
+# `stream_limiter` (app/routers/stream_limit.py); the profile feed adds one listener per worker.
+stream_engine = create_async_engine(DATABASE_URL, poolclass=NullPool)
+stream_session_maker = async_sessionmaker(stream_engine, expire_on_commit=False, class_=AsyncSession)
+
 
 class Base(DeclarativeBase):
     pass
+
+
+def get_constraint_name(error: IntegrityError) -> str | None:
+    """
+    Return the name of the constraint whose violation caused an IntegrityError.
+
+    Params:
+        - error (IntegrityError): The error raised by SQLAlchemy.
+
+    Returns:
+        - str | None: The constraint name reported by Postgres, if any.
+    """
+
+    return getattr(error.orig.__cause__, 'constraint_name', None)
@@ -0,0 +1,81 @@
+import time
+
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class TTLCache:
+    """
+    A bounded least-recently-used cache whose entries also expire at a given unix time.
+
+    The cache is per-process and not thread-safe; it is meant to be used from the event loop.
+    """
+
+    def __init__(self, maxsize: int, clock: Callable[[], float] = time.time):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return a cached value and mark it as recently used.
+
+        Params:
+            - key (Hashable): The cache key.
+            - default (Any): The value to return when the key is missing or expired.
+
+        Returns:
+            - Any: The cached value, or `default`.
+        """
+
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if self._clock() >= expires_at:
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, expires_at: float) -> None:
+        """
+        Store a value, evicting the least recently used entry if the cache is full.
+
+        Params:
+            - key (Hashable): The cache key.
+            - value (Any): The value to store.
+            - expires_at (float): The unix time after which the entry is no longer returned.
+        """
+
+        if self.maxsize <= 0:
+            return
+
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+        }
@@ -0,0 +1,233 @@
+import asyncio
+import json
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from typing import NamedTuple
+
+from app.backend.db import stream_engine
+from app.config import settings
+from app.models.social_profile import PROFILE_CHANGES_CHANNEL
+
+PROFILE_FEED_MAX_SUBSCRIBERS = settings.profile_feed_max_subscribers
+PROFILE_FEED_QUEUE_SIZE = settings.profile_feed_queue_size
+PROFILE_FEED_HEARTBEAT_SECONDS = settings.profile_feed_heartbeat_seconds
+
+RECONNECT_MIN_SECONDS = 0.5
+RECONNECT_MAX_SECONDS = 30.0
+PING_TIMEOUT_SECONDS = 5.0
+
+
+class ProfileEvent(NamedTuple):
+    # 'create', 'update' or 'delete' with the ids of the profiles, 'ready' once a client is
+    # subscribed, or 'resync' when events were lost and the client should reload its profiles.
+    event: str
+    ids: tuple[int, ...] = ()
+
+    def as_dict(self) -> dict:
+        return {'event': self.event, 'ids': list(self.ids)}
+
+    def as_sse(self) -> str:
+        return f'event: {self.event}\ndata: {json.dumps({"ids": list(self.ids)})}\n\n'
+
+
+READY = ProfileEvent('ready')
+RESYNC = ProfileEvent('resync')
+
+
+class Subscription:
+    """
+    The pending events of one user for one connected client.
+
+    At most `queue_size` events are kept. When a client falls further behind, its backlog is
+    replaced by a single 'resync' event, so a stalled client costs a bounded amount of memory.
+    """
+
+    __slots__ = ('user_id', 'queue_size', 'dropped', '_events', '_waiter')
+
+    def __init__(self, user_id: int, queue_size: int):
+        self.user_id = user_id
+        self.queue_size = queue_size
+        self.dropped = 0
+        # A short list is cheaper than a deque for the many clients with nothing pending.
+        self._events: list[ProfileEvent] = []
+        self._waiter: asyncio.Future | None = None
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def push(self, event: ProfileEvent) -> None:
+        if len(self._events) >= self.queue_size:
+            self.dropped += len(self._events)
+            self._events.clear()
+            event = RESYNC
+        self._events.append(event)
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def get(self, timeout: float | None = None) -> ProfileEvent | None:
+        """
+        Wait for the next event.
+
+        Params:
+            - timeout (float | None): The longest time to wait, or None to wait for ever.
+
+        Returns:
+            - ProfileEvent | None: The event, or None if none arrived in time.
+        """
+
+        if not self._events:
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await asyncio.wait_for(self._waiter, timeout)
+            except TimeoutError:
+                return None
+            finally:
+                self._waiter = None
+        return self._events.pop(0)
+
+
+class ProfileFeed:
+    """
+    Relays the profile changes announced by the database to the connected clients of this worker.
+
+    The worker holds a single connection that LISTENs to `profile_changes`, opened on the first
+    subscription. Each notification is dispatched by owner to the subscriptions of that user,
+    so a client costs no database connection and, while idle, only its bounded queue.
+
+    A connection that goes quiet may be half-open, which the driver never notices, so every
+    `heartbeat` seconds it is probed with `SELECT 1`. If the connection is lost, or the probe
+    fails or takes longer than `ping_timeout`, the connection is reopened with a growing delay
+    and every client is sent a 'resync' event, as changes made in the meantime were missed.
+    """
+
+    errors = 0
+    reconnects = 0
+
+    def __init__(
+            self,
+            db_engine: AsyncEngine = stream_engine,
+            max_subscribers: int = PROFILE_FEED_MAX_SUBSCRIBERS,
+            queue_size: int = PROFILE_FEED_QUEUE_SIZE,
+            channel: str = PROFILE_CHANGES_CHANNEL,
+            heartbeat: float = PROFILE_FEED_HEARTBEAT_SECONDS,
+            ping_timeout: float = PING_TIMEOUT_SECONDS
+    ):
+        self.max_subscribers = max_subscribers
+        self.queue_size = queue_size
+        self.channel = channel
+        self.heartbeat = heartbeat
+        self.ping_timeout = ping_timeout
+        self._db_engine = db_engine
+        self._subscribers: dict[int, list[Subscription]] = {}
+        self._count = 0
+        self._task: asyncio.Task | None = None
+        self._listening: asyncio.Event | None = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def full(self) -> bool:
+        return self._count >= self.max_subscribers
+
+    async def start(self, timeout: float = 5.0) -> bool:
+        """
+        Start listening for changes, unless already started, and wait until the LISTEN is in place.
+
+        Params:
+            - timeout (float): The longest time to wait for the database.
+
+        Returns:
+            - bool: Whether changes are being received.
+        """
+
+        if self._task is None or self._task.done():
+            self._listening = asyncio.Event()
+            self._task = asyncio.create_task(self._listen())
+        try:
+            await asyncio.wait_for(self._listening.wait(), timeout)
+        except TimeoutError:
+            return False
+        return True
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def subscribe(self, user_id: int) -> Subscription:
+        subscription = Subscription(user_id, self.queue_size)
+        self._subscribers.setdefault(user_id, []).append(subscription)
+        self._count += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscribers.get(subscription.user_id)
+        if subscriptions is None or subscription not in subscriptions:
+            return
+        subscriptions.remove(subscription)
+        self._count -= 1
+        if not subscriptions:
+            del self._subscribers[subscription.user_id]
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str) -> None:
+        # `<user_id> <op> <id>,<id>,...`; most changes belong to users without a client here,
+        # so only the owner is parsed before the lookup.
+        user_id, _, change = payload.partition(' ')
+        try:
+            subscriptions = self._subscribers.get(int(user_id))
+            if not subscriptions:
+                return
+            op, _, ids = change.partition(' ')
+            event = ProfileEvent(op, tuple(map(int, ids.split(','))))
+        except ValueError:
+            self.errors += 1
+            return
+        for subscription in subscriptions:
+            subscription.push(event)
+
+    async def _listen(self) -> None:
+        delay = RECONNECT_MIN_SECONDS
+        connected_before = False
+        while True:
+            try:
+                async with self._db_engine.connect() as conn:
+                    listener = (await conn.get_raw_connection()).driver_connection
+                    lost = asyncio.Event()
+                    listener.add_termination_listener(lambda _: lost.set())
+                    await listener.add_listener(self.channel, self._on_notification)
+                    if connected_before:
+                        self.reconnects += 1
+                        for subscriptions in self._subscribers.values():
+                            for subscription in subscriptions:
+                                subscription.push(RESYNC)
+                    connected_before = True
+                    delay = RECONNECT_MIN_SECONDS
+                    self._listening.set()
+                    try:
+                        await self._watch(listener, lost)
+                    except Exception:
+                        # Drop the socket, so closing the connection does not wait on a dead peer.
+                        listener.terminate()
+                        raise
+            except Exception:
+                self.errors += 1
+            self._listening.clear()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+
+    async def _watch(self, listener, lost: asyncio.Event) -> None:
+        # Return once the connection is reported lost; raise if it stops answering.
+        while not lost.is_set():
+            try:
+                await asyncio.wait_for(lost.wait(), self.heartbeat)
+            except TimeoutError:
+                await asyncio.wait_for(listener.fetchval('SELECT 1'), self.ping_timeout)
+
+
+profile_feed = ProfileFeed()
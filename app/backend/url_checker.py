@@ -0,0 +1,321 @@
+import asyncio
+import ipaddress
+import socket
+import time
+
+import httpcore
+import httpx
+
+from dataclasses import dataclass
+from typing import AsyncIterable, AsyncIterator, Iterable, TypeVar
+from urllib.parse import urlsplit
+
+K = TypeVar('K')
+
+USER_AGENT = 'SocialHub-LinkChecker/1.0'
+
+DEFAULT_CONCURRENCY = 100
+DEFAULT_PER_HOST = 4
+DEFAULT_HOST_DELAY = 0.25
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_MAX_REDIRECTS = 5
+
+# Idle hosts are forgotten once this many are known, so a long run over many distinct hosts
+# does not keep one entry for each of them.
+HOSTS_SWEEP_SIZE = 1024
+
+
+@dataclass(frozen=True)
+class CheckResult:
+    url: str
+    # The status of the final response after redirects, or None if no response arrived.
+    status: int | None
+    error: str | None = None
+    method: str = 'HEAD'
+    elapsed: float = 0.0
+
+    @property
+    def reachable(self) -> bool:
+        return self.status is not None and self.status < 400
+
+
+class ForbiddenAddress(Exception):
+    """
+    Raised when a host resolves to an address that is not public (loopback, private,
+    link-local such as cloud metadata endpoints, multicast or reserved) and not explicitly allowed.
+    """
+
+
+class _PublicOnlyBackend(httpcore.AsyncNetworkBackend):
+    # Checks the addresses of every connection the pool opens, whichever hop it is for, and
+    # connects to the address it checked, so the name cannot resolve to another one in between.
+
+    def __init__(
+            self,
+            backend: httpcore.AsyncNetworkBackend,
+            allowed_networks: list[ipaddress.IPv4Network | ipaddress.IPv6Network]
+    ):
+        self._backend = backend
+        self._allowed_networks = allowed_networks
+
+    async def connect_tcp(
+            self,
+            host: str,
+            port: int,
+            timeout: float | None = None,
+            local_address: str | None = None,
+            socket_options: Iterable | None = None
+    ) -> httpcore.AsyncNetworkStream:
+        addresses = await _resolve(host, port, timeout)
+        for address in addresses:
+            if not _is_allowed(address, self._allowed_networks):
+                raise ForbiddenAddress(f'{host} resolves to {address}')
+
+        error = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(
+                    str(address), port, timeout=timeout, local_address=local_address, socket_options=socket_options
+                )
+            except httpcore.ConnectError as exc:
+                error = exc
+        raise error
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+class _Host:
+    __slots__ = ('semaphore', 'next_start', 'last_start', 'checks')
+
+    def __init__(self, per_host: int):
+        self.semaphore = asyncio.Semaphore(per_host)
+        # The start time booked for the next request, and the time the latest one actually started.
+        self.next_start = 0.0
+        self.last_start = float('-inf')
+        self.checks = 0
+
+
+class UrlChecker:
+    """
+    Checks whether URLs answer, many at a time, without hammering any one host.
+
+    At most `concurrency` requests are in flight overall and `per_host` per host (and port),
+    and requests to the same host start at least `host_delay` seconds apart. A URL is asked
+    for with HEAD first; if the server refuses or mishandles HEAD it is fetched with GET,
+    without reading the body. Redirects are followed one hop at a time, each under the limits
+    and delay of the host it leads to. Connections are pooled per host and kept alive between
+    checks.
+
+    The URLs come from users, so only public addresses are connected to: a host, at any hop,
+    that resolves to a loopback, private, link-local (cloud metadata) or otherwise non-public
+    address fails with `ForbiddenAddress` before anything is sent. `allowed_networks` lets
+    given networks through anyway, e.g. a local server in tests.
+
+    Use it as an async context manager, so the pooled connections are closed at the end.
+    """
+
+    def __init__(
+            self,
+            concurrency: int = DEFAULT_CONCURRENCY,
+            per_host: int = DEFAULT_PER_HOST,
+            host_delay: float = DEFAULT_HOST_DELAY,
+            timeout: float = DEFAULT_TIMEOUT,
+            max_redirects: int = DEFAULT_MAX_REDIRECTS,
+            allowed_networks: Iterable[str] = ()
+    ):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.host_delay = host_delay
+        self.max_redirects = max_redirects
+        self._slots = asyncio.Semaphore(concurrency)
+        self._hosts: dict[str, _Host] = {}
+        self._sweep_at = HOSTS_SWEEP_SIZE
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        # Proxies from the environment are not used: the addresses connected to must be those of the hosts.
+        transport = httpx.AsyncHTTPTransport(limits=limits, trust_env=False)
+        # httpx has no option for the network backend of its pool, so it is wrapped in place.
+        transport._pool._network_backend = _PublicOnlyBackend(
+            transport._pool._network_backend, [ipaddress.ip_network(network) for network in allowed_networks]
+        )
+        self._client = httpx.AsyncClient(
+            headers={'User-Agent': USER_AGENT}, timeout=timeout, limits=limits, transport=transport, trust_env=False
+        )
+
+    async def __aenter__(self) -> 'UrlChecker':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._client.aclose()
+
+    async def check(self, url: str) -> CheckResult:
+        """
+        Check one URL.
+
+        Params:
+            - url (str): The URL to request.
+
+        Returns:
+            - CheckResult: The status of the response, or the kind of error if none arrived.
+        """
+
+        started = time.perf_counter()
+        status, error = await self._follow('HEAD', url)
+        if _retry_with_get(status, error):
+            status, error = await self._follow('GET', url)
+            return CheckResult(url, status, error, 'GET', time.perf_counter() - started)
+        return CheckResult(url, status, error, 'HEAD', time.perf_counter() - started)
+
+    async def check_all(
+            self,
+            urls: AsyncIterable[tuple[K, str]] | Iterable[tuple[K, str]],
+            window: int | None = None
+    ) -> AsyncIterator[tuple[K, CheckResult]]:
+        """
+        Check URLs concurrently, yielding results in the order they complete.
+
+        URLs are taken from `urls` only as checks finish, so a long source is never held in
+        memory and can be produced while the checks run.
+
+        Params:
+            - urls (AsyncIterable | Iterable): `(key, url)` pairs; the key is passed through.
+            - window (int | None): How many checks may be pending at once, including those
+              waiting for their host. Defaults to four times `concurrency`.
+
+        Yields:
+            - tuple[K, CheckResult]: The key and the result of each check.
+        """
+
+        window = window or self.concurrency * 4
+        source = aiter(urls) if hasattr(urls, '__aiter__') else _aiter(urls)
+        pending: set[asyncio.Task] = set()
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < window:
+                    try:
+                        key, url = await anext(source)
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    pending.add(asyncio.create_task(self._keyed_check(key, url)))
+                if not pending:
+                    return
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _forget_idle_hosts(self) -> None:
+        # A host is only idle once no check is waiting for it and its delay has run out.
+        now = time.monotonic()
+        self._hosts = {
+            key: host for key, host in self._hosts.items()
+            if host.checks or max(host.next_start, host.last_start + self.host_delay) > now
+        }
+        self._sweep_at = max(HOSTS_SWEEP_SIZE, len(self._hosts) * 2)
+
+    async def _keyed_check(self, key: K, url: str) -> tuple[K, CheckResult]:
+        return key, await self.check(url)
+
+    def _host(self, url: str) -> _Host:
+        key = urlsplit(url).netloc.rpartition('@')[2].lower()
+        host = self._hosts.get(key)
+        if host is None:
+            if len(self._hosts) >= self._sweep_at:
+                self._forget_idle_hosts()
+            host = self._hosts[key] = _Host(self.per_host)
+        return host
+
+    async def _follow(self, method: str, url: str) -> tuple[int | None, str | None]:
+        # Redirects are followed here rather than by the client, so every hop waits for its own host.
+        for _ in range(self.max_redirects + 1):
+            status, error, url = await self._request(method, url)
+            if url is None:
+                return status, error
+        return None, 'TooManyRedirects'
+
+    async def _wait_turn(self, host: _Host) -> None:
+        # Book the next start time before sleeping, so concurrent requests queue up behind it.
+        now = time.monotonic()
+        start = max(now, host.next_start)
+        host.next_start = start + self.host_delay
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    async def _wait_start(self, host: _Host) -> None:
+        # Waiting for a global slot can hold a request back until those booked after it are due
+        # too, so the delay is enforced again on the actual start times once the slot is taken.
+        now = time.monotonic()
+        start = max(now, host.last_start + self.host_delay)
+        host.last_start = start
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    async def _request(self, method: str, url: str) -> tuple[int | None, str | None, str | None]:
+        # Returns the status or the error, and the URL redirected to, if any.
+        host = self._host(url)
+        host.checks += 1
+        try:
+            # The global slot is only taken once the host's turn has come, so checks queued
+            # behind a busy host do not hold back checks of other hosts.
+            async with host.semaphore:
+                await self._wait_turn(host)
+                async with self._slots:
+                    await self._wait_start(host)
+                    try:
+                        if method == 'HEAD':
+                            response = await self._client.head(url)
+                        else:
+                            # Streaming leaves the body unread; closing the response drops it with the connection.
+                            async with self._client.stream(method, url) as response:
+                                pass
+                    except (httpx.HTTPError, httpx.InvalidURL, ForbiddenAddress) as exc:
+                        return None, type(exc).__name__, None
+        finally:
+            host.checks -= 1
+
+        if response.next_request is not None:
+            return response.status_code, None, str(response.next_request.url)
+        return response.status_code, None, None
+
+
+async def _resolve(
+        host: str, port: int, timeout: float | None
+) -> list[ipaddress.IPv4Address | ipaddress.IPv6Address]:
+    try:
+        infos = await asyncio.wait_for(
+            asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM), timeout
+        )
+    except TimeoutError as exc:
+        raise httpcore.ConnectTimeout(f'Resolving {host} timed out') from exc
+    except socket.gaierror as exc:
+        raise httpcore.ConnectError(str(exc)) from exc
+    # IPv6 addresses can carry a scope ('fe80::1%eth0'), which is not part of the address.
+    return list(dict.fromkeys(ipaddress.ip_address(info[4][0].partition('%')[0]) for info in infos))
+
+
+def _is_allowed(
+        address: ipaddress.IPv4Address | ipaddress.IPv6Address,
+        allowed_networks: list[ipaddress.IPv4Network | ipaddress.IPv6Network]
+) -> bool:
+    if isinstance(address, ipaddress.IPv6Address) and address.ipv4_mapped is not None:
+        address = address.ipv4_mapped
+    if any(address in network for network in allowed_networks):
+        return True
+    return address.is_global and not address.is_multicast
+
+
+def _retry_with_get(status: int | None, error: str | None) -> bool:
+    # Many servers answer HEAD with an error (405, 403, 404, 500...) or drop the connection
+    # while GET works. Rate limiting (429) is left alone, as another request would not help.
+    if status is None:
+        return error == 'RemoteProtocolError'
+    return status >= 400 and status != 429
+
+
+async def _aiter(items: Iterable[tuple[K, str]]) -> AsyncIterator[tuple[K, str]]:
+    for item in items:
+        yield item
@@ -1,5 +1,7 @@
 import os
 
+from typing import Literal
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -14,13 +16,51 @@ class Settings(BaseSettings):
     postgres_db: str = Field(..., alias='POSTGRES_DB')
     postgres_host: str = Field(..., alias='POSTGRES_HOST')
     postgres_port: str = Field(..., alias='POSTGRES_PORT')
+    allow_missing_pg_trgm: bool = Field(False, alias='ALLOW_MISSING_PG_TRGM')
 
     # JWT settings
     secret_key_access: str = Field(..., alias='SECRET_KEY_ACCESS')
     secret_key_refresh: str = Field(..., alias='SECRET_KEY_REFRESH')
     algorithm: str = Field(..., alias='ALGORITHM')
+    jwt_backend: Literal['jose', 'hmac'] = Field('jose', alias='JWT_BACKEND')
     access_token_expire_minutes: int = Field(..., alias='ACCESS_TOKEN_EXPIRE_MINUTES')
     refresh_token_expire_days: int = Field(..., alias='REFRESH_TOKEN_EXPIRE_DAYS')
+    token_cache_size: int = Field(10000, ge=0, alias='TOKEN_CACHE_SIZE')
+    revocation_bloom_capacity: int = Field(100000, ge=1, alias='REVOCATION_BLOOM_CAPACITY')
+    revocation_bloom_error_rate: float = Field(0.001, gt=0, lt=1, alias='REVOCATION_BLOOM_ERROR_RATE')
+    revocation_sync_seconds: int = Field(30, ge=0, alias='REVOCATION_SYNC_SECONDS')
+    availability_bloom_capacity: int = Field(1000000, ge=1, alias='AVAILABILITY_BLOOM_CAPACITY')
+    availability_bloom_error_rate: float = Field(0.01, gt=0, lt=1, alias='AVAILABILITY_BLOOM_ERROR_RATE')
+    availability_sync_seconds: int = Field(60, ge=0, alias='AVAILABILITY_SYNC_SECONDS')
+    identity_cache_size: int = Field(10000, ge=0, alias='IDENTITY_CACHE_SIZE')
+    identity_cache_ttl_seconds: int = Field(30, ge=0, alias='IDENTITY_CACHE_TTL_SECONDS')
+    confirm_current_user: bool = Field(False, alias='CONFIRM_CURRENT_USER')
+
+    # Cache settings
+    profile_cache_url: str = Field('memory://', alias='PROFILE_CACHE_URL')
+    profile_cache_max_bytes: int = Field(64 * 1024 * 1024, ge=0, alias='PROFILE_CACHE_MAX_BYTES')
+    profile_cache_ttl_seconds: int = Field(300, ge=1, alias='PROFILE_CACHE_TTL_SECONDS')
+
+    # Streaming settings
+    stream_max_connections: int = Field(10, ge=1, alias='STREAM_MAX_CONNECTIONS')
+    import_max_concurrent: int = Field(4, ge=1, alias='IMPORT_MAX_CONCURRENT')
+    platform_max_new_per_hour: int = Field(20, ge=0, alias='PLATFORM_MAX_NEW_PER_HOUR')
+
+    # Profile change feed settings
+    profile_feed_max_subscribers: int = Field(20000, ge=1, alias='PROFILE_FEED_MAX_SUBSCRIBERS')
+    profile_feed_queue_size: int = Field(64, ge=1, alias='PROFILE_FEED_QUEUE_SIZE')
+    profile_feed_heartbeat_seconds: int = Field(25, ge=1, alias='PROFILE_FEED_HEARTBEAT_SECONDS')
+
+    # Password hashing settings
+    password_hash_executor: Literal['process', 'thread'] = Field('process', alias='PASSWORD_HASH_EXECUTOR')
+    password_hash_workers: int = Field(2, ge=1, alias='PASSWORD_HASH_WORKERS')
+    password_hash_queue_size: int = Field(32, ge=0, alias='PASSWORD_HASH_QUEUE_SIZE')
+    password_hash_scheme: Literal['bcrypt', 'argon2'] = Field('bcrypt', alias='PASSWORD_HASH_SCHEME')
+    password_hash_target_ms: int = Field(250, ge=1, alias='PASSWORD_HASH_TARGET_MS')
+    bcrypt_rounds: int = Field(12, ge=4, le=31, alias='BCRYPT_ROUNDS')
+    argon2_time_cost: int = Field(2, ge=1, alias='ARGON2_TIME_COST')
+    argon2_memory_cost: int = Field(65536, ge=8, alias='ARGON2_MEMORY_COST')
+    argon2_parallelism: int = Field(2, ge=1, alias='ARGON2_PARALLELISM')
 
     model_config = SettingsConfigDict(
         env_file=DOTENV,
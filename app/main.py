@@ -1,9 +1,31 @@
 from fastapi import FastAPI
 
+from contextlib import asynccontextmanager
+
 from app.routers import social_profiles
 from app.routers.auth import routes as auth
+from app.routers.auth.hasher import password_hasher
+from app.routers.auth.revocation import revocation_index
+from app.routers.auth.availability import availability_index
+from app.routers.platform_codes import platform_codes
+from app.backend.db import async_session_maker
+from app.backend.cache import profile_cache
+from app.backend.profile_feed import profile_feed
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with async_session_maker() as db:
+        await revocation_index.sync(db)
+        await availability_index.sync(db)
+        await platform_codes.load(db)
+    yield
+    password_hasher.shutdown()
+    await profile_cache.close()
+    await profile_feed.stop()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 
 @app.get('/')
@@ -23,6 +23,9 @@ if config.config_file_name is not None:
 from app.backend.db import Base
 from app.models.user import User
 from app.models.social_profile import SocialProfile
+from app.models.revoked_token import RevokedToken
+from app.models.platform import Platform
+from app.models.profile_stat import ProfileStat
 
 target_metadata = Base.metadata
 
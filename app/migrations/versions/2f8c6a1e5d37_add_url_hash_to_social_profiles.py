@@ -0,0 +1,73 @@
+"""Add url_hash to social profiles
+
+First half of the per-user URL dedupe. It adds `url_hash`, kept up to date by a trigger,
+and hashes the existing rows in batches. Deploy the application, which stores canonical
+URLs, once this revision is applied; then canonicalize the stored URLs with
+`python -m app.tools.canonicalize_profile_urls` and upgrade to 6a0d9e3b7f14.
+
+Revision ID: 2f8c6a1e5d37
+Revises: 9b6f0e2d4a18
+Create Date: 2026-10-17 19:21:40.118532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2f8c6a1e5d37'
+down_revision: Union[str, None] = '9b6f0e2d4a18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL_BATCH_SIZE = 10000
+
+PROFILE_URL_HASH_FUNCTION = '''
+    CREATE OR REPLACE FUNCTION profile_url_hash(url varchar) RETURNS bytea
+    LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE AS $$
+        SELECT decode(md5(url), 'hex')
+    $$
+'''
+
+SET_URL_HASH_FUNCTION = '''
+    CREATE OR REPLACE FUNCTION set_profile_url_hash() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        NEW.url_hash := profile_url_hash(NEW.profile_url);
+        RETURN NEW;
+    END
+    $$
+'''
+
+SET_URL_HASH_TRIGGER = '''
+    CREATE TRIGGER social_profiles_set_url_hash
+    BEFORE INSERT OR UPDATE OF profile_url ON social_profiles
+    FOR EACH ROW EXECUTE FUNCTION set_profile_url_hash()
+'''
+
+
+def upgrade() -> None:
+    op.execute(PROFILE_URL_HASH_FUNCTION)
+    op.execute(SET_URL_HASH_FUNCTION)
+    op.add_column('social_profiles', sa.Column('url_hash', sa.LargeBinary(), nullable=True))
+    op.execute(SET_URL_HASH_TRIGGER)
+
+    # Every batch commits on its own, so no lock is held for longer than one batch. Rows
+    # written meanwhile already have their hash, set by the trigger.
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        max_id = bind.scalar(sa.text('SELECT coalesce(max(id), 0) FROM social_profiles'))
+        for start in range(0, max_id, BACKFILL_BATCH_SIZE):
+            bind.execute(sa.text('''
+                UPDATE social_profiles SET url_hash = profile_url_hash(profile_url)
+                WHERE id > :start AND id <= :stop AND url_hash IS NULL
+            '''), {'start': start, 'stop': start + BACKFILL_BATCH_SIZE})
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER social_profiles_set_url_hash ON social_profiles')
+    op.drop_column('social_profiles', 'url_hash')
+    op.execute('DROP FUNCTION set_profile_url_hash()')
+    op.execute('DROP FUNCTION profile_url_hash(varchar)')
@@ -0,0 +1,61 @@
+"""Add URL check columns to social_profiles
+
+Adds last_checked_at and status, written by `python -m app.tools.check_profile_urls`, and
+stops updates that only touch them from bumping users.profiles_version.
+
+Revision ID: 4c7b2e9f1a63
+Revises: 8e5a1c7d2b90
+Create Date: 2026-10-17 22:03:18.507236
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c7b2e9f1a63'
+down_revision: Union[str, None] = '8e5a1c7d2b90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BUMP_PROFILES_VERSION_FUNCTION = '''
+    CREATE OR REPLACE FUNCTION bump_profiles_version() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            UPDATE users SET profiles_version = profiles_version + 1
+            WHERE id IN (SELECT user_id FROM new_rows);
+        ELSIF TG_OP = 'UPDATE' THEN
+            UPDATE users SET profiles_version = profiles_version + 1
+            WHERE id IN ({updated_owners});
+        ELSE
+            UPDATE users SET profiles_version = profiles_version + 1
+            WHERE id IN (SELECT user_id FROM old_rows);
+        END IF;
+        RETURN NULL;
+    END
+    $$
+'''
+
+CHANGED_OWNERS = '''
+    SELECT unnest(ARRAY[new_rows.user_id, old_rows.user_id]) FROM new_rows JOIN old_rows USING (id)
+    WHERE (new_rows.user_id, new_rows.platform_code, new_rows.profile_url, new_rows.profile_type_code)
+          IS DISTINCT FROM (old_rows.user_id, old_rows.platform_code, old_rows.profile_url, old_rows.profile_type_code)
+'''
+
+ALL_OWNERS = 'SELECT user_id FROM new_rows UNION SELECT user_id FROM old_rows'
+
+
+def upgrade() -> None:
+    # Both columns are nullable without a default, so adding them does not rewrite the table.
+    op.add_column('social_profiles', sa.Column('last_checked_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('social_profiles', sa.Column('status', sa.SmallInteger(), nullable=True))
+    op.execute(BUMP_PROFILES_VERSION_FUNCTION.format(updated_owners=CHANGED_OWNERS))
+
+
+def downgrade() -> None:
+    op.execute(BUMP_PROFILES_VERSION_FUNCTION.format(updated_owners=ALL_OWNERS))
+    op.drop_column('social_profiles', 'status')
+    op.drop_column('social_profiles', 'last_checked_at')
@@ -0,0 +1,38 @@
+"""Index social profiles by owner and drop redundant primary key indexes
+
+Revision ID: 5d2f7b8e1c94
+Revises: 8c41e2a9d6f3
+Create Date: 2026-10-17 14:02:51.604118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2f7b8e1c94'
+down_revision: Union[str, None] = '8c41e2a9d6f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# CONCURRENTLY cannot run inside a transaction, so every statement runs in an autocommit block.
+# If building the index fails, drop the INVALID index it leaves behind before retrying.
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_social_profiles_user_id_id', 'social_profiles', ['user_id', 'id'],
+            unique=False, postgresql_concurrently=True
+        )
+        op.drop_index('ix_social_profiles_id', table_name='social_profiles', postgresql_concurrently=True)
+        op.drop_index('ix_users_id', table_name='users', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_users_id', 'users', ['id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_social_profiles_id', 'social_profiles', ['id'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_social_profiles_user_id_id', table_name='social_profiles', postgresql_concurrently=True)
@@ -0,0 +1,61 @@
+"""Add a unique (user_id, url_hash) index to social profiles
+
+Second half of the per-user URL dedupe started by 2f8c6a1e5d37. It refuses to run while
+profiles are unhashed or a user still has the same URL twice; canonicalize the stored URLs
+with `python -m app.tools.canonicalize_profile_urls --remove-duplicates` first. The index
+is built without blocking writes, and NOT NULL is set through a validated check constraint.
+
+Revision ID: 6a0d9e3b7f14
+Revises: 2f8c6a1e5d37
+Create Date: 2026-10-17 19:24:03.561207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a0d9e3b7f14'
+down_revision: Union[str, None] = '2f8c6a1e5d37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    unhashed = bind.scalar(sa.text('SELECT count(*) FROM social_profiles WHERE url_hash IS NULL'))
+    duplicates = bind.scalar(sa.text('''
+        SELECT count(*) FROM (
+            SELECT 1 FROM social_profiles GROUP BY user_id, url_hash HAVING count(*) > 1
+        ) AS duplicated
+    '''))
+    if unhashed or duplicates:
+        raise RuntimeError(
+            f'{unhashed} social profiles have no url_hash and {duplicates} URLs are stored twice for the '
+            'same user. Run `python -m app.tools.canonicalize_profile_urls --remove-duplicates` and retry.'
+        )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_social_profiles_user_id_url_hash', 'social_profiles', ['user_id', 'url_hash'],
+            unique=True, postgresql_concurrently=True
+        )
+
+    op.execute('''
+        ALTER TABLE social_profiles ADD CONSTRAINT social_profiles_url_hash_not_null
+        CHECK (url_hash IS NOT NULL) NOT VALID
+    ''')
+    with op.get_context().autocommit_block():
+        op.execute('ALTER TABLE social_profiles VALIDATE CONSTRAINT social_profiles_url_hash_not_null')
+    op.alter_column('social_profiles', 'url_hash', nullable=False)
+    op.execute('ALTER TABLE social_profiles DROP CONSTRAINT social_profiles_url_hash_not_null')
+
+
+def downgrade() -> None:
+    op.alter_column('social_profiles', 'url_hash', nullable=True)
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_social_profiles_user_id_url_hash', table_name='social_profiles', postgresql_concurrently=True
+        )
@@ -0,0 +1,112 @@
+"""Add per-user profile stats
+
+Adds profile_stats, kept up to date by statement triggers on social_profiles, and fills it
+in batches of users while the application keeps running. Profiles written while a batch
+is counted can leave its counters off; run `python -m app.tools.verify_profile_stats`
+once the upgrade is done to repair them.
+
+Revision ID: 8e5a1c7d2b90
+Revises: 6a0d9e3b7f14
+Create Date: 2026-10-17 20:12:55.804391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e5a1c7d2b90'
+down_revision: Union[str, None] = '6a0d9e3b7f14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL_BATCH_SIZE = 10000
+
+UPDATE_PROFILE_STATS_FUNCTION = '''
+    CREATE OR REPLACE FUNCTION update_profile_stats() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            INSERT INTO profile_stats AS stats (user_id, platform, profile_type, profile_count)
+            SELECT user_id, platform_code, profile_type_code, count(*) FROM new_rows
+            GROUP BY 1, 2, 3 ORDER BY 1, 2, 3
+            ON CONFLICT (user_id, platform, profile_type)
+            DO UPDATE SET profile_count = stats.profile_count + excluded.profile_count;
+            RETURN NULL;
+        END IF;
+
+        IF TG_OP = 'UPDATE' THEN
+            INSERT INTO profile_stats AS stats (user_id, platform, profile_type, profile_count)
+            SELECT user_id, platform_code, profile_type_code, sum(delta) FROM (
+                SELECT user_id, platform_code, profile_type_code, 1 AS delta FROM new_rows
+                UNION ALL
+                SELECT user_id, platform_code, profile_type_code, -1 FROM old_rows
+            ) AS changes
+            GROUP BY 1, 2, 3 HAVING sum(delta) <> 0 ORDER BY 1, 2, 3
+            ON CONFLICT (user_id, platform, profile_type)
+            DO UPDATE SET profile_count = stats.profile_count + excluded.profile_count;
+        ELSE
+            INSERT INTO profile_stats AS stats (user_id, platform, profile_type, profile_count)
+            SELECT user_id, platform_code, profile_type_code, -count(*) FROM old_rows
+            GROUP BY 1, 2, 3 ORDER BY 1, 2, 3
+            ON CONFLICT (user_id, platform, profile_type)
+            DO UPDATE SET profile_count = stats.profile_count + excluded.profile_count;
+        END IF;
+
+        DELETE FROM profile_stats AS stats USING old_rows
+        WHERE (stats.user_id, stats.platform, stats.profile_type) = (old_rows.user_id, old_rows.platform_code, old_rows.profile_type_code)
+          AND stats.profile_count <= 0;
+        RETURN NULL;
+    END
+    $$
+'''
+
+TRIGGER_EVENTS = (
+    ('INSERT', 'NEW TABLE AS new_rows'),
+    ('UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+    ('DELETE', 'OLD TABLE AS old_rows'),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'profile_stats',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('platform', sa.Integer(), nullable=False),
+        sa.Column('profile_type', postgresql.ENUM(name='profile_type', create_type=False), nullable=False),
+        sa.Column('profile_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['platform'], ['platforms.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id', 'platform', 'profile_type')
+    )
+    op.execute(UPDATE_PROFILE_STATS_FUNCTION)
+    for event_name, transition_tables in TRIGGER_EVENTS:
+        op.execute(f'''
+            CREATE TRIGGER social_profiles_update_stats_{event_name.lower()}
+            AFTER {event_name} ON social_profiles
+            REFERENCING {transition_tables}
+            FOR EACH STATEMENT EXECUTE FUNCTION update_profile_stats()
+        ''')
+
+    # Every batch commits on its own, so no lock is held for longer than one batch.
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        max_id = bind.scalar(sa.text('SELECT coalesce(max(id), 0) FROM users'))
+        for start in range(0, max_id, BACKFILL_BATCH_SIZE):
+            bind.execute(sa.text('''
+                INSERT INTO profile_stats AS stats (user_id, platform, profile_type, profile_count)
+                SELECT user_id, platform_code, profile_type_code, count(*) FROM social_profiles
+                WHERE user_id > :start AND user_id <= :stop
+                GROUP BY 1, 2, 3
+                ON CONFLICT (user_id, platform, profile_type) DO UPDATE SET profile_count = excluded.profile_count
+            '''), {'start': start, 'stop': start + BACKFILL_BATCH_SIZE})
+
+
+def downgrade() -> None:
+    for event_name, _ in TRIGGER_EVENTS:
+        op.execute(f'DROP TRIGGER social_profiles_update_stats_{event_name.lower()} ON social_profiles')
+    op.execute('DROP FUNCTION update_profile_stats()')
+    op.drop_table('profile_stats')
@@ -0,0 +1,90 @@
+"""Replace platform and profile type with their codes
+
+Second half of the switch started by e1d5b3c7a942. It drops the text columns, so run it only
+once no instance of the application that writes them is left. Every step only changes the
+catalog; thanks to the validated check constraint, NOT NULL is set without a scan. The code
+columns keep their names: renaming them would break whichever application is running.
+
+Revision ID: 9b6f0e2d4a18
+Revises: e1d5b3c7a942
+Create Date: 2026-10-17 18:09:12.377659
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b6f0e2d4a18'
+down_revision: Union[str, None] = 'e1d5b3c7a942'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SYNC_CODES_FUNCTION = '''
+    CREATE OR REPLACE FUNCTION sync_social_profile_codes() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        -- The previous application writes the text columns, the new one the codes.
+        IF TG_OP = 'INSERT' THEN
+            NEW.platform_code := coalesce(NEW.platform_code, platform_code(NEW.platform));
+            NEW.platform := coalesce(NEW.platform, platform_name(NEW.platform_code));
+            NEW.profile_type_code := coalesce(NEW.profile_type_code, NEW.profile_type::profile_type);
+            NEW.profile_type := coalesce(NEW.profile_type, NEW.profile_type_code::text);
+            RETURN NEW;
+        END IF;
+        IF NEW.platform IS DISTINCT FROM OLD.platform THEN
+            NEW.platform_code := platform_code(NEW.platform);
+        ELSIF NEW.platform_code IS DISTINCT FROM OLD.platform_code THEN
+            NEW.platform := platform_name(NEW.platform_code);
+        END IF;
+        IF NEW.profile_type IS DISTINCT FROM OLD.profile_type THEN
+            NEW.profile_type_code := NEW.profile_type::profile_type;
+        ELSIF NEW.profile_type_code IS DISTINCT FROM OLD.profile_type_code THEN
+            NEW.profile_type := NEW.profile_type_code::text;
+        END IF;
+        RETURN NEW;
+    END
+    $$
+'''
+
+SYNC_CODES_TRIGGER = '''
+    CREATE TRIGGER social_profiles_sync_codes
+    BEFORE INSERT OR UPDATE OF platform, profile_type, platform_code, profile_type_code ON social_profiles
+    FOR EACH ROW EXECUTE FUNCTION sync_social_profile_codes()
+'''
+
+
+def upgrade() -> None:
+    op.execute('DROP TRIGGER social_profiles_sync_codes ON social_profiles')
+    op.execute('DROP FUNCTION sync_social_profile_codes()')
+
+    op.alter_column('social_profiles', 'platform_code', nullable=False)
+    op.alter_column('social_profiles', 'profile_type_code', nullable=False)
+    op.execute('ALTER TABLE social_profiles DROP CONSTRAINT social_profiles_codes_not_null')
+
+    op.drop_index('ix_social_profiles_platform_profile_type', table_name='social_profiles')
+    op.drop_column('social_profiles', 'platform')
+    op.drop_column('social_profiles', 'profile_type')
+
+
+def downgrade() -> None:
+    op.add_column('social_profiles', sa.Column('platform', sa.String(), nullable=True))
+    op.add_column('social_profiles', sa.Column('profile_type', sa.String(), nullable=True))
+    op.execute('UPDATE social_profiles SET platform = platform_name(platform_code), profile_type = profile_type_code::text')
+    op.alter_column('social_profiles', 'platform', nullable=False)
+    op.alter_column('social_profiles', 'profile_type', nullable=False)
+    op.create_index(
+        'ix_social_profiles_platform_profile_type', 'social_profiles', ['platform', 'profile_type'], unique=False
+    )
+
+    op.execute('''
+        ALTER TABLE social_profiles ADD CONSTRAINT social_profiles_codes_not_null
+        CHECK (platform_code IS NOT NULL AND profile_type_code IS NOT NULL)
+    ''')
+    op.alter_column('social_profiles', 'platform_code', nullable=True)
+    op.alter_column('social_profiles', 'profile_type_code', nullable=True)
+
+    op.execute(SYNC_CODES_FUNCTION)
+    op.execute(SYNC_CODES_TRIGGER)
@@ -0,0 +1,60 @@
+"""Add profiles_version to users
+
+Revision ID: a7e3c1f05b28
+Revises: 5d2f7b8e1c94
+Create Date: 2026-10-17 15:21:37.118420
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7e3c1f05b28'
+down_revision: Union[str, None] = '5d2f7b8e1c94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRIGGERS = (
+    ('INSERT', 'NEW TABLE AS new_rows'),
+    ('UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+    ('DELETE', 'OLD TABLE AS old_rows'),
+)
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('profiles_version', sa.BigInteger(), server_default='0', nullable=False))
+    op.execute('''
+        CREATE OR REPLACE FUNCTION bump_profiles_version() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                UPDATE users SET profiles_version = profiles_version + 1
+                WHERE id IN (SELECT user_id FROM new_rows);
+            ELSIF TG_OP = 'UPDATE' THEN
+                UPDATE users SET profiles_version = profiles_version + 1
+                WHERE id IN (SELECT user_id FROM new_rows UNION SELECT user_id FROM old_rows);
+            ELSE
+                UPDATE users SET profiles_version = profiles_version + 1
+                WHERE id IN (SELECT user_id FROM old_rows);
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    ''')
+    for event_name, transition_tables in TRIGGERS:
+        op.execute(f'''
+            CREATE TRIGGER social_profiles_bump_version_{event_name.lower()}
+            AFTER {event_name} ON social_profiles
+            REFERENCING {transition_tables}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_profiles_version()
+        ''')
+
+
+def downgrade() -> None:
+    for event_name, _ in TRIGGERS:
+        op.execute(f'DROP TRIGGER social_profiles_bump_version_{event_name.lower()} ON social_profiles')
+    op.execute('DROP FUNCTION bump_profiles_version()')
+    op.drop_column('users', 'profiles_version')
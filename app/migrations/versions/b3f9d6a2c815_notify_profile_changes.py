@@ -0,0 +1,75 @@
+"""Notify profile changes
+
+Adds statement triggers on social_profiles that announce the created, updated and deleted
+profile ids of each owner on the profile_changes channel, for the change feed endpoints.
+
+Revision ID: b3f9d6a2c815
+Revises: 4c7b2e9f1a63
+Create Date: 2026-10-17 23:41:09.263518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f9d6a2c815'
+down_revision: Union[str, None] = '4c7b2e9f1a63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+NOTIFY_PROFILE_CHANGES_FUNCTION = '''
+    CREATE OR REPLACE FUNCTION notify_profile_changes() RETURNS trigger LANGUAGE plpgsql AS $$
+    DECLARE
+        op text := CASE TG_OP WHEN 'INSERT' THEN 'create' WHEN 'UPDATE' THEN 'update' ELSE 'delete' END;
+        user_ids integer[];
+        ids integer[];
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            SELECT array_agg(user_id), array_agg(id) INTO user_ids, ids FROM new_rows;
+        ELSIF TG_OP = 'UPDATE' THEN
+            SELECT array_agg(owner_id), array_agg(id) INTO user_ids, ids FROM (
+                SELECT DISTINCT unnest(ARRAY[new_rows.user_id, old_rows.user_id]) AS owner_id, id
+                FROM new_rows JOIN old_rows USING (id)
+                WHERE (new_rows.user_id, new_rows.platform_code, new_rows.profile_url, new_rows.profile_type_code)
+                      IS DISTINCT FROM (old_rows.user_id, old_rows.platform_code, old_rows.profile_url, old_rows.profile_type_code)
+            ) AS changed;
+        ELSE
+            SELECT array_agg(user_id), array_agg(id) INTO user_ids, ids FROM old_rows;
+        END IF;
+
+        PERFORM pg_notify('profile_changes', user_id || ' ' || op || ' ' || string_agg(id::text, ',' ORDER BY id))
+        FROM (
+            SELECT user_id, id, (row_number() OVER (PARTITION BY user_id ORDER BY id) - 1) / 500 AS chunk
+            FROM unnest(user_ids, ids) AS changes (user_id, id)
+        ) AS numbered
+        GROUP BY user_id, chunk;
+        RETURN NULL;
+    END
+    $$
+'''
+
+TRIGGER_EVENTS = (
+    ('INSERT', 'NEW TABLE AS new_rows'),
+    ('UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+    ('DELETE', 'OLD TABLE AS old_rows'),
+)
+
+
+def upgrade() -> None:
+    op.execute(NOTIFY_PROFILE_CHANGES_FUNCTION)
+    for event_name, transition_tables in TRIGGER_EVENTS:
+        op.execute(f'''
+            CREATE TRIGGER social_profiles_notify_{event_name.lower()}
+            AFTER {event_name} ON social_profiles
+            REFERENCING {transition_tables}
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_profile_changes()
+        ''')
+
+
+def downgrade() -> None:
+    for event_name, _ in TRIGGER_EVENTS:
+        op.execute(f'DROP TRIGGER social_profiles_notify_{event_name.lower()} ON social_profiles')
+    op.execute('DROP FUNCTION notify_profile_changes()')
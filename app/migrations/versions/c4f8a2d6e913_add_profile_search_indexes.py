@@ -0,0 +1,71 @@
+"""Add is_admin to users and profile search indexes
+
+Revision ID: c4f8a2d6e913
+Revises: a7e3c1f05b28
+Create Date: 2026-10-17 16:48:12.530267
+
+"""
+import logging
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f8a2d6e913'
+down_revision: Union[str, None] = 'a7e3c1f05b28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_pg_trgm() -> bool:
+    return op.get_bind().scalar(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm')"
+    ))
+
+
+def upgrade() -> None:
+    # URL search needs the trigram index; without pg_trgm (a contrib module, included in the
+    # official images) it scans every profile of the matching platform. The migration refuses
+    # to go on without it unless ALLOW_MISSING_PG_TRGM is set, e.g. for a local database.
+    has_pg_trgm = _has_pg_trgm()
+    if not has_pg_trgm:
+        if not settings.allow_missing_pg_trgm:
+            raise RuntimeError(
+                'The pg_trgm extension is not available on this server, so the URL search index cannot be '
+                'created. Install the Postgres contrib modules, or set ALLOW_MISSING_PG_TRGM=true to migrate '
+                'without the index, leaving URL searches to scan the table.'
+            )
+        logging.getLogger('alembic').warning(
+            'pg_trgm is not available: ix_social_profiles_profile_url_trgm is NOT created and URL searches '
+            'will scan the table (ALLOW_MISSING_PG_TRGM is set)'
+        )
+
+    op.add_column('users', sa.Column('is_admin', sa.Boolean(), server_default=sa.false(), nullable=False))
+    if has_pg_trgm:
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_social_profiles_platform_profile_type', 'social_profiles', ['platform', 'profile_type'],
+            unique=False, postgresql_concurrently=True
+        )
+        if has_pg_trgm:
+            op.create_index(
+                'ix_social_profiles_profile_url_trgm', 'social_profiles', ['profile_url'],
+                unique=False, postgresql_using='gin', postgresql_ops={'profile_url': 'gin_trgm_ops'},
+                postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_social_profiles_profile_url_trgm')
+        op.drop_index(
+            'ix_social_profiles_platform_profile_type', table_name='social_profiles', postgresql_concurrently=True
+        )
+    op.drop_column('users', 'is_admin')
@@ -0,0 +1,162 @@
+"""Add platform and profile type codes to social profiles
+
+First half of the switch of social_profiles.platform to a code referencing platforms and
+of social_profiles.profile_type to an enum. It adds and backfills the code columns while the
+application keeps running. Until 9b6f0e2d4a18 drops the text columns, a trigger fills in
+whichever side a write leaves out, so the application writing the text columns and the one
+writing the codes can run side by side while the new one is rolled out.
+
+Revision ID: e1d5b3c7a942
+Revises: c4f8a2d6e913
+Create Date: 2026-10-17 18:02:45.904113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1d5b3c7a942'
+down_revision: Union[str, None] = 'c4f8a2d6e913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PROFILE_TYPES = (
+    'personal', 'business', 'creator', 'brand', 'organization', 'public_figure',
+    'group', 'page', 'channel', 'nonprofit', 'artist', 'support', 'event',
+    'media', 'forum', 'educational', 'professional'
+)
+
+BACKFILL_BATCH_SIZE = 10000
+
+PLATFORM_CODE_FUNCTION = '''
+    CREATE OR REPLACE FUNCTION platform_code(platform_name varchar) RETURNS integer
+    LANGUAGE plpgsql STRICT AS $$
+    DECLARE
+        code integer;
+    BEGIN
+        SELECT id INTO code FROM platforms WHERE name = platform_name;
+        IF code IS NULL THEN
+            INSERT INTO platforms (name) VALUES (platform_name) ON CONFLICT (name) DO NOTHING RETURNING id INTO code;
+        END IF;
+        IF code IS NULL THEN
+            SELECT id INTO code FROM platforms WHERE name = platform_name;
+        END IF;
+        RETURN code;
+    END
+    $$
+'''
+
+PLATFORM_NAME_FUNCTION = '''
+    CREATE OR REPLACE FUNCTION platform_name(platform_code integer) RETURNS varchar
+    LANGUAGE sql STABLE STRICT PARALLEL SAFE AS $$
+        SELECT name FROM platforms WHERE id = platform_code
+    $$
+'''
+
+SYNC_CODES_FUNCTION = '''
+    CREATE OR REPLACE FUNCTION sync_social_profile_codes() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        -- The previous application writes the text columns, the new one the codes.
+        IF TG_OP = 'INSERT' THEN
+            NEW.platform_code := coalesce(NEW.platform_code, platform_code(NEW.platform));
+            NEW.platform := coalesce(NEW.platform, platform_name(NEW.platform_code));
+            NEW.profile_type_code := coalesce(NEW.profile_type_code, NEW.profile_type::profile_type);
+            NEW.profile_type := coalesce(NEW.profile_type, NEW.profile_type_code::text);
+            RETURN NEW;
+        END IF;
+        IF NEW.platform IS DISTINCT FROM OLD.platform THEN
+            NEW.platform_code := platform_code(NEW.platform);
+        ELSIF NEW.platform_code IS DISTINCT FROM OLD.platform_code THEN
+            NEW.platform := platform_name(NEW.platform_code);
+        END IF;
+        IF NEW.profile_type IS DISTINCT FROM OLD.profile_type THEN
+            NEW.profile_type_code := NEW.profile_type::profile_type;
+        ELSIF NEW.profile_type_code IS DISTINCT FROM OLD.profile_type_code THEN
+            NEW.profile_type := NEW.profile_type_code::text;
+        END IF;
+        RETURN NEW;
+    END
+    $$
+'''
+
+SYNC_CODES_TRIGGER = '''
+    CREATE TRIGGER social_profiles_sync_codes
+    BEFORE INSERT OR UPDATE OF platform, profile_type, platform_code, profile_type_code ON social_profiles
+    FOR EACH ROW EXECUTE FUNCTION sync_social_profile_codes()
+'''
+
+
+def upgrade() -> None:
+    postgresql.ENUM(*PROFILE_TYPES, name='profile_type').create(op.get_bind())
+    op.create_table(
+        'platforms',
+        sa.Column('id', sa.Integer(), sa.Identity(always=False), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+    )
+    op.execute(PLATFORM_CODE_FUNCTION)
+    op.execute(PLATFORM_NAME_FUNCTION)
+
+    op.add_column('social_profiles', sa.Column('platform_code', sa.Integer(), nullable=True))
+    op.add_column(
+        'social_profiles',
+        sa.Column('profile_type_code', postgresql.ENUM(name='profile_type', create_type=False), nullable=True)
+    )
+    op.execute(SYNC_CODES_FUNCTION)
+    op.execute(SYNC_CODES_TRIGGER)
+    op.execute('INSERT INTO platforms (name) SELECT DISTINCT platform FROM social_profiles ORDER BY 1')
+
+    # Every batch commits on its own, so no lock is held for longer than one batch. Rows
+    # written meanwhile already have their codes, set by the trigger.
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        max_id = bind.scalar(sa.text('SELECT coalesce(max(id), 0) FROM social_profiles'))
+        for start in range(0, max_id, BACKFILL_BATCH_SIZE):
+            bind.execute(sa.text('''
+                UPDATE social_profiles
+                SET platform_code = platform_code(platform), profile_type_code = profile_type::profile_type
+                WHERE id > :start AND id <= :stop AND platform_code IS NULL
+            '''), {'start': start, 'stop': start + BACKFILL_BATCH_SIZE})
+
+        op.create_index(
+            'ix_social_profiles_platform_code_profile_type_code', 'social_profiles',
+            ['platform_code', 'profile_type_code'], unique=False, postgresql_concurrently=True
+        )
+
+    # NOT VALID constraints are added without scanning the table; validating them later only
+    # blocks schema changes, not reads and writes.
+    op.execute('''
+        ALTER TABLE social_profiles ADD CONSTRAINT social_profiles_platform_code_fkey
+        FOREIGN KEY (platform_code) REFERENCES platforms (id) NOT VALID
+    ''')
+    op.execute('''
+        ALTER TABLE social_profiles ADD CONSTRAINT social_profiles_codes_not_null
+        CHECK (platform_code IS NOT NULL AND profile_type_code IS NOT NULL) NOT VALID
+    ''')
+    with op.get_context().autocommit_block():
+        op.execute('ALTER TABLE social_profiles VALIDATE CONSTRAINT social_profiles_platform_code_fkey')
+        op.execute('ALTER TABLE social_profiles VALIDATE CONSTRAINT social_profiles_codes_not_null')
+
+
+def downgrade() -> None:
+    op.execute('ALTER TABLE social_profiles DROP CONSTRAINT social_profiles_codes_not_null')
+    op.execute('ALTER TABLE social_profiles DROP CONSTRAINT social_profiles_platform_code_fkey')
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_social_profiles_platform_code_profile_type_code', table_name='social_profiles',
+            postgresql_concurrently=True
+        )
+    op.execute('DROP TRIGGER social_profiles_sync_codes ON social_profiles')
+    op.execute('DROP FUNCTION sync_social_profile_codes()')
+    op.drop_column('social_profiles', 'profile_type_code')
+    op.drop_column('social_profiles', 'platform_code')
+    op.execute('DROP FUNCTION platform_name(integer)')
+    op.execute('DROP FUNCTION platform_code(varchar)')
+    op.drop_table('platforms')
+    postgresql.ENUM(name='profile_type').drop(op.get_bind())
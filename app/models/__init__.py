@@ -1,2 +1,5 @@
 from .user import User
 from .social_profile import SocialProfile
+from .revoked_token import RevokedToken
+from .platform import Platform
+from .profile_stat import ProfileStat
@@ -0,0 +1,72 @@
+from sqlalchemy import Column, Integer, String, Identity, DDL, TypeDecorator, event
+
+from app.backend.db import Base
+
+
+class Platform(Base):
+    __tablename__ = 'platforms'
+
+    id = Column(Integer, Identity(), primary_key=True)
+    name = Column(String, unique=True, nullable=False)
+
+
+# platform_code() returns the code of a platform name, adding the platform on first use, for SQL
+# written outside the application; the application encodes names itself (see `PlatformName`).
+# The insert is part of the caller's transaction, so a rolled back write never leaves a code behind.
+PLATFORM_CODE_FUNCTION = DDL('''
+CREATE OR REPLACE FUNCTION platform_code(platform_name varchar) RETURNS integer
+LANGUAGE plpgsql STRICT AS $$
+DECLARE
+    code integer;
+BEGIN
+    SELECT id INTO code FROM platforms WHERE name = platform_name;
+    IF code IS NULL THEN
+        INSERT INTO platforms (name) VALUES (platform_name) ON CONFLICT (name) DO NOTHING RETURNING id INTO code;
+    END IF;
+    IF code IS NULL THEN
+        SELECT id INTO code FROM platforms WHERE name = platform_name;
+    END IF;
+    RETURN code;
+END
+$$
+''')
+
+PLATFORM_NAME_FUNCTION = DDL('''
+CREATE OR REPLACE FUNCTION platform_name(platform_code integer) RETURNS varchar
+LANGUAGE sql STABLE STRICT PARALLEL SAFE AS $$
+    SELECT name FROM platforms WHERE id = platform_code
+$$
+''')
+
+event.listen(Platform.__table__, 'after_create', PLATFORM_CODE_FUNCTION)
+event.listen(Platform.__table__, 'after_create', PLATFORM_NAME_FUNCTION)
+
+
+class PlatformName(TypeDecorator):
+    """
+    A platform stored as a code referencing `platforms`, read and written as its name.
+
+    Names and codes are translated by the worker's `PlatformCodes` map, which
+    `app.routers.platform_codes` sets as `codes`, so no statement looks platforms up row by
+    row. A name must be registered before it is written. A code the map does not know yet,
+    added by another worker, is read as is; `PlatformCodes.decode` resolves it.
+    """
+
+    impl = Integer
+    cache_ok = True
+
+    codes = None
+
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, int):
+            return value
+        return self.codes.code(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self.codes.name(value)
+
+    @property
+    def python_type(self) -> type:
+        return str
@@ -0,0 +1,79 @@
+from sqlalchemy import Column, Integer, ForeignKey, DDL, event
+
+from app.backend.db import Base
+
+from .platform import PlatformName
+from .social_profile import SocialProfile
+
+
+class ProfileStat(Base):
+    __tablename__ = 'profile_stats'
+
+    user_id = Column(Integer, ForeignKey('users.id'), primary_key=True)
+    platform = Column(PlatformName, ForeignKey('platforms.id'), primary_key=True)
+    profile_type = Column(SocialProfile.profile_type.type, primary_key=True)
+    profile_count = Column(Integer, nullable=False)
+
+
+# Every statement that changes social profiles adds the per-(user, platform, type) difference
+# of its rows to `profile_stats` in the same transaction; counters that drop to zero are removed.
+# Triggers fire in name order, so the owners' rows in `users` are already locked by
+# `social_profiles_bump_version_*` when the counters are touched. The stats verification
+# locks the same rows first, which keeps the two from deadlocking.
+UPDATE_PROFILE_STATS_FUNCTION = DDL('''
+CREATE OR REPLACE FUNCTION update_profile_stats() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO profile_stats AS stats (user_id, platform, profile_type, profile_count)
+        SELECT user_id, platform_code, profile_type_code, count(*) FROM new_rows
+        GROUP BY 1, 2, 3 ORDER BY 1, 2, 3
+        ON CONFLICT (user_id, platform, profile_type)
+        DO UPDATE SET profile_count = stats.profile_count + excluded.profile_count;
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'UPDATE' THEN
+        INSERT INTO profile_stats AS stats (user_id, platform, profile_type, profile_count)
+        SELECT user_id, platform_code, profile_type_code, sum(delta) FROM (
+            SELECT user_id, platform_code, profile_type_code, 1 AS delta FROM new_rows
+            UNION ALL
+            SELECT user_id, platform_code, profile_type_code, -1 FROM old_rows
+        ) AS changes
+        GROUP BY 1, 2, 3 HAVING sum(delta) <> 0 ORDER BY 1, 2, 3
+        ON CONFLICT (user_id, platform, profile_type)
+        DO UPDATE SET profile_count = stats.profile_count + excluded.profile_count;
+    ELSE
+        INSERT INTO profile_stats AS stats (user_id, platform, profile_type, profile_count)
+        SELECT user_id, platform_code, profile_type_code, -count(*) FROM old_rows
+        GROUP BY 1, 2, 3 ORDER BY 1, 2, 3
+        ON CONFLICT (user_id, platform, profile_type)
+        DO UPDATE SET profile_count = stats.profile_count + excluded.profile_count;
+    END IF;
+
+    DELETE FROM profile_stats AS stats USING old_rows
+    WHERE (stats.user_id, stats.platform, stats.profile_type) = (old_rows.user_id, old_rows.platform_code, old_rows.profile_type_code)
+      AND stats.profile_count <= 0;
+    RETURN NULL;
+END
+$$
+''')
+
+UPDATE_PROFILE_STATS_TRIGGERS = [
+    DDL(f'''
+    CREATE TRIGGER social_profiles_update_stats_{event_name.lower()}
+    AFTER {event_name} ON social_profiles
+    REFERENCING {transition_tables}
+    FOR EACH STATEMENT EXECUTE FUNCTION update_profile_stats()
+    ''')
+    for event_name, transition_tables in (
+        ('INSERT', 'NEW TABLE AS new_rows'),
+        ('UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+        ('DELETE', 'OLD TABLE AS old_rows'),
+    )
+]
+
+# The function only refers to `profile_stats` when it runs, so it can be created with
+# `social_profiles` whichever of the two tables is created first.
+event.listen(SocialProfile.__table__, 'after_create', UPDATE_PROFILE_STATS_FUNCTION)
+for trigger in UPDATE_PROFILE_STATS_TRIGGERS:
+    event.listen(SocialProfile.__table__, 'after_create', trigger)
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String, DateTime, func
+
+from app.backend.db import Base
+
+
+class RevokedToken(Base):
+    __tablename__ = 'revoked_tokens'
+
+    jti = Column(String, primary_key=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    revoked_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True)
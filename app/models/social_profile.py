@@ -1,16 +1,194 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, URL
+from sqlalchemy import Column, Integer, SmallInteger, String, LargeBinary, DateTime, Enum, ForeignKey, Index, FetchedValue, DDL, event, text
 from sqlalchemy.orm import relationship
 
 from app.backend.db import Base
 
+from .platform import PlatformName
+
+PROFILE_TYPES = (
+    'personal', 'business', 'creator', 'brand', 'organization', 'public_figure',
+    'group', 'page', 'channel', 'nonprofit', 'artist', 'support', 'event',
+    'media', 'forum', 'educational', 'professional'
+)
+
 
 class SocialProfile(Base):
     __tablename__ = 'social_profiles'
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
-    platform = Column(String, nullable=False)
+    # The codes of the platform and the profile type are stored in the columns that were added
+    # next to the former text columns (see migration e1d5b3c7a942).
+    platform = Column('platform_code', PlatformName, ForeignKey('platforms.id'), key='platform', nullable=False)
     profile_url = Column(String, nullable=False)
-    profile_type = Column(String, nullable=False)
+    profile_type = Column(
+        'profile_type_code', Enum(*PROFILE_TYPES, name='profile_type'), key='profile_type', nullable=False
+    )
+    url_hash = Column(LargeBinary, nullable=False, server_default=FetchedValue(), server_onupdate=FetchedValue())
+    # Set by the URL reachability checker: the HTTP status of the last check, or NULL when no
+    # response arrived (see `app.backend.url_checker`).
+    last_checked_at = Column(DateTime(timezone=True))
+    status = Column(SmallInteger)
 
     owner = relationship('User', back_populates='social_profiles')
+
+    __table_args__ = (
+        Index('ix_social_profiles_user_id_id', 'user_id', 'id'),
+        Index('ix_social_profiles_user_id_url_hash', 'user_id', 'url_hash', unique=True),
+        Index('ix_social_profiles_platform_code_profile_type_code', 'platform', 'profile_type'),
+        Index(
+            'ix_social_profiles_profile_url_trgm', 'profile_url',
+            postgresql_using='gin', postgresql_ops={'profile_url': 'gin_trgm_ops'}
+        ).ddl_if(callable_=lambda ddl, target, bind, **kw: has_pg_trgm(bind)),
+    )
+
+
+def has_pg_trgm(bind) -> bool:
+    """
+    Whether the pg_trgm extension can be used. It ships with the Postgres contrib modules
+    (included in the official images). The migrations require it; only `create_all`, which the
+    tests use, leaves the trigram index out without it.
+    """
+
+    return bind.scalar(text("SELECT EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm')"))
+
+
+event.listen(
+    SocialProfile.__table__,
+    'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(callable_=lambda ddl, target, bind, **kw: has_pg_trgm(bind))
+)
+
+
+# `url_hash` is a fixed-width digest of `profile_url`, kept up to date by the database for every
+# writer, so duplicate URLs are found through the (user_id, url_hash) index instead of by
+# comparing long strings. The application stores canonical URLs (see `canonicalize_url`).
+PROFILE_URL_HASH_FUNCTION = DDL('''
+CREATE OR REPLACE FUNCTION profile_url_hash(url varchar) RETURNS bytea
+LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE AS $$
+    SELECT decode(md5(url), 'hex')
+$$
+''')
+
+SET_URL_HASH_FUNCTION = DDL('''
+CREATE OR REPLACE FUNCTION set_profile_url_hash() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.url_hash := profile_url_hash(NEW.profile_url);
+    RETURN NEW;
+END
+$$
+''')
+
+SET_URL_HASH_TRIGGER = DDL('''
+CREATE TRIGGER social_profiles_set_url_hash
+BEFORE INSERT OR UPDATE OF profile_url ON social_profiles
+FOR EACH ROW EXECUTE FUNCTION set_profile_url_hash()
+''')
+
+event.listen(SocialProfile.__table__, 'before_create', PROFILE_URL_HASH_FUNCTION)
+event.listen(SocialProfile.__table__, 'after_create', SET_URL_HASH_FUNCTION)
+event.listen(SocialProfile.__table__, 'after_create', SET_URL_HASH_TRIGGER)
+
+
+# Every statement that changes social profiles bumps `users.profiles_version` of the affected
+# owners once, whatever wrote the rows (endpoints, batches, imports or manual SQL).
+# Updates that leave the columns owners see untouched, like reachability checks, bump nothing.
+# Postgres only allows transition tables on single-event triggers, hence one trigger per event,
+# and not on triggers with a column list, hence the comparison of old and new rows.
+BUMP_PROFILES_VERSION_FUNCTION = DDL('''
+CREATE OR REPLACE FUNCTION bump_profiles_version() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE users SET profiles_version = profiles_version + 1
+        WHERE id IN (SELECT user_id FROM new_rows);
+    ELSIF TG_OP = 'UPDATE' THEN
+        UPDATE users SET profiles_version = profiles_version + 1
+        WHERE id IN (
+            SELECT unnest(ARRAY[new_rows.user_id, old_rows.user_id]) FROM new_rows JOIN old_rows USING (id)
+            WHERE (new_rows.user_id, new_rows.platform_code, new_rows.profile_url, new_rows.profile_type_code)
+                  IS DISTINCT FROM (old_rows.user_id, old_rows.platform_code, old_rows.profile_url, old_rows.profile_type_code)
+        );
+    ELSE
+        UPDATE users SET profiles_version = profiles_version + 1
+        WHERE id IN (SELECT user_id FROM old_rows);
+    END IF;
+    RETURN NULL;
+END
+$$
+''')
+
+BUMP_PROFILES_VERSION_TRIGGERS = [
+    DDL(f'''
+    CREATE TRIGGER social_profiles_bump_version_{event_name.lower()}
+    AFTER {event_name} ON social_profiles
+    REFERENCING {transition_tables}
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_profiles_version()
+    ''')
+    for event_name, transition_tables in (
+        ('INSERT', 'NEW TABLE AS new_rows'),
+        ('UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+        ('DELETE', 'OLD TABLE AS old_rows'),
+    )
+]
+
+event.listen(SocialProfile.__table__, 'after_create', BUMP_PROFILES_VERSION_FUNCTION)
+for trigger in BUMP_PROFILES_VERSION_TRIGGERS:
+    event.listen(SocialProfile.__table__, 'after_create', trigger)
+
+
+# Every statement that changes social profiles notifies `profile_changes` of the ids it
+# created, updated or deleted, per owner, as `<user_id> <op> <id>,<id>,...`. Workers relay
+# them to the owners' change feeds (see `app.backend.profile_feed`). Ids are sent in chunks,
+# so a payload stays well below the 8000-byte limit of NOTIFY. Like for `profiles_version`,
+# updates that leave the columns owners see untouched are not announced.
+PROFILE_CHANGES_CHANNEL = 'profile_changes'
+PROFILE_CHANGES_CHUNK_SIZE = 500
+
+NOTIFY_PROFILE_CHANGES_FUNCTION = DDL(f'''
+CREATE OR REPLACE FUNCTION notify_profile_changes() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    op text := CASE TG_OP WHEN 'INSERT' THEN 'create' WHEN 'UPDATE' THEN 'update' ELSE 'delete' END;
+    user_ids integer[];
+    ids integer[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(user_id), array_agg(id) INTO user_ids, ids FROM new_rows;
+    ELSIF TG_OP = 'UPDATE' THEN
+        SELECT array_agg(owner_id), array_agg(id) INTO user_ids, ids FROM (
+            SELECT DISTINCT unnest(ARRAY[new_rows.user_id, old_rows.user_id]) AS owner_id, id
+            FROM new_rows JOIN old_rows USING (id)
+            WHERE (new_rows.user_id, new_rows.platform_code, new_rows.profile_url, new_rows.profile_type_code)
+                  IS DISTINCT FROM (old_rows.user_id, old_rows.platform_code, old_rows.profile_url, old_rows.profile_type_code)
+        ) AS changed;
+    ELSE
+        SELECT array_agg(user_id), array_agg(id) INTO user_ids, ids FROM old_rows;
+    END IF;
+
+    PERFORM pg_notify('{PROFILE_CHANGES_CHANNEL}', user_id || ' ' || op || ' ' || string_agg(id::text, ',' ORDER BY id))
+    FROM (
+        SELECT user_id, id, (row_number() OVER (PARTITION BY user_id ORDER BY id) - 1) / {PROFILE_CHANGES_CHUNK_SIZE} AS chunk
+        FROM unnest(user_ids, ids) AS changes (user_id, id)
+    ) AS numbered
+    GROUP BY user_id, chunk;
+    RETURN NULL;
+END
+$$
+''')
+
+NOTIFY_PROFILE_CHANGES_TRIGGERS = [
+    DDL(f'''
+    CREATE TRIGGER social_profiles_notify_{event_name.lower()}
+    AFTER {event_name} ON social_profiles
+    REFERENCING {transition_tables}
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_profile_changes()
+    ''')
+    for event_name, transition_tables in (
+        ('INSERT', 'NEW TABLE AS new_rows'),
+        ('UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+        ('DELETE', 'OLD TABLE AS old_rows'),
+    )
+]
+
+event.listen(SocialProfile.__table__, 'after_create', NOTIFY_PROFILE_CHANGES_FUNCTION)
+for trigger in NOTIFY_PROFILE_CHANGES_TRIGGERS:
+    event.listen(SocialProfile.__table__, 'after_create', trigger)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date
+from sqlalchemy import Column, Integer, BigInteger, String, Date, Boolean, true, false
 from sqlalchemy.orm import relationship
 
 from app.backend.db import Base
@@ -7,11 +7,14 @@ from app.backend.db import Base
 class User(Base):
     __tablename__ = 'users'
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     email = Column(String, unique=True, index=True, nullable=False)
     username = Column(String, unique=True, index=True, nullable=False)
     password = Column(String, nullable=False)
     phone_number = Column(String, unique=True, nullable=False)
     date_of_birth = Column(Date, nullable=False)
+    is_active = Column(Boolean, nullable=False, server_default=true())
+    is_admin = Column(Boolean, nullable=False, server_default=false())
+    profiles_version = Column(BigInteger, nullable=False, server_default='0')
 
     social_profiles = relationship('SocialProfile', back_populates='owner')
@@ -0,0 +1,127 @@
+import asyncio
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.backend.bloom import BloomFilter
+from app.models.user import User
+
+from .lookup import UNIQUE_FIELDS, user_exists
+from .consts import AVAILABILITY_BLOOM_CAPACITY, AVAILABILITY_BLOOM_ERROR_RATE, AVAILABILITY_SYNC_SECONDS
+
+# Users inserted by transactions that commit after a sync can have ids below the highest id
+# that sync saw, so every incremental sync re-reads this many ids before it.
+SYNC_OVERLAP_IDS = 1000
+SYNC_BATCH_SIZE = 5000
+
+
+class AvailabilityIndex:
+    """
+    Answers "is this email / username / phone number taken?" for the current worker.
+
+    One Bloom filter per unique field holds every value seen in `users`. Values not in the
+    filter are definitely available and are answered without touching the database; only
+    possible collisions fall through to an indexed existence check. Users registered by
+    other workers or imported in bulk are picked up by an incremental scan by id at most
+    every `sync_seconds`.
+    """
+
+    def __init__(
+            self,
+            capacity: int = AVAILABILITY_BLOOM_CAPACITY,
+            error_rate: float = AVAILABILITY_BLOOM_ERROR_RATE,
+            sync_seconds: float = AVAILABILITY_SYNC_SECONDS
+    ):
+        self.sync_seconds = sync_seconds
+        self.db_checks = 0
+        self._filters = {field: BloomFilter(capacity, error_rate) for field in UNIQUE_FIELDS}
+        # The filters being rebuilt, if any; they replace `_filters` once fully loaded.
+        self._next_filters: dict[str, BloomFilter] | None = None
+        self._last_id: int | None = None
+        self._synced_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    def add(self, **values: str) -> None:
+        """
+        Mark values as taken, e.g. right after a registration.
+
+        Params:
+            - **values (str): Field names from `UNIQUE_FIELDS` and their values.
+        """
+
+        for field, value in values.items():
+            self._filters[field].add(value)
+            if self._next_filters is not None:
+                # The rebuild may have read the table before this value was added.
+                self._next_filters[field].add(value)
+
+    async def sync(self, db: AsyncSession) -> None:
+        """
+        Stream users created since the last sync into the filters.
+
+        The filters are rebuilt with a full scan on the first sync and whenever one holds
+        more values than it was sized for. A rebuild loads new filters, which only replace
+        the current ones once the scan has completed, so a failed rebuild leaves the old
+        filters and position in place.
+
+        Params:
+            - db (AsyncSession): The database session dependency.
+        """
+
+        query = select(User.id, User.email, User.username, User.phone_number).order_by(User.id)
+
+        if self._last_id is None or any(f.count > f.capacity for f in self._filters.values()):
+            filters = self._next_filters = {
+                field: BloomFilter(bloom.capacity, bloom.error_rate) for field, bloom in self._filters.items()
+            }
+            last_id = 0
+        else:
+            query = query.where(User.id > self._last_id - SYNC_OVERLAP_IDS)
+            filters = self._filters
+            last_id = self._last_id
+
+        try:
+            rows = await db.stream(query.execution_options(yield_per=SYNC_BATCH_SIZE))
+            async for id_, email, username, phone_number in rows:
+                filters['email'].add(email)
+                filters['username'].add(username)
+                filters['phone_number'].add(phone_number)
+                last_id = max(last_id, id_)
+        finally:
+            self._next_filters = None
+
+        self._filters = filters
+        self._last_id = last_id
+        self._synced_at = time.monotonic()
+
+    async def _sync_if_stale(self, db: AsyncSession) -> None:
+        if self._synced_at is not None and time.monotonic() - self._synced_at < self.sync_seconds:
+            return
+
+        async with self._lock:
+            if self._synced_at is None or time.monotonic() - self._synced_at >= self.sync_seconds:
+                await self.sync(db)
+
+    async def is_taken(self, field_name: str, value: str, db: AsyncSession) -> bool:
+        """
+        Check whether a value of a unique field is already registered.
+
+        Params:
+            - field_name (str): One of 'email', 'username' or 'phone_number'.
+            - value (str): The value to check.
+            - db (AsyncSession): The database session dependency.
+
+        Returns:
+            - bool: True if a user with this value exists, otherwise False.
+        """
+
+        await self._sync_if_stale(db)
+        if value not in self._filters[field_name]:
+            return False
+
+        self.db_checks += 1
+        return await user_exists(field_name, value, db)
+
+
+availability_index = AvailabilityIndex()
@@ -0,0 +1,156 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
+
+from abc import ABC, abstractmethod
+
+from jose import JWTError, jwk, jwt
+
+
+class TokenExpiredError(Exception):
+    pass
+
+
+class InvalidTokenError(Exception):
+    pass
+
+
+class JWTCodec(ABC):
+    """
+    Encodes and decodes JWTs signed with a single key.
+
+    Implementations parse the key once on construction and use integer unix timestamps for
+    the `exp` claim, so a codec instance should be reused for every token signed with its key.
+    """
+
+    name: str
+
+    def __init__(self, key: str, algorithm: str):
+        self.algorithm = algorithm
+
+    @abstractmethod
+    def encode(self, claims: dict) -> str:
+        """
+        Sign the claims and return the compact JWT.
+
+        Params:
+            - claims (dict): The claims to include in the token's payload.
+
+        Returns:
+            - str: The encoded JWT.
+        """
+
+    @abstractmethod
+    def decode(self, token: str) -> dict:
+        """
+        Verify a compact JWT and return its claims.
+
+        Params:
+            - token (str): The encoded JWT.
+
+        Returns:
+            - dict: The decoded payload.
+
+        Raises:
+            - TokenExpiredError: If the `exp` claim is in the past.
+            - InvalidTokenError: If the token is malformed, its signature or claims are invalid.
+        """
+
+
+class JoseCodec(JWTCodec):
+    name = 'jose'
+
+    def __init__(self, key: str, algorithm: str):
+        super().__init__(key, algorithm)
+        self._key = jwk.construct(key, algorithm)
+
+    def encode(self, claims: dict) -> str:
+        return jwt.encode(claims, self._key, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> dict:
+        try:
+            return jwt.decode(token, self._key, algorithms=[self.algorithm])
+        except jwt.ExpiredSignatureError:
+            raise TokenExpiredError
+        except JWTError:
+            raise InvalidTokenError
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+
+def _b64decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b'=' * (-len(data) % 4))
+
+
+class HmacCodec(JWTCodec):
+    """
+    A standard library implementation of the HS256/HS384/HS512 JWS algorithms.
+
+    Produces the same compact serialization as python-jose, so tokens issued by one
+    backend are accepted by the other.
+    """
+
+    name = 'hmac'
+
+    _DIGESTS = {
+        'HS256': hashlib.sha256,
+        'HS384': hashlib.sha384,
+        'HS512': hashlib.sha512,
+    }
+
+    def __init__(self, key: str, algorithm: str):
+        if algorithm not in self._DIGESTS:
+            raise ValueError(f'\'{algorithm}\' is not supported by the hmac JWT backend')
+
+        super().__init__(key, algorithm)
+        self._signer = hmac.new(key.encode(), digestmod=self._DIGESTS[algorithm])
+        self._header = _b64encode(
+            json.dumps({'alg': algorithm, 'typ': 'JWT'}, separators=(',', ':'), sort_keys=True).encode()
+        )
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        signer = self._signer.copy()
+        signer.update(signing_input)
+        return signer.digest()
+
+    def encode(self, claims: dict) -> str:
+        payload = _b64encode(json.dumps(claims, separators=(',', ':')).encode())
+        signing_input = self._header + b'.' + payload
+        return (signing_input + b'.' + _b64encode(self._sign(signing_input))).decode()
+
+    def decode(self, token: str) -> dict:
+        try:
+            signing_input, signature = token.encode().rsplit(b'.', 1)
+            header, payload = signing_input.split(b'.', 1)
+            if header != self._header and json.loads(_b64decode(header)).get('alg') != self.algorithm:
+                raise InvalidTokenError
+            if not hmac.compare_digest(self._sign(signing_input), _b64decode(signature)):
+                raise InvalidTokenError
+            claims = json.loads(_b64decode(payload))
+        except (ValueError, AttributeError, binascii.Error, UnicodeError):
+            raise InvalidTokenError
+
+        if not isinstance(claims, dict):
+            raise InvalidTokenError
+
+        now = int(time.time())
+        try:
+            if 'nbf' in claims and int(claims['nbf']) > now:
+                raise InvalidTokenError
+            if 'exp' in claims and int(claims['exp']) < now:
+                raise TokenExpiredError
+        except (TypeError, ValueError):
+            raise InvalidTokenError
+
+        return claims
+
+
+JWT_CODECS: dict[str, type[JWTCodec]] = {
+    JoseCodec.name: JoseCodec,
+    HmacCodec.name: HmacCodec,
+}
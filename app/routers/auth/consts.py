@@ -3,5 +3,26 @@ from app.config import settings
 SECRET_KEY_ACCESS = settings.secret_key_access
 SECRET_KEY_REFRESH = settings.secret_key_refresh
 ALGORITHM = settings.algorithm
+JWT_BACKEND = settings.jwt_backend
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
 REFRESH_TOKEN_EXPIRE_DAYS = settings.refresh_token_expire_days
+TOKEN_CACHE_SIZE = settings.token_cache_size
+REVOCATION_BLOOM_CAPACITY = settings.revocation_bloom_capacity
+REVOCATION_BLOOM_ERROR_RATE = settings.revocation_bloom_error_rate
+REVOCATION_SYNC_SECONDS = settings.revocation_sync_seconds
+AVAILABILITY_BLOOM_CAPACITY = settings.availability_bloom_capacity
+AVAILABILITY_BLOOM_ERROR_RATE = settings.availability_bloom_error_rate
+AVAILABILITY_SYNC_SECONDS = settings.availability_sync_seconds
+IDENTITY_CACHE_SIZE = settings.identity_cache_size
+IDENTITY_CACHE_TTL_SECONDS = settings.identity_cache_ttl_seconds
+CONFIRM_CURRENT_USER = settings.confirm_current_user
+
+PASSWORD_HASH_EXECUTOR = settings.password_hash_executor
+PASSWORD_HASH_WORKERS = settings.password_hash_workers
+PASSWORD_HASH_QUEUE_SIZE = settings.password_hash_queue_size
+PASSWORD_HASH_SCHEME = settings.password_hash_scheme
+PASSWORD_HASH_TARGET_MS = settings.password_hash_target_ms
+BCRYPT_ROUNDS = settings.bcrypt_rounds
+ARGON2_TIME_COST = settings.argon2_time_cost
+ARGON2_MEMORY_COST = settings.argon2_memory_cost
+ARGON2_PARALLELISM = settings.argon2_parallelism
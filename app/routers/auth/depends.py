@@ -4,17 +4,24 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+import hashlib
+
 from typing import Annotated
 from datetime import datetime, timezone
 
+from app.backend.lru import TTLCache
 from app.models.user import User
 from app.schemas.auth import UserResponse
 
 from .utils import decode_token
-from .consts import SECRET_KEY_ACCESS
+from .revocation import revocation_index
+from .identity import identity_cache
+from .consts import SECRET_KEY_ACCESS, TOKEN_CACHE_SIZE, CONFIRM_CURRENT_USER
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/auth/login', scheme_name='JWT')
 
+token_cache = TTLCache(TOKEN_CACHE_SIZE)
+
 
 async def get_user_by_field(field_name: str, value: any, db: AsyncSession) -> User | None:
     """
@@ -35,7 +42,7 @@ async def get_user_by_field(field_name: str, value: any, db: AsyncSession) -> Us
     if not hasattr(User, field_name):
         raise ValueError(f'\'{field_name}\' is not a valid attribute of User')
 
-    result = await db.execute(select(User).where(getattr(User, field_name) == value))
+    result = await db.execute(select(User).where(getattr(User, field_name) == value).limit(2))
     users = result.scalars().all()
 
     if len(users) > 1:
@@ -44,10 +51,40 @@ async def get_user_by_field(field_name: str, value: any, db: AsyncSession) -> Us
     return users[0] if users else None
 
 
+def decode_access_token(token: str) -> dict:
+    """
+    Decode an access token, reusing the payload of a recently verified identical token.
+
+    Verified payloads are cached by the SHA-256 digest of the token until the token's `exp`,
+    so repeated requests with the same token skip signature verification and JSON parsing.
+
+    Params:
+        - token (str): The encoded JWT access token.
+
+    Returns:
+        - dict: The decoded payload.
+
+    Raises:
+        - HTTPException: If the token is expired or invalid (see `decode_token`).
+    """
+
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is None:
+        payload = decode_token(token, SECRET_KEY_ACCESS)
+        expire = payload.get('exp')
+        if isinstance(expire, (int, float)):
+            token_cache.set(key, payload, expire)
+    return payload
+
+
 async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]) -> UserResponse:
     """
     Retrieve the current authenticated user from the provided JWT token.
 
+    With `CONFIRM_CURRENT_USER` enabled the user is also confirmed to still exist and be
+    active through the identity cache.
+
     Params:
         - token (str): The JWT token provided by the user.
 
@@ -55,10 +92,10 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]) -> Use
         - UserResponse: The current user's ID and email.
 
     Raises:
-        - HTTPException: If the token is invalid, expired, or cannot be decoded.
+        - HTTPException: If the token is invalid, expired, revoked, or cannot be decoded.
     """
 
-    payload = decode_token(token, SECRET_KEY_ACCESS)
+    payload = decode_access_token(token)
     if payload is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -88,4 +125,72 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]) -> Use
             detail='Token expired!'
         )
 
+    jti: str | None = payload.get('jti')
+    if jti is not None and await revocation_index.is_revoked(jti):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail='Token revoked',
+            headers={'WWW-Authenticate': 'Bearer'}
+        )
+
+    if CONFIRM_CURRENT_USER:
+        identity = await identity_cache.get(id_)
+        if not identity.exists or not identity.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail='Could not validate user',
+                headers={'WWW-Authenticate': 'Bearer'}
+            )
+
     return UserResponse(id=id_, email=email)
+
+
+async def get_current_active_user(user: Annotated[UserResponse, Depends(get_current_user)]) -> UserResponse:
+    """
+    Retrieve the current authenticated user and make sure they still exist and are active.
+
+    The check goes through the identity cache, so it costs no query while the user's entry is
+    cached; a deleted or deactivated user is rejected at most `IDENTITY_CACHE_TTL_SECONDS` later.
+
+    Params:
+        - user (UserResponse): The user from the access token.
+
+    Returns:
+        - UserResponse: The current user's ID and email.
+
+    Raises:
+        - HTTPException: If the user no longer exists or is inactive.
+    """
+
+    identity = await identity_cache.get(user.id)
+    if not identity.exists or not identity.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='User not found'
+        )
+
+    return user
+
+
+async def get_current_admin(user: Annotated[UserResponse, Depends(get_current_user)]) -> UserResponse:
+    """
+    Retrieve the current authenticated user and make sure they are an active administrator.
+
+    Params:
+        - user (UserResponse): The user from the access token.
+
+    Returns:
+        - UserResponse: The current user's ID and email.
+
+    Raises:
+        - HTTPException: If the user is not an active administrator.
+    """
+
+    identity = await identity_cache.get(user.id)
+    if not identity.exists or not identity.is_active or not identity.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail='Not enough permissions'
+        )
+
+    return user
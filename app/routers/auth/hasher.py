@@ -0,0 +1,162 @@
+import asyncio
+import time
+
+from fastapi import HTTPException, status
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from .utils import verify_password, get_password_hash
+from .consts import PASSWORD_HASH_EXECUTOR, PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_SIZE
+
+
+def _timed_call(func: Callable, *args: Any) -> tuple[Any, float]:
+    """
+    Run a function inside the worker and measure how long it took there.
+
+    Params:
+        - func (Callable): The function to call. Must be picklable when a process pool is used.
+        - *args (Any): Positional arguments for the function.
+
+    Returns:
+        - tuple[Any, float]: The function result and the time spent executing it, in seconds.
+    """
+
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+@dataclass
+class TimingStats:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    @property
+    def average(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+@dataclass
+class HashingMetrics:
+    completed: int = 0
+    rejected: int = 0
+    in_flight: int = 0
+    queue_wait: TimingStats = field(default_factory=TimingStats)
+    hash_time: TimingStats = field(default_factory=TimingStats)
+
+    def snapshot(self) -> dict:
+        """
+        Return the current metric values as a plain dictionary.
+
+        Returns:
+            - dict: Counters and timings (in seconds) of the password hashing executor.
+        """
+
+        return {
+            'completed': self.completed,
+            'rejected': self.rejected,
+            'in_flight': self.in_flight,
+            'queue_wait_avg': self.queue_wait.average,
+            'queue_wait_max': self.queue_wait.max,
+            'hash_time_avg': self.hash_time.average,
+            'hash_time_max': self.hash_time.max,
+        }
+
+
+class PasswordHasher:
+    """
+    Runs password hashing and verification on a bounded worker pool, off the event loop.
+
+    At most `workers + queue_size` jobs may be in flight at once; further jobs are
+    rejected with 503 Service Unavailable instead of queueing without limit.
+    """
+
+    def __init__(self, executor_type: str = 'process', workers: int = 2, queue_size: int = 32):
+        if executor_type not in ('process', 'thread'):
+            raise ValueError(f'\'{executor_type}\' is not a valid executor type')
+
+        self.executor_type = executor_type
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.metrics = HashingMetrics()
+        self._executor: Executor | None = None
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == 'process':
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='password-hasher')
+        return self._executor
+
+    async def _submit(self, func: Callable, *args: Any) -> Any:
+        if self.metrics.in_flight >= self.capacity:
+            self.metrics.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail='Server is busy, please try again later',
+                headers={'Retry-After': '1'}
+            )
+
+        self.metrics.in_flight += 1
+        submitted = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result, hash_time = await loop.run_in_executor(self.executor, _timed_call, func, *args)
+        finally:
+            self.metrics.in_flight -= 1
+
+        self.metrics.completed += 1
+        self.metrics.hash_time.observe(hash_time)
+        self.metrics.queue_wait.observe(max(time.perf_counter() - submitted - hash_time, 0.0))
+        return result
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Verify a plain password against its hashed version on the worker pool.
+
+        Params:
+            - plain_password (str): The plain text password provided by the user.
+            - hashed_password (str): The hashed password stored in the database.
+
+        Returns:
+            - bool: True if the plain password matches the hashed password, otherwise False.
+
+        Raises:
+            - HTTPException: If the pool queue is full, raises a 503 Service Unavailable error.
+        """
+
+        return await self._submit(verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash a plain text password on the worker pool.
+
+        Params:
+            - password (str): The plain text password to hash.
+
+        Returns:
+            - str: The hashed version of the password.
+
+        Raises:
+            - HTTPException: If the pool queue is full, raises a 503 Service Unavailable error.
+        """
+
+        return await self._submit(get_password_hash, password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(PASSWORD_HASH_EXECUTOR, PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_SIZE)
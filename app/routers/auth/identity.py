@@ -0,0 +1,81 @@
+import time
+
+from sqlalchemy import select, bindparam
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from typing import NamedTuple
+
+from app.backend.db import async_session_maker
+from app.backend.lru import TTLCache
+from app.models.user import User
+
+from .consts import IDENTITY_CACHE_SIZE, IDENTITY_CACHE_TTL_SECONDS
+
+_IDENTITY_QUERY = select(User.email, User.is_active, User.is_admin).where(User.id == bindparam('user_id'))
+
+
+class Identity(NamedTuple):
+    exists: bool
+    email: str | None = None
+    is_active: bool = False
+    is_admin: bool = False
+
+
+MISSING = Identity(exists=False)
+
+
+class IdentityCache:
+    """
+    Caches what request handlers need to know about a user id: whether the user exists,
+    their email, whether the account is active and whether it belongs to an administrator.
+
+    Entries, including negative ones, live for at most `ttl_seconds`, which bounds how long a
+    deleted or deactivated user can still be accepted by a worker that does not invalidate
+    the entry itself.
+    """
+
+    def __init__(
+            self,
+            maxsize: int = IDENTITY_CACHE_SIZE,
+            ttl_seconds: float = IDENTITY_CACHE_TTL_SECONDS,
+            session_maker: async_sessionmaker = async_session_maker
+    ):
+        self.ttl_seconds = ttl_seconds
+        self._cache = TTLCache(maxsize)
+        self._session_maker = session_maker
+
+    async def get(self, user_id: int) -> Identity:
+        """
+        Return the identity of a user, loading it on a cache miss.
+
+        Params:
+            - user_id (int): The user id.
+
+        Returns:
+            - Identity: The cached or freshly loaded identity; `MISSING` if there is no such user.
+        """
+
+        identity = self._cache.get(user_id)
+        if identity is not None:
+            return identity
+
+        async with self._session_maker() as db:
+            row = (await db.execute(_IDENTITY_QUERY, {'user_id': user_id})).first()
+
+        identity = MISSING if row is None else Identity(
+            exists=True, email=row.email, is_active=row.is_active, is_admin=row.is_admin
+        )
+        self._cache.set(user_id, identity, time.time() + self.ttl_seconds)
+        return identity
+
+    def invalidate(self, user_id: int) -> None:
+        self._cache.pop(user_id)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+identity_cache = IdentityCache()
@@ -0,0 +1,64 @@
+from sqlalchemy import select, literal, bindparam
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+
+UNIQUE_FIELDS = ('email', 'username', 'phone_number')
+
+# Statements are built once at import time, so every call reuses SQLAlchemy's compiled form
+# and the driver's prepared statement instead of constructing a new query.
+_LOGIN_CREDENTIALS_QUERY = (
+    select(User.id, User.email, User.password)
+    .where(User.email == bindparam('value'))
+    .limit(2)
+)
+
+_EXISTS_QUERIES = {
+    field: select(literal(1)).where(getattr(User, field) == bindparam('value')).limit(1)
+    for field in UNIQUE_FIELDS
+}
+
+
+async def get_login_credentials(email: str, db: AsyncSession) -> Row | None:
+    """
+    Retrieve only what login needs for the user with the given email.
+
+    Params:
+        - email (str): The email to search for.
+        - db (AsyncSession): The database session dependency.
+
+    Returns:
+        - Row | None: A row with `id`, `email` and `password` if found, otherwise None.
+
+    Raises:
+        - ValueError: If multiple records are found.
+    """
+
+    rows = (await db.execute(_LOGIN_CREDENTIALS_QUERY, {'value': email})).all()
+    if len(rows) > 1:
+        raise ValueError(f'Multiple records found for field \'email\' with value \'{email}\'.')
+
+    return rows[0] if rows else None
+
+
+async def user_exists(field_name: str, value: str, db: AsyncSession) -> bool:
+    """
+    Check whether a user with the given value of a unique field exists.
+
+    Params:
+        - field_name (str): One of 'email', 'username' or 'phone_number'.
+        - value (str): The value to search for.
+        - db (AsyncSession): The database session dependency.
+
+    Returns:
+        - bool: True if such a user exists, otherwise False.
+
+    Raises:
+        - ValueError: If the field is not a unique field of User.
+    """
+
+    if field_name not in _EXISTS_QUERIES:
+        raise ValueError(f'\'{field_name}\' is not a unique attribute of User')
+
+    return await db.scalar(_EXISTS_QUERIES[field_name], {'value': value}) is not None
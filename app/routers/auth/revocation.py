@@ -0,0 +1,138 @@
+import asyncio
+import time
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from datetime import datetime, timedelta, timezone
+
+from app.backend.bloom import BloomFilter
+from app.backend.db import async_session_maker
+from app.models.revoked_token import RevokedToken
+
+from .consts import REVOCATION_BLOOM_CAPACITY, REVOCATION_BLOOM_ERROR_RATE, REVOCATION_SYNC_SECONDS
+
+# Revocations committed by other workers can become visible slightly after their `revoked_at`,
+# so every incremental sync re-reads this window before the previous watermark.
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+class RevocationIndex:
+    """
+    Answers "is this token id revoked?" for the current worker.
+
+    Every revoked `jti` is stored in the `revoked_tokens` table and added to an in-memory
+    Bloom filter. Ids that are not in the filter are definitely not revoked, so almost every
+    valid token is accepted without a database round trip; only filter hits are confirmed
+    against the table. Revocations made by other workers are picked up by an incremental
+    sync at most every `sync_seconds`.
+    """
+
+    def __init__(
+            self,
+            capacity: int = REVOCATION_BLOOM_CAPACITY,
+            error_rate: float = REVOCATION_BLOOM_ERROR_RATE,
+            sync_seconds: float = REVOCATION_SYNC_SECONDS,
+            session_maker: async_sessionmaker = async_session_maker
+    ):
+        self.sync_seconds = sync_seconds
+        self.db_checks = 0
+        self._bloom = BloomFilter(capacity, error_rate)
+        # The filter being rebuilt, if any; it replaces `_bloom` once fully loaded.
+        self._next_bloom: BloomFilter | None = None
+        self._session_maker = session_maker
+        self._watermark: datetime | None = None
+        self._synced_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    async def sync(self, db: AsyncSession) -> None:
+        """
+        Add revocations made since the last sync to the Bloom filter.
+
+        The filter is rebuilt from scratch on the first sync and whenever it holds more
+        ids than it was sized for. A rebuild loads a new filter, which only replaces the
+        current one once every id is in, so a failed rebuild leaves the old filter and
+        watermark in place.
+
+        Params:
+            - db (AsyncSession): The database session dependency.
+        """
+
+        now = datetime.now(timezone.utc)
+        query = select(RevokedToken.jti, RevokedToken.revoked_at).where(RevokedToken.expires_at > now)
+
+        if self._watermark is None or self._bloom.count > self._bloom.capacity:
+            bloom = self._next_bloom = BloomFilter(self._bloom.capacity, self._bloom.error_rate)
+            watermark = None
+        else:
+            query = query.where(RevokedToken.revoked_at >= self._watermark - SYNC_OVERLAP)
+            bloom = self._bloom
+            watermark = self._watermark
+
+        try:
+            for jti, revoked_at in await db.execute(query):
+                bloom.add(jti)
+                watermark = revoked_at if watermark is None else max(watermark, revoked_at)
+        finally:
+            self._next_bloom = None
+
+        self._bloom = bloom
+        self._watermark = watermark or now
+        self._synced_at = time.monotonic()
+
+    async def _sync_if_stale(self) -> None:
+        if self._synced_at is not None and time.monotonic() - self._synced_at < self.sync_seconds:
+            return
+
+        async with self._lock:
+            if self._synced_at is None or time.monotonic() - self._synced_at >= self.sync_seconds:
+                async with self._session_maker() as db:
+                    await self.sync(db)
+
+    async def is_revoked(self, jti: str) -> bool:
+        """
+        Check whether a token id has been revoked.
+
+        Params:
+            - jti (str): The token id.
+
+        Returns:
+            - bool: True if the token id is revoked, otherwise False.
+        """
+
+        await self._sync_if_stale()
+        if jti not in self._bloom:
+            return False
+
+        self.db_checks += 1
+        async with self._session_maker() as db:
+            return await db.scalar(select(RevokedToken.jti).where(RevokedToken.jti == jti)) is not None
+
+    async def revoke(self, jti: str, expires_at: int, db: AsyncSession) -> bool:
+        """
+        Revoke a token id. The caller is responsible for committing the session.
+
+        Params:
+            - jti (str): The token id.
+            - expires_at (int): The unix time the token expires at; the revocation is not needed after it.
+            - db (AsyncSession): The database session dependency.
+
+        Returns:
+            - bool: True if the token id was revoked by this call, False if it had already been revoked.
+        """
+
+        result = await db.execute(
+            insert(RevokedToken)
+            .values(jti=jti, expires_at=datetime.fromtimestamp(expires_at, tz=timezone.utc))
+            .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+            .returning(RevokedToken.jti)
+        )
+        self._bloom.add(jti)
+        if self._next_bloom is not None:
+            # The rebuild may have read the table before this revocation.
+            self._next_bloom.add(jti)
+        return result.scalar_one_or_none() is not None
+
+
+revocation_index = RevocationIndex()
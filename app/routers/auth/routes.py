@@ -1,21 +1,35 @@
 from fastapi import APIRouter, Depends, status, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
 
-from sqlalchemy import insert
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from typing import Annotated
 
+from app.backend.db import get_constraint_name
 from app.backend.db_depends import get_db
-from app.schemas.auth import UserCreate, TokenResponse, UserResponse
+from app.schemas.auth import UserCreate, TokenResponse, UserResponse, AvailabilityResponse
 from app.models.user import User
 
-from .depends import get_current_user, get_user_by_field
-from .utils import get_password_hash, create_access_token, create_refresh_token, verify_password, decode_token
+from .depends import get_current_user
+from .lookup import get_login_credentials
+from .utils import create_token_pair, decode_token, password_needs_update
+from .hasher import password_hasher
+from .revocation import revocation_index
+from .availability import availability_index
+from .identity import identity_cache
 from .consts import SECRET_KEY_REFRESH
 
 router = APIRouter(prefix='/auth', tags=['auth'])
 
+# Unique constraints on `users` and the registration fields they protect.
+USER_UNIQUE_CONSTRAINTS = {
+    'ix_users_email': 'email',
+    'ix_users_username': 'username',
+    'users_phone_number_key': 'phone_number',
+}
+
 
 @router.post(
     '/register',
@@ -28,33 +42,36 @@ async def register_user(
         db: Annotated[AsyncSession, Depends(get_db)],
         user_data: UserCreate
 ) -> TokenResponse:
-    _fields_to_check = {
-        'email': user_data.email,
-        'username': user_data.username,
-        'phone_number': user_data.phone_number
-    }
-
-    for field, value in _fields_to_check.items():
-        existing_user = await get_user_by_field(field, value, db)
-        if existing_user:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f'{" ".join(field.split("_")).capitalize()} already registered'
-            )
-
-    result = await db.execute(insert(User).values(
-        email=user_data.email,
-        username=user_data.username,
-        password=get_password_hash(user_data.password),
-        phone_number=user_data.phone_number,
-        date_of_birth=user_data.date_of_birth
-    ).returning(User.id))
-    await db.commit()
+    hashed_password = await password_hasher.hash(user_data.password)
+
+    try:
+        result = await db.execute(insert(User).values(
+            email=user_data.email,
+            username=user_data.username,
+            password=hashed_password,
+            phone_number=user_data.phone_number,
+            date_of_birth=user_data.date_of_birth
+        ).returning(User.id))
+        await db.commit()
+    except IntegrityError as error:
+        await db.rollback()
+        field = USER_UNIQUE_CONSTRAINTS.get(get_constraint_name(error))
+        if field is None:
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'{" ".join(field.split("_")).capitalize()} already registered'
+        )
 
     new_user_id = result.scalar_one()
+    identity_cache.invalidate(new_user_id)
+    availability_index.add(
+        email=user_data.email,
+        username=user_data.username,
+        phone_number=user_data.phone_number
+    )
 
-    access_token = create_access_token(data={'sub': user_data.email, 'id': new_user_id})
-    refresh_token = create_refresh_token(data={'sub': user_data.email, 'id': new_user_id})
+    access_token, refresh_token = create_token_pair({'sub': user_data.email, 'id': new_user_id})
 
     return TokenResponse(
         access_token=access_token,
@@ -63,6 +80,33 @@ async def register_user(
     )
 
 
+@router.get(
+    '/availability',
+    summary='Check whether registration details are available',
+    description='This endpoint checks whether an email, username and/or phone number can still be used to register. '
+                'It returns availability only for the values that were provided.',
+    response_model_exclude_none=True
+)
+async def check_availability(
+        db: Annotated[AsyncSession, Depends(get_db)],
+        email: str | None = None,
+        username: str | None = None,
+        phone_number: str | None = None
+) -> AvailabilityResponse:
+    values = {'email': email, 'username': username, 'phone_number': phone_number}
+    values = {field: value for field, value in values.items() if value is not None}
+    if not values:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='At least one of email, username or phone_number is required'
+        )
+
+    return AvailabilityResponse(**{
+        field: not await availability_index.is_taken(field, value, db)
+        for field, value in values.items()
+    })
+
+
 @router.post(
     '/login',
     summary='Log in a user',
@@ -73,15 +117,20 @@ async def login_user(
         db: Annotated[AsyncSession, Depends(get_db)],
         user_data: Annotated[OAuth2PasswordRequestForm, Depends()]
 ) -> TokenResponse:
-    user = await get_user_by_field('email', user_data.username, db)
-    if not user or not verify_password(user_data.password, user.password):
+    user = await get_login_credentials(user_data.username, db)
+    if not user or not await password_hasher.verify(user_data.password, user.password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail='Incorrect email or password'
         )
 
-    access_token = create_access_token(data={'sub': user.email, 'id': user.id})
-    refresh_token = create_refresh_token(data={'sub': user.email, 'id': user.id})
+    if password_needs_update(user.password):
+        await db.execute(update(User).where(User.id == user.id).values(
+            password=await password_hasher.hash(user_data.password)
+        ))
+        await db.commit()
+
+    access_token, refresh_token = create_token_pair({'sub': user.email, 'id': user.id})
 
     return TokenResponse(
         access_token=access_token,
@@ -94,9 +143,12 @@ async def login_user(
     '/refresh',
     summary='Refresh access and refresh tokens',
     description='This endpoint allows users to refresh their access and refresh tokens using a valid refresh token. '
-                'If the provided token is valid, new tokens are returned.'
+                'If the provided token is valid, new tokens are returned and the provided token is revoked.'
 )
-async def refresh_user_token(token: str) -> TokenResponse:
+async def refresh_user_token(
+        db: Annotated[AsyncSession, Depends(get_db)],
+        token: str
+) -> TokenResponse:
     payload = decode_token(token, SECRET_KEY_REFRESH)
     if payload is None:
         raise HTTPException(
@@ -106,14 +158,21 @@ async def refresh_user_token(token: str) -> TokenResponse:
 
     id_: str = payload.get('id')
     email: str = payload.get('sub')
-    if id_ is None or email is None:
+    jti: str = payload.get('jti')
+    if id_ is None or email is None or jti is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail='Invalid token'
         )
 
-    access_token = create_access_token(data={'sub': email, 'id': id_})
-    refresh_token = create_refresh_token(data={'sub': email, 'id': id_})
+    if not await revocation_index.revoke(jti, payload['exp'], db):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail='Token revoked'
+        )
+    await db.commit()
+
+    access_token, refresh_token = create_token_pair({'sub': email, 'id': id_})
 
     return TokenResponse(
         access_token=access_token,
@@ -122,6 +181,30 @@ async def refresh_user_token(token: str) -> TokenResponse:
     )
 
 
+@router.post(
+    '/logout',
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary='Log out a user',
+    description='This endpoint revokes the provided refresh token together with the access token issued with it. '
+                'Revoking an already revoked token has no effect.'
+)
+async def logout_user(
+        db: Annotated[AsyncSession, Depends(get_db)],
+        token: str
+) -> None:
+    payload = decode_token(token, SECRET_KEY_REFRESH)
+
+    jti: str = payload.get('jti')
+    if jti is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail='Invalid token'
+        )
+
+    await revocation_index.revoke(jti, payload['exp'], db)
+    await db.commit()
+
+
 @router.get(
     '/me',
     summary='Get current user information',
@@ -1,18 +1,76 @@
 from fastapi import HTTPException, status
 
+import time
+import uuid
+
 from passlib.context import CryptContext
-from datetime import datetime, timedelta, timezone
-from jose import JWTError, jwt
+from functools import lru_cache
 
+from .codecs import JWT_CODECS, JWTCodec, TokenExpiredError, InvalidTokenError
 from .consts import (
     SECRET_KEY_ACCESS,
     SECRET_KEY_REFRESH,
     ALGORITHM,
+    JWT_BACKEND,
     ACCESS_TOKEN_EXPIRE_MINUTES,
-    REFRESH_TOKEN_EXPIRE_DAYS
+    REFRESH_TOKEN_EXPIRE_DAYS,
+    PASSWORD_HASH_SCHEME,
+    BCRYPT_ROUNDS,
+    ARGON2_TIME_COST,
+    ARGON2_MEMORY_COST,
+    ARGON2_PARALLELISM
 )
 
-bcrypt_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
+PASSWORD_HASH_SCHEMES = ('bcrypt', 'argon2')
+
+
+def build_crypt_context(
+        scheme: str = PASSWORD_HASH_SCHEME,
+        bcrypt_rounds: int = BCRYPT_ROUNDS,
+        argon2_time_cost: int = ARGON2_TIME_COST,
+        argon2_memory_cost: int = ARGON2_MEMORY_COST,
+        argon2_parallelism: int = ARGON2_PARALLELISM
+) -> CryptContext:
+    """
+    Build the password hashing context for the given policy.
+
+    The chosen scheme is used for new hashes, while hashes made with the other scheme or with
+    a different cost are still verified and reported by `needs_update`, so they can be
+    replaced on the next successful login.
+
+    Params:
+        - scheme (str): The scheme for new hashes, 'bcrypt' or 'argon2' (argon2id).
+        - bcrypt_rounds (int): The bcrypt cost factor (log2 of the number of rounds).
+        - argon2_time_cost (int): The number of argon2 iterations.
+        - argon2_memory_cost (int): The argon2 memory usage in KiB.
+        - argon2_parallelism (int): The number of argon2 lanes.
+
+    Returns:
+        - CryptContext: The configured passlib context.
+
+    Raises:
+        - ValueError: If the scheme is not supported.
+    """
+
+    if scheme not in PASSWORD_HASH_SCHEMES:
+        raise ValueError(f'\'{scheme}\' is not a supported password hash scheme')
+
+    return CryptContext(
+        schemes=[scheme, *(s for s in PASSWORD_HASH_SCHEMES if s != scheme)],
+        deprecated='auto',
+        bcrypt__rounds=bcrypt_rounds,
+        bcrypt__min_rounds=bcrypt_rounds,
+        bcrypt__max_rounds=bcrypt_rounds,
+        argon2__type='ID',
+        argon2__rounds=argon2_time_cost,
+        argon2__min_rounds=argon2_time_cost,
+        argon2__max_rounds=argon2_time_cost,
+        argon2__memory_cost=argon2_memory_cost,
+        argon2__parallelism=argon2_parallelism
+    )
+
+
+crypt_context = build_crypt_context()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -27,12 +85,12 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         - bool: True if the plain password matches the hashed password, otherwise False.
     """
 
-    return bcrypt_context.verify(plain_password, hashed_password)
+    return crypt_context.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """
-    Hash a plain text password using bcrypt.
+    Hash a plain text password using the configured hashing scheme.
 
     Params:
         - password (str): The plain text password to hash.
@@ -41,43 +99,86 @@ def get_password_hash(password: str) -> str:
         - str: The hashed version of the password.
     """
 
-    return bcrypt_context.hash(password)
+    return crypt_context.hash(password)
 
 
-def create_access_token(data: dict) -> str:
+def password_needs_update(hashed_password: str) -> bool:
+    """
+    Check whether a stored hash was made with another scheme or cost than the current policy.
+
+    Params:
+        - hashed_password (str): The hashed password stored in the database.
+
+    Returns:
+        - bool: True if the password should be rehashed, otherwise False.
+    """
+
+    return crypt_context.needs_update(hashed_password)
+
+
+@lru_cache(maxsize=16)
+def get_codec(key: str) -> JWTCodec:
+    """
+    Return the JWT codec of the configured backend for a signing key, parsing the key only once.
+
+    Params:
+        - key (str): The secret key used to sign and verify tokens.
+
+    Returns:
+        - JWTCodec: The codec bound to the key and the configured algorithm.
+    """
+
+    return JWT_CODECS[JWT_BACKEND](key, ALGORITHM)
+
+
+def create_access_token(data: dict, issued_at: int | None = None) -> str:
     """
     Create a JWT access token with an expiration time.
 
     Params:
         - data (dict): The data to include in the token's payload.
+        - issued_at (int | None): The unix time the expiration is counted from, defaults to now.
 
     Returns:
         - str: The encoded JWT access token.
     """
 
-    to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({'exp': expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY_ACCESS, algorithm=ALGORITHM)
-    return encoded_jwt
+    now = int(time.time()) if issued_at is None else issued_at
+    return get_codec(SECRET_KEY_ACCESS).encode({**data, 'exp': now + ACCESS_TOKEN_EXPIRE_MINUTES * 60})
 
 
-def create_refresh_token(data: dict) -> str:
+def create_refresh_token(data: dict, issued_at: int | None = None) -> str:
     """
     Create a JWT refresh token with an expiration time.
 
     Params:
         - data (dict): The data to include in the token's payload.
+        - issued_at (int | None): The unix time the expiration is counted from, defaults to now.
 
     Returns:
         - str: The encoded JWT refresh token.
     """
 
-    to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({'exp': expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY_REFRESH, algorithm=ALGORITHM)
-    return encoded_jwt
+    now = int(time.time()) if issued_at is None else issued_at
+    return get_codec(SECRET_KEY_REFRESH).encode({**data, 'exp': now + REFRESH_TOKEN_EXPIRE_DAYS * 86400})
+
+
+def create_token_pair(data: dict) -> tuple[str, str]:
+    """
+    Create an access token and a refresh token for the same payload in one call.
+
+    Both tokens get the same new `jti` claim, so revoking it ends the whole pair.
+
+    Params:
+        - data (dict): The data to include in both tokens' payloads.
+
+    Returns:
+        - tuple[str, str]: The encoded access token and refresh token.
+    """
+
+    now = int(time.time())
+    data = {**data, 'jti': uuid.uuid4().hex}
+    return create_access_token(data, now), create_refresh_token(data, now)
 
 
 def decode_token(token: str, key: str) -> dict | None:
@@ -97,14 +198,13 @@ def decode_token(token: str, key: str) -> dict | None:
     """
 
     try:
-        payload = jwt.decode(token, key, algorithms=[ALGORITHM])
-        return payload
-    except jwt.ExpiredSignatureError:
+        return get_codec(key).decode(token)
+    except TokenExpiredError:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail='Token expired!'
         )
-    except JWTError:
+    except InvalidTokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail='Could not validate user'
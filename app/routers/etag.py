@@ -0,0 +1,35 @@
+import hashlib
+
+
+def make_etag(*parts) -> str:
+    """
+    Build a strong entity tag from the values a representation depends on.
+
+    Params:
+        - *parts: E.g. a version counter and the query parameters selecting the representation.
+
+    Returns:
+        - str: A quoted, opaque entity tag.
+    """
+
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Check an `If-None-Match` header against the current entity tag (weak comparison, RFC 9110).
+
+    Params:
+        - if_none_match (str | None): The header value sent by the client.
+        - etag (str): The current entity tag.
+
+    Returns:
+        - bool: True if the client's copy is current and a 304 can be sent.
+    """
+
+    if not if_none_match:
+        return False
+
+    candidates = [candidate.strip() for candidate in if_none_match.split(',')]
+    return '*' in candidates or etag.removeprefix('W/') in (c.removeprefix('W/') for c in candidates)
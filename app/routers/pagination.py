@@ -0,0 +1,68 @@
+import base64
+import binascii
+import json
+
+from fastapi import HTTPException, Request, Response, status
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(last_id: int) -> str:
+    """
+    Encode the position after which the next page starts as an opaque cursor.
+
+    Params:
+        - last_id (int): The id of the last item of the current page.
+
+    Returns:
+        - str: A URL-safe cursor.
+    """
+
+    return base64.urlsafe_b64encode(json.dumps({'id': last_id}).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Decode a cursor created by `encode_cursor`.
+
+    Params:
+        - cursor (str): The cursor received from the client.
+
+    Returns:
+        - int: The id after which the page starts.
+
+    Raises:
+        - HTTPException: If the cursor is malformed.
+    """
+
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        last_id = data['id']
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        last_id = None
+
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='Invalid cursor'
+        )
+    return last_id
+
+
+def set_next_page_headers(request: Request, response: Response, next_cursor: str | None) -> None:
+    """
+    Advertise the next page through the `Link` (rel="next") and `X-Next-Cursor` headers.
+
+    Params:
+        - request (Request): The current request; its URL is reused with the new cursor.
+        - response (Response): The response to add the headers to.
+        - next_cursor (str | None): The cursor of the next page, or None on the last page.
+    """
+
+    if next_cursor is None:
+        return
+
+    next_url = request.url.include_query_params(cursor=next_cursor)
+    response.headers['Link'] = f'<{next_url}>; rel="next"'
+    response.headers['X-Next-Cursor'] = next_cursor
@@ -0,0 +1,279 @@
+from sqlalchemy import select, any_, bindparam, event, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+
+from fastapi import HTTPException, status
+
+import math
+import time
+
+from collections import namedtuple
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Iterable, Sequence
+
+from app.config import settings
+from app.models.platform import Platform, PlatformName
+from app.models.social_profile import SocialProfile
+
+PLATFORM_MAX_NEW_PER_HOUR = settings.platform_max_new_per_hour
+PLATFORM_QUOTA_WINDOW_SECONDS = 3600
+
+_CODES_QUERY = select(Platform.name, Platform.id)
+
+_CODES_BY_NAME_QUERY = select(Platform.name, Platform.id).where(
+    Platform.name == any_(bindparam('names', type_=ARRAY(String)))
+)
+
+_NAMES_BY_CODE_QUERY = select(Platform.name, Platform.id).where(
+    Platform.id == any_(bindparam('codes', type_=ARRAY(Integer)))
+)
+
+# Platforms added by transactions of the current task, one dict per session and map. They are
+# only visible to those transactions, so they join the map once committed. The dicts live in
+# `session.info` and are emptied when the transaction ends, wherever the session is closed.
+_pending: ContextVar[tuple[dict[str, int], ...]] = ContextVar('pending_platforms', default=())
+_PENDING_KEY = 'pending_platforms'
+
+
+class PlatformCodes:
+    """
+    Maps platform names to their codes in `platforms` and back for the current worker.
+
+    Platforms are never renamed or removed, so a cached code stays valid for the life of the
+    worker. The map is loaded at startup; `PlatformName` encodes and decodes every platform
+    through it. New platforms are added in the transaction that first writes them, and join
+    the map once it commits; codes added meanwhile by other workers are looked up on the
+    caller's session when first read, see `decode`.
+
+    Platform names are free text, so each user may add at most `max_new_per_hour` platforms
+    per hour on this worker; names that already exist do not count.
+    """
+
+    def __init__(self, max_new_per_hour: int = PLATFORM_MAX_NEW_PER_HOUR):
+        self._codes: dict[str, int] = {}
+        self._names: dict[int, str] = {}
+        self.max_new_per_hour = max_new_per_hour
+        self._window_start = 0.0
+        self._added_by_user: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._codes
+
+    async def load(self, db: AsyncSession) -> None:
+        """
+        Replace the map with every platform in the database.
+
+        Params:
+            - db (AsyncSession): The database session dependency.
+        """
+
+        self.clear()
+        self._add(dict((await db.execute(_CODES_QUERY)).all()))
+
+    def code(self, name: str) -> int:
+        """
+        Return the code of a platform that is known or was added by the current transaction.
+
+        Params:
+            - name (str): The platform name.
+
+        Returns:
+            - int: The code.
+
+        Raises:
+            - LookupError: If the platform was not registered.
+        """
+
+        code = self._codes.get(name)
+        if code is None:
+            code = _pending_code(name)
+        if code is None:
+            raise LookupError(f'Platform {name!r} is not registered')
+        return code
+
+    def name(self, code: int) -> str | int:
+        """
+        Return the name of a platform that is known or was added by the current transaction.
+
+        Params:
+            - code (int): The platform code.
+
+        Returns:
+            - str | int: The name, or the code itself if the platform is not known yet.
+        """
+
+        name = self._names.get(code)
+        if name is None:
+            name = _pending_name(code)
+        return code if name is None else name
+
+    async def get(self, db: AsyncSession, name: str) -> int | None:
+        """
+        Return the code of a platform.
+
+        Params:
+            - db (AsyncSession): The database session dependency.
+            - name (str): The platform name.
+
+        Returns:
+            - int | None: The code, or None if no profile has ever used this platform.
+        """
+
+        code = self._codes.get(name)
+        if code is None:
+            code = _pending_code(name)
+        if code is None:
+            self._add(dict((await db.execute(_CODES_BY_NAME_QUERY, {'names': [name]})).all()))
+            code = self._codes.get(name)
+        return code
+
+    async def register(self, db: AsyncSession, names: Iterable[str], user_id: int | None = None) -> None:
+        """
+        Make sure platforms exist before a statement writes them.
+
+        Platforms missing from the database are added in the session's transaction, so a
+        rolled back write leaves none behind.
+
+        Params:
+            - db (AsyncSession): The session about to write the platforms.
+            - names (Iterable[str]): The platform names about to be written.
+            - user_id (int | None): The user writing them, whose new platforms are limited.
+
+        Raises:
+            - HTTPException: If the user has added too many platforms within the hour, raises a
+              429 Too Many Requests error.
+        """
+
+        await db.run_sync(self._register, names, user_id)
+
+    async def decode(self, db: AsyncSession, rows: Sequence[Row]) -> Sequence:
+        """
+        Resolve the platforms that rows read while their code was not in the map yet.
+
+        Params:
+            - db (AsyncSession): The session the rows were read with.
+            - rows (Sequence[Row]): Rows with a `platform` read through `PlatformName`.
+
+        Returns:
+            - Sequence: The rows, those with an unknown platform replaced by named tuples.
+        """
+
+        if not rows or 'platform' not in rows[0]._fields:
+            return rows
+        index = rows[0]._fields.index('platform')
+        unknown = {row[index] for row in rows if isinstance(row[index], int)}
+        if not unknown:
+            return rows
+
+        self._add(dict((await db.execute(_NAMES_BY_CODE_QUERY, {'codes': list(unknown)})).all()))
+        row_type = _row_type(rows[0]._fields)
+        return [
+            row_type(*row[:index], self._names[row[index]], *row[index + 1:]) if isinstance(row[index], int) else row
+            for row in rows
+        ]
+
+    def clear(self) -> None:
+        self._codes.clear()
+        self._names.clear()
+        self._added_by_user.clear()
+
+    def _add(self, codes: dict[str, int]) -> None:
+        self._codes.update(codes)
+        self._names.update((code, name) for name, code in codes.items())
+
+    def _register(self, session: Session, names: Iterable[str], user_id: int | None = None) -> None:
+        missing = sorted({name for name in names if name not in self._codes and _pending_code(name) is None})
+        if not missing:
+            return
+
+        # Added by other workers since the map was loaded.
+        self._add(dict(session.execute(_CODES_BY_NAME_QUERY, {'names': missing}).all()))
+        new = [name for name in missing if name not in self._codes]
+        if not new:
+            return
+        if user_id is not None:
+            self._take_quota(user_id, len(new))
+
+        added = dict(session.execute(
+            insert(Platform).values([{'name': name} for name in new])
+            .on_conflict_do_nothing(index_elements=['name'])
+            .returning(Platform.name, Platform.id)
+        ).all())
+        if len(added) < len(new):
+            # Added by a concurrent transaction, which the insert waited for.
+            self._add(dict(session.execute(
+                _CODES_BY_NAME_QUERY, {'names': [name for name in new if name not in added]}
+            ).all()))
+
+        pending = session.info.setdefault(_PENDING_KEY, {}).setdefault(self, {})
+        pending.update(added)
+        _pending.set((*(other for other in _pending.get() if other and other is not pending), pending))
+
+    def _take_quota(self, user_id: int, count: int) -> None:
+        now = time.monotonic()
+        if now - self._window_start >= PLATFORM_QUOTA_WINDOW_SECONDS:
+            self._window_start = now
+            self._added_by_user.clear()
+
+        added = self._added_by_user.get(user_id, 0) + count
+        if added > self.max_new_per_hour:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f'At most {self.max_new_per_hour} new platforms can be added per hour',
+                headers={'Retry-After': str(math.ceil(self._window_start + PLATFORM_QUOTA_WINDOW_SECONDS - now))}
+            )
+        self._added_by_user[user_id] = added
+
+
+def _pending_code(name: str) -> int | None:
+    return next((added[name] for added in _pending.get() if name in added), None)
+
+
+def _pending_name(code: int) -> str | None:
+    return next((name for added in _pending.get() for name, pending in added.items() if pending == code), None)
+
+
+@lru_cache(maxsize=None)
+def _row_type(fields: tuple[str, ...]) -> type:
+    return namedtuple('DecodedRow', fields)
+
+
+@event.listens_for(Session, 'before_flush')
+def _register_flushed_platforms(session: Session, flush_context, instances) -> None:
+    # Profiles added or changed through the ORM have their new platforms registered too.
+    names = {
+        profile.platform for profile in (*session.new, *session.dirty)
+        if isinstance(profile, SocialProfile) and isinstance(profile.platform, str)
+    }
+    if names:
+        PlatformName.codes._register(session, names)
+
+
+@event.listens_for(Session, 'after_commit')
+def _share_committed_platforms(session: Session) -> None:
+    for codes, added in session.info.get(_PENDING_KEY, {}).items():
+        codes._add(added)
+    _forget_pending_platforms(session)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_pending_platforms(session: Session) -> None:
+    for added in session.info.pop(_PENDING_KEY, {}).values():
+        added.clear()
+
+
+@event.listens_for(Session, 'after_transaction_end')
+def _forget_pending_platforms_on_close(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:
+        _forget_pending_platforms(session)
+
+
+platform_codes = PlatformCodes()
+
+PlatformName.codes = platform_codes
@@ -0,0 +1,57 @@
+import csv
+import io
+import json
+
+from typing import AsyncIterator, Literal
+
+from app.backend.db import stream_session_maker
+from app.routers.platform_codes import platform_codes
+
+ExportFormat = Literal['ndjson', 'csv']
+
+EXPORT_COLUMNS = ('id', 'user_id', 'platform', 'profile_url', 'profile_type')
+EXPORT_MEDIA_TYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv; charset=utf-8'}
+EXPORT_CHUNK_SIZE = 1000
+
+
+def _ndjson_chunk(rows: list) -> bytes:
+    return ''.join(json.dumps(dict(zip(EXPORT_COLUMNS, row))) + '\n' for row in rows).encode()
+
+
+def _csv_chunk(rows: list, header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    writer.writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def export_filename(export_format: ExportFormat, user_id: int | None = None) -> str:
+    return f'social_profiles{f"_{user_id}" if user_id is not None else ""}.{export_format}'
+
+
+async def export_profiles(query, export_format: ExportFormat) -> AsyncIterator[bytes]:
+    """
+    Encode profiles as NDJSON or CSV while they are fetched from a server-side cursor.
+
+    Rows are fetched and encoded `EXPORT_CHUNK_SIZE` at a time, so memory use does not
+    depend on the size of the export. The cursor is read on a connection of its own, which
+    is closed as soon as the export ends or the client goes away.
+
+    Params:
+        - query: A select statement returning `EXPORT_COLUMNS`.
+        - export_format (ExportFormat): 'ndjson' or 'csv'; CSV starts with a header row.
+
+    Yields:
+        - bytes: The encoded rows of one chunk.
+    """
+
+    if export_format == 'csv':
+        yield _csv_chunk([], header=True)
+
+    async with stream_session_maker() as db:
+        result = await db.stream(query.execution_options(yield_per=EXPORT_CHUNK_SIZE))
+        async for rows in result.partitions():
+            rows = await platform_codes.decode(db, rows)
+            yield _ndjson_chunk(rows) if export_format == 'ndjson' else _csv_chunk(rows)
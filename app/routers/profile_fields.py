@@ -0,0 +1,78 @@
+from fastapi import HTTPException, status
+
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+
+from functools import lru_cache
+
+from app.models.social_profile import SocialProfile
+from app.schemas.social_profiles import SocialProfileResponse
+
+PROFILE_FIELDS = tuple(SocialProfileResponse.model_fields)
+
+
+def parse_fields(fields: str | None) -> tuple[str, ...]:
+    """
+    Parse the `fields` query parameter of the profile read endpoints.
+
+    Params:
+        - fields (str | None): Comma-separated field names, or None for every field.
+
+    Returns:
+        - tuple[str, ...]: The requested fields in their canonical order.
+
+    Raises:
+        - HTTPException: If a field name is not a field of SocialProfileResponse.
+    """
+
+    if fields is None:
+        return PROFILE_FIELDS
+
+    requested = {field.strip() for field in fields.split(',') if field.strip()}
+    invalid = sorted(requested.difference(PROFILE_FIELDS))
+    if invalid or not requested:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'Invalid fields: {", ".join(invalid) or "none given"}. '
+                   f'Valid options are: {", ".join(PROFILE_FIELDS)}'
+        )
+    return tuple(field for field in PROFILE_FIELDS if field in requested)
+
+
+def selected_columns(fields: tuple[str, ...]) -> tuple:
+    """
+    Return the columns to select for a sparse fieldset; `id` is always selected because
+    pagination needs it, even when it is not part of the response.
+    """
+
+    return tuple(getattr(SocialProfile, field) for field in PROFILE_FIELDS if field in fields or field == 'id')
+
+
+@lru_cache(maxsize=None)
+def get_response_model(fields: tuple[str, ...]) -> type[BaseModel]:
+    """
+    Build (once per fieldset) a response model with only the given fields of SocialProfileResponse.
+
+    Params:
+        - fields (tuple[str, ...]): Field names as returned by `parse_fields`.
+
+    Returns:
+        - type[BaseModel]: SocialProfileResponse itself for the full fieldset, otherwise a trimmed model.
+    """
+
+    if fields == PROFILE_FIELDS:
+        return SocialProfileResponse
+
+    definitions = {
+        field: (SocialProfileResponse.model_fields[field].annotation, SocialProfileResponse.model_fields[field])
+        for field in fields
+    }
+    return create_model(
+        f'SocialProfileResponse_{"_".join(fields)}',
+        __config__=ConfigDict(from_attributes=True),
+        **definitions
+    )
+
+
+@lru_cache(maxsize=None)
+def get_list_adapter(fields: tuple[str, ...]) -> TypeAdapter:
+    return TypeAdapter(list[get_response_model(fields)])
@@ -0,0 +1,286 @@
+import codecs
+import csv
+import json
+
+from collections import deque
+
+from fastapi import HTTPException, Request, status
+from multipart.exceptions import MultipartParseError
+from multipart.multipart import MultipartParser, parse_options_header
+
+from typing import AsyncIterator, Literal
+
+from app.config import settings
+from app.routers.stream_limit import StreamLimiter
+
+ImportFormat = Literal['csv', 'ndjson']
+
+IMPORT_FILE_FIELD = 'file'
+IMPORT_CHUNK_SIZE = 500
+MAX_IMPORT_ROWS = 10000
+# Largest request body, in bytes. The validated rows are kept until the whole file has arrived,
+# so this and IMPORT_MAX_CONCURRENT bound the memory imports take on a worker.
+MAX_IMPORT_BYTES = 8 * 1024 * 1024
+IMPORT_MAX_CONCURRENT = settings.import_max_concurrent
+# Longest line, or CSV record spanning several lines, in characters; only this much of the
+# file is ever held while it waits for the rest of a row.
+MAX_IMPORT_RECORD_LENGTH = 64 * 1024
+
+
+class _NeedMoreData(Exception):
+    pass
+
+
+class _Lines:
+    """
+    The complete lines received but not read yet, as the input of a CSV reader.
+
+    When they run out in the middle of a record, `_NeedMoreData` stops the reader. The lines
+    it took for that record are then put back with `restore`, so the record is read again
+    from its first line once more of the file has arrived.
+    """
+
+    __slots__ = ('pending', 'taken')
+
+    def __init__(self):
+        self.pending: deque[str] = deque()
+        self.taken: list[str] = []
+
+    def __iter__(self) -> '_Lines':
+        return self
+
+    def __next__(self) -> str:
+        if not self.pending:
+            raise _NeedMoreData
+        line = self.pending.popleft()
+        self.taken.append(line)
+        return line
+
+    def restore(self) -> None:
+        self.pending.extendleft(reversed(self.taken))
+        self.taken = []
+
+
+class RecordParser:
+    """
+    Splits the text of a CSV (with a header row) or NDJSON file into records as its bytes arrive.
+
+    CSV records are read by a single `csv.reader` over the lines received so far, so a quoted
+    field may span several lines. Only the unfinished last line, or the lines of an unfinished
+    CSV record, are kept between calls to `feed`. A CSV record that cannot be matched with the
+    header, or a quoted field left open at the end of the file, is reported as an error instead
+    of a record, so no line of the file goes missing without a trace. A line or record longer
+    than `MAX_IMPORT_RECORD_LENGTH` characters rejects the whole file.
+    """
+
+    def __init__(self, file_format: ImportFormat):
+        self.file_format = file_format
+        self._decoder = codecs.getincrementaldecoder('utf-8-sig')(errors='replace')
+        self._partial_line = ''
+        self._lines = _Lines()
+        self._reader = csv.reader(self._lines)
+        self._line_number = 0
+        self._header: list[str] | None = None
+
+    def feed(self, data: bytes, final: bool = False) -> list[tuple[int, dict | str]]:
+        """
+        Parse the next piece of the file.
+
+        Params:
+            - data (bytes): The bytes following those fed before.
+            - final (bool): Whether this is the end of the file.
+
+        Returns:
+            - list[tuple[int, dict | str]]: The line number each row completed by `data` starts on,
+              with its raw record, or with why it could not be read.
+
+        Raises:
+            - HTTPException: If a line or record is too long, raises a 413 Request Entity Too Large error.
+        """
+
+        lines = (self._partial_line + self._decoder.decode(data, final)).split('\n')
+        self._partial_line = '' if final else lines.pop()
+        if final and not lines[-1]:
+            lines.pop()
+
+        # Lines waiting in the CSV reader come before the new ones.
+        line_number = self._line_number + len(self._lines.pending)
+        for line in [*lines, self._partial_line]:
+            line_number += 1
+            if len(line) > MAX_IMPORT_RECORD_LENGTH:
+                _raise_too_long(line_number)
+
+        if self.file_format == 'ndjson':
+            records = []
+            for line in lines:
+                self._line_number += 1
+                record = self._parse_ndjson(line)
+                if record is not None:
+                    records.append(record)
+            return records
+
+        self._lines.pending.extend(line + '\n' for line in lines)
+        return self._parse_csv(final)
+
+    def _parse_ndjson(self, line: str) -> tuple[int, dict] | None:
+        if not line.strip():
+            return None
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        return self._line_number, record if isinstance(record, dict) else {}
+
+    def _parse_csv(self, final: bool) -> list[tuple[int, dict | str]]:
+        records = []
+        while True:
+            try:
+                values = next(self._reader)
+            except _NeedMoreData:
+                if not final or not self._lines.taken:
+                    if sum(map(len, self._lines.taken)) > MAX_IMPORT_RECORD_LENGTH:
+                        _raise_too_long(self._line_number + 1)
+                    self._lines.restore()
+                    return records
+                first, last = self._take_lines()
+                records.append((first, f'quoted field left open at the end of the file (lines {first}-{last})'))
+                return records
+            except csv.Error as error:
+                first, _ = self._take_lines()
+                records.append((first, str(error)))
+                continue
+
+            first, last = self._take_lines()
+            if not values:
+                continue
+            if self._header is None:
+                self._header = [name.strip() for name in values]
+            elif len(values) != len(self._header):
+                lines = f' (lines {first}-{last})' if last > first else ''
+                records.append((first, f'expected {len(self._header)} fields, found {len(values)}{lines}'))
+            else:
+                records.append((first, dict(zip(self._header, values))))
+
+    def _take_lines(self) -> tuple[int, int]:
+        # The lines of the record just read are done with; return the first and last line number.
+        first = self._line_number + 1
+        self._line_number += len(self._lines.taken)
+        self._lines.taken = []
+        return first, self._line_number
+
+
+def _raise_too_long(line_number: int) -> None:
+    raise HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f'The row on line {line_number} is longer than {MAX_IMPORT_RECORD_LENGTH} characters'
+    )
+
+
+def _raise_too_large() -> None:
+    raise HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f'The upload is larger than {MAX_IMPORT_BYTES} bytes'
+    )
+
+
+async def read_upload(
+        request: Request, file_format: ImportFormat | None = None
+) -> AsyncIterator[tuple[int, dict | str]]:
+    """
+    Stream the records of the file uploaded as the `file` field of a multipart/form-data request.
+
+    The body is parsed while it is received, so neither the upload nor its rows are kept in
+    memory or spooled to disk. Other fields of the form are ignored.
+
+    Params:
+        - request (Request): The incoming request.
+        - file_format (ImportFormat | None): 'csv' or 'ndjson'; defaults to the extension of the uploaded file.
+
+    Yields:
+        - tuple[int, dict | str]: The line number of each row, with its raw record or why it could not be read.
+
+    Raises:
+        - HTTPException: If the request is not multipart/form-data, is malformed or has no `file` field,
+          or if it is larger than `MAX_IMPORT_BYTES`, raises a 413 Request Entity Too Large error.
+    """
+
+    content_type, options = parse_options_header(request.headers.get('content-type', ''))
+    if content_type != b'multipart/form-data' or b'boundary' not in options:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail='Upload the file as multipart/form-data'
+        )
+
+    content_length = request.headers.get('content-length', '')
+    if content_length.isdigit() and int(content_length) > MAX_IMPORT_BYTES:
+        _raise_too_large()
+
+    state = {'headers': {}, 'header_field': b'', 'header_value': b'', 'in_file': False, 'file_ended': False}
+    data: list[bytes] = []
+    parser: RecordParser | None = None
+
+    def on_part_begin() -> None:
+        state['headers'] = {}
+
+    def on_header_field(chunk: bytes, start: int, end: int) -> None:
+        state['header_field'] += chunk[start:end]
+
+    def on_header_value(chunk: bytes, start: int, end: int) -> None:
+        state['header_value'] += chunk[start:end]
+
+    def on_header_end() -> None:
+        state['headers'][state['header_field'].lower()] = state['header_value']
+        state['header_field'] = state['header_value'] = b''
+
+    def on_headers_finished() -> None:
+        nonlocal parser
+        _, disposition = parse_options_header(state['headers'].get(b'content-disposition', b''))
+        state['in_file'] = parser is None and disposition.get(b'name') == IMPORT_FILE_FIELD.encode()
+        if state['in_file']:
+            filename = disposition.get(b'filename', b'').decode(errors='replace')
+            parser = RecordParser(file_format or ('csv' if filename.lower().endswith('.csv') else 'ndjson'))
+
+    def on_part_data(chunk: bytes, start: int, end: int) -> None:
+        if state['in_file'] and end > start:
+            data.append(chunk[start:end])
+
+    def on_part_end() -> None:
+        if state['in_file']:
+            data.append(b'')
+            state['in_file'] = False
+            state['file_ended'] = True
+
+    multipart_parser = MultipartParser(options[b'boundary'], {
+        'on_part_begin': on_part_begin,
+        'on_header_field': on_header_field,
+        'on_header_value': on_header_value,
+        'on_header_end': on_header_end,
+        'on_headers_finished': on_headers_finished,
+        'on_part_data': on_part_data,
+        'on_part_end': on_part_end,
+    })
+
+    received = 0
+    async for body in request.stream():
+        # The length header may be missing (chunked uploads), so the body is counted as it arrives.
+        received += len(body)
+        if received > MAX_IMPORT_BYTES:
+            _raise_too_large()
+        try:
+            multipart_parser.write(body)
+        except MultipartParseError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Malformed multipart/form-data body')
+        for piece in data:
+            # The empty piece marks the end of the file part.
+            for record in parser.feed(piece, final=not piece):
+                yield record
+        data.clear()
+
+    if not state['file_ended']:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'The upload has no complete `{IMPORT_FILE_FIELD}` field'
+        )
+
+
+import_limiter = StreamLimiter(capacity=IMPORT_MAX_CONCURRENT)
@@ -0,0 +1,85 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.backend.cache import PROFILE_CACHE_TTL_SECONDS, SingleFlight, profile_cache
+from app.routers.pagination import DEFAULT_PAGE_SIZE, encode_cursor
+from app.routers.platform_codes import platform_codes
+from app.routers.profile_fields import PROFILE_FIELDS, selected_columns, get_list_adapter
+from app.routers.profile_queries import profiles_page_query
+
+_page_builds = SingleFlight()
+
+
+def page_key(
+        user_id: int,
+        after_id: int = 0,
+        limit: int = DEFAULT_PAGE_SIZE,
+        fields: tuple[str, ...] = PROFILE_FIELDS
+) -> str:
+    return f'profiles:{user_id}:{after_id}:{limit}:{",".join(fields)}'
+
+
+async def load_profile_page(
+        db: AsyncSession,
+        user_id: int,
+        version: int | None,
+        after_id: int,
+        limit: int,
+        fields: tuple[str, ...] = PROFILE_FIELDS
+) -> tuple[bytes, str | None]:
+    """
+    Return a serialized page of a user's profiles, from the cache when it is current.
+
+    Entries are stored with the `profiles_version` they were built for and are ignored once
+    the version moved on, so a stale entry is never served even if an invalidation was missed
+    (e.g. writes from another worker with the in-process backend). Concurrent misses for the
+    same page and version share a single build.
+
+    Params:
+        - db (AsyncSession): The database session dependency.
+        - user_id (int): The owner of the profiles.
+        - version (int | None): The current `profiles_version` of the user; None disables caching.
+        - after_id (int): The id after which the page starts.
+        - limit (int): The maximum number of profiles on the page.
+        - fields (tuple[str, ...]): The fields to select and serialize.
+
+    Returns:
+        - tuple[bytes, str | None]: The JSON array of profiles and the cursor of the next page.
+    """
+
+    key = page_key(user_id, after_id, limit, fields)
+    if version is not None:
+        cached = await profile_cache.get(key)
+        if cached is not None:
+            cached_version, next_cursor, body = cached.split(b'\n', 2)
+            if int(cached_version) == version:
+                return body, next_cursor.decode() or None
+
+    async def build() -> tuple[bytes, str | None]:
+        query = profiles_page_query(user_id, after_id, selected_columns(fields))
+        profiles = (await db.execute(query.limit(limit + 1))).all()
+        next_cursor = None
+        if len(profiles) > limit:
+            profiles = profiles[:limit]
+            next_cursor = encode_cursor(profiles[-1].id)
+        profiles = await platform_codes.decode(db, profiles)
+
+        adapter = get_list_adapter(fields)
+        body = adapter.dump_json(adapter.validate_python(profiles, from_attributes=True))
+        if version is not None:
+            entry = b'%d\n%s\n%s' % (version, (next_cursor or '').encode(), body)
+            await profile_cache.set(key, entry, PROFILE_CACHE_TTL_SECONDS)
+        return body, next_cursor
+
+    return await _page_builds.run(f'{key}:{version}', build)
+
+
+async def invalidate_profile_pages(user_id: int) -> None:
+    """
+    Drop the cached first page of a user's profiles after a write. Other pages are rebuilt
+    once their stored version no longer matches.
+
+    Params:
+        - user_id (int): The owner of the profiles.
+    """
+
+    await profile_cache.delete(page_key(user_id))
@@ -0,0 +1,220 @@
+from sqlalchemy import select, insert, update, delete, values, column, func, any_, bindparam, cast, type_coerce
+from sqlalchemy import Integer, String
+from sqlalchemy import Select, Insert, Update, Delete
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.models.social_profile import SocialProfile
+from app.models.profile_stat import ProfileStat
+from app.models.user import User
+
+# Statements used by the social profile router. They are built here so the query plan
+# tests check exactly what the endpoints run.
+
+PROFILE_COLUMNS = (SocialProfile.id, SocialProfile.platform, SocialProfile.profile_url, SocialProfile.profile_type)
+
+
+def profiles_version_query(user_id: int) -> Select:
+    return select(User.profiles_version).where(User.id == user_id)
+
+
+def profile_stats_query(user_id: int) -> Select:
+    # Platforms are decoded by the application, so the rows are ordered by name there.
+    return (
+        select(ProfileStat.platform, ProfileStat.profile_type, ProfileStat.profile_count.label('count'))
+        .where(ProfileStat.user_id == user_id)
+    )
+
+
+def profiles_page_query(user_id: int, after_id: int, columns: tuple = PROFILE_COLUMNS) -> Select:
+    """
+    Select a user's profiles with an id greater than `after_id`, in id order.
+
+    Params:
+        - user_id (int): The owner of the profiles.
+        - after_id (int): The id of the last profile of the previous page, or 0.
+        - columns (tuple): The columns to select; must include `SocialProfile.id`.
+
+    Returns:
+        - Select: The statement; the caller adds a limit.
+    """
+
+    return (
+        select(*columns)
+        .where(SocialProfile.user_id == user_id, SocialProfile.id > after_id)
+        .order_by(SocialProfile.id)
+    )
+
+
+def _escape_like(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def profiles_search_query(
+        platform_code: int | None = None,
+        profile_type: str | None = None,
+        url_contains: str | None = None,
+        url_prefix: str | None = None,
+        after_id: int = 0
+) -> Select:
+    """
+    Select profiles of all users matching every given filter, in id order.
+
+    Platform and profile type use the (platform, profile_type) index; URL filters are
+    case-insensitive LIKE patterns answered by the trigram index on `profile_url`.
+
+    Params:
+        - platform_code (int | None): The code of the platform, see `PlatformCodes`.
+        - profile_type (str | None): Exact profile type.
+        - url_contains (str | None): Substring of the profile URL.
+        - url_prefix (str | None): Prefix of the profile URL.
+        - after_id (int): The id of the last profile of the previous page, or 0.
+
+    Returns:
+        - Select: The statement; the caller adds a limit.
+    """
+
+    query = select(*PROFILE_COLUMNS, SocialProfile.user_id).where(SocialProfile.id > after_id)
+    if platform_code is not None:
+        query = query.where(type_coerce(SocialProfile.platform, Integer) == platform_code)
+    if profile_type is not None:
+        query = query.where(SocialProfile.profile_type == profile_type)
+    if url_contains is not None:
+        query = query.where(SocialProfile.profile_url.ilike(f'%{_escape_like(url_contains)}%'))
+    if url_prefix is not None:
+        query = query.where(SocialProfile.profile_url.ilike(f'{_escape_like(url_prefix)}%'))
+    return query.order_by(SocialProfile.id)
+
+
+def profiles_export_query(user_id: int | None = None) -> Select:
+    """
+    Select the profiles of one or all users for an export, in id order.
+
+    Params:
+        - user_id (int | None): The owner of the profiles, or None for every user.
+
+    Returns:
+        - Select: A statement returning `(id, user_id, platform, profile_url, profile_type)` rows.
+    """
+
+    query = (
+        select(
+            SocialProfile.id, SocialProfile.user_id, SocialProfile.platform,
+            SocialProfile.profile_url, SocialProfile.profile_type
+        )
+        .order_by(SocialProfile.id)
+    )
+    if user_id is not None:
+        query = query.where(SocialProfile.user_id == user_id)
+    return query
+
+
+def profiles_by_url_query(user_id: int, urls: list[str]) -> Select:
+    """
+    Select the ids and URLs of a user's profiles linking any of the given URLs, through the
+    (user_id, url_hash) index.
+
+    Params:
+        - user_id (int): The owner of the profiles.
+        - urls (list[str]): Canonical profile URLs.
+
+    Returns:
+        - Select: A statement returning `(profile_url, id)` rows.
+    """
+
+    url = func.unnest(bindparam('urls', urls, type_=ARRAY(String))).column_valued('url')
+    return select(SocialProfile.profile_url, SocialProfile.id).where(
+        SocialProfile.user_id == user_id,
+        SocialProfile.url_hash.in_(select(func.profile_url_hash(url)))
+    )
+
+
+def profile_update_query(profile_id: int, user_id: int, changes: dict) -> Update | Select:
+    """
+    Update the given columns of one of a user's profiles and return the profile.
+
+    Params:
+        - profile_id (int): The profile id.
+        - user_id (int): The owner of the profile.
+        - changes (dict): The new column values; when empty the profile is only selected.
+
+    Returns:
+        - Update | Select: A statement returning `PROFILE_COLUMNS`, or no row if the user has no such profile.
+    """
+
+    owned_profile = (SocialProfile.id == profile_id) & (SocialProfile.user_id == user_id)
+    if not changes:
+        return select(*PROFILE_COLUMNS).where(owned_profile)
+
+    return (
+        update(SocialProfile)
+        .where(owned_profile)
+        .values(**changes)
+        .returning(*PROFILE_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def profile_delete_query(profile_id: int, user_id: int) -> Delete:
+    return (
+        delete(SocialProfile)
+        .where(SocialProfile.id == profile_id, SocialProfile.user_id == user_id)
+        .returning(*PROFILE_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def profiles_insert_query() -> Insert:
+    """
+    Insert profiles given as a list of parameter dicts; SQLAlchemy sends them as multi-row
+    INSERT statements and returns the rows in parameter order.
+    """
+
+    return insert(SocialProfile).returning(*PROFILE_COLUMNS, sort_by_parameter_order=True)
+
+
+def profiles_batch_update_query(user_id: int, rows: list[tuple]) -> Update:
+    """
+    Update many of a user's profiles with one UPDATE ... FROM (VALUES ...).
+
+    Params:
+        - user_id (int): The owner of the profiles.
+        - rows (list[tuple]): `(id, platform, profile_url, profile_type)` tuples; None keeps the current value.
+
+    Returns:
+        - Update: A statement returning `PROFILE_COLUMNS` of every updated profile.
+    """
+
+    changes = values(
+        column('id', Integer),
+        column('platform', SocialProfile.platform.type),
+        column('profile_url', String),
+        column('profile_type', SocialProfile.profile_type.type),
+        name='changes'
+    ).data(rows)
+
+    return (
+        update(SocialProfile)
+        .where(SocialProfile.id == changes.c.id, SocialProfile.user_id == user_id)
+        .values(
+            # A VALUES column holding only NULLs is typed as text, hence the casts.
+            platform=func.coalesce(cast(changes.c.platform, Integer), SocialProfile.platform),
+            profile_url=func.coalesce(changes.c.profile_url, SocialProfile.profile_url),
+            profile_type=func.coalesce(
+                cast(changes.c.profile_type, SocialProfile.profile_type.type), SocialProfile.profile_type
+            )
+        )
+        .returning(*PROFILE_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def profiles_batch_delete_query(user_id: int, profile_ids: list[int]) -> Delete:
+    return (
+        delete(SocialProfile)
+        .where(
+            SocialProfile.id == any_(bindparam('ids', profile_ids, type_=ARRAY(Integer))),
+            SocialProfile.user_id == user_id
+        )
+        .returning(*PROFILE_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,99 @@
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from dataclasses import dataclass
+
+# Query parameters that only track where a link was shared or clicked.
+TRACKING_PARAMS = frozenset({
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'igshid', 'igsh', 'mc_cid', 'mc_eid',
+    'ref', 'ref_src', 'ref_url', 'si', 'feature', '_ga', 'share_id'
+})
+TRACKING_PARAM_PREFIXES = ('utm_',)
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+@dataclass(frozen=True)
+class PlatformRule:
+    """
+    How the profile URLs of a platform are canonicalized.
+
+    Attributes:
+        - host (str): The canonical host.
+        - aliases (frozenset[str]): Other hosts serving the same profiles.
+        - lowercase_path (bool): Whether profile paths are case-insensitive on the platform.
+        - keep_params (frozenset[str]): The query parameters that identify a profile; all others are dropped.
+    """
+
+    host: str
+    aliases: frozenset[str] = frozenset()
+    lowercase_path: bool = True
+    keep_params: frozenset[str] = frozenset()
+
+
+PLATFORM_RULES = {
+    'Twitter': PlatformRule('twitter.com', frozenset({'www.twitter.com', 'mobile.twitter.com', 'x.com', 'www.x.com'})),
+    'Github': PlatformRule('github.com', frozenset({'www.github.com'})),
+    'Instagram': PlatformRule('instagram.com', frozenset({'www.instagram.com', 'm.instagram.com'})),
+    'Facebook': PlatformRule(
+        'facebook.com',
+        frozenset({'www.facebook.com', 'm.facebook.com', 'web.facebook.com', 'fb.com', 'www.fb.com'}),
+        keep_params=frozenset({'id'})
+    ),
+    'Linkedin': PlatformRule('linkedin.com', frozenset({'www.linkedin.com'})),
+    'Telegram': PlatformRule('t.me', frozenset({'www.t.me', 'telegram.me', 'www.telegram.me'})),
+    'Tiktok': PlatformRule('tiktok.com', frozenset({'www.tiktok.com', 'm.tiktok.com'})),
+    'Reddit': PlatformRule('reddit.com', frozenset({'www.reddit.com', 'old.reddit.com', 'new.reddit.com'})),
+    # Channel ids are case-sensitive.
+    'Youtube': PlatformRule('youtube.com', frozenset({'www.youtube.com', 'm.youtube.com'}), lowercase_path=False),
+}
+
+# Rules are found by host rather than by the platform name a user typed, which is free text.
+_RULES_BY_HOST = {
+    host: rule
+    for rule in PLATFORM_RULES.values()
+    for host in rule.aliases | {rule.host}
+}
+
+
+def _is_tracking_param(name: str) -> bool:
+    return name.lower() in TRACKING_PARAMS or name.lower().startswith(TRACKING_PARAM_PREFIXES)
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Return the canonical form of a profile URL, so that links to the same profile compare equal.
+
+    The scheme and host are lowercased, default ports, fragments, tracking parameters and
+    trailing slashes are removed and the remaining parameters are sorted. URLs of known
+    platforms also get the platform's canonical host and https, and their paths are
+    lowercased and stripped of other parameters where the platform ignores them.
+
+    Params:
+        - url (str): An absolute http(s) URL.
+
+    Returns:
+        - str: The canonical URL.
+    """
+
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').rstrip('.')
+    port = parts.port
+    path = parts.path.rstrip('/')
+    params = [(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True) if not _is_tracking_param(name)]
+
+    rule = _RULES_BY_HOST.get(host)
+    if rule is not None:
+        scheme, host, port = 'https', rule.host, None
+        if rule.lowercase_path:
+            path = path.lower()
+        params = [(name, value) for name, value in params if name in rule.keep_params]
+
+    if ':' in host:
+        host = f'[{host}]'
+    netloc = host if port is None or port == DEFAULT_PORTS.get(scheme) else f'{host}:{port}'
+    if parts.username is not None:
+        userinfo = parts.username if parts.password is None else f'{parts.username}:{parts.password}'
+        netloc = f'{userinfo}@{netloc}'
+
+    return urlunsplit((scheme, netloc, path, urlencode(sorted(params)), ''))
@@ -1,72 +1,605 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
 
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, WebSocket, status
+from fastapi.responses import StreamingResponse
+
+from pydantic import BaseModel, ValidationError
+
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from typing import Annotated
+from typing import Annotated, AsyncIterator
 
 from app.backend.db_depends import get_db
-from app.routers.auth.depends import get_current_user, get_user_by_field
-from app.schemas.social_profiles import SocialProfileCreate, SocialProfileResponse, SocialProfileUpdate
+from app.backend.db import stream_session_maker, get_constraint_name
+from app.backend.profile_feed import profile_feed, Subscription, READY, PROFILE_FEED_HEARTBEAT_SECONDS
+from app.routers.auth.depends import get_current_user, get_current_active_user, get_current_admin
+from app.routers.auth.identity import identity_cache
+from app.schemas.social_profiles import (
+    VALID_PROFILE_TYPES, SocialProfileCreate, SocialProfileResponse, SocialProfileUpdate, SocialProfileSearchResult,
+    SocialProfileBatchRequest, SocialProfileBatchResponse, SocialProfileBatchResult, SocialProfileStatsResponse,
+    SocialProfileImportError, SocialProfileImportResponse
+)
 from app.schemas.auth import UserResponse
-from app.models.social_profile import SocialProfile
+from app.models.social_profile import PROFILE_TYPES, SocialProfile
+from app.routers.etag import make_etag, etag_matches
+from app.routers.profile_queries import (
+    profiles_version_query, profiles_page_query, profiles_search_query, profiles_export_query, profiles_by_url_query,
+    profile_stats_query, profile_update_query, profile_delete_query, profiles_insert_query,
+    profiles_batch_update_query, profiles_batch_delete_query
+)
+from app.routers.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor, set_next_page_headers
+from app.routers.profile_list_cache import load_profile_page, invalidate_profile_pages
+from app.routers.profile_fields import parse_fields, selected_columns, get_response_model
+from app.routers.platform_codes import platform_codes
+from app.routers.profile_urls import canonicalize_url
+from app.routers.stream_limit import stream_limiter
+from app.routers.profile_export import ExportFormat, EXPORT_MEDIA_TYPES, export_profiles, export_filename
+from app.routers.profile_import import (
+    ImportFormat, IMPORT_FILE_FIELD, IMPORT_CHUNK_SIZE, MAX_IMPORT_ROWS, MAX_IMPORT_RECORD_LENGTH, MAX_IMPORT_BYTES,
+    import_limiter, read_upload
+)
 
 router = APIRouter(prefix='/social_profiles', tags=['social_profiles'])
 
+PROFILE_OWNER_CONSTRAINT = 'social_profiles_user_id_fkey'
+PROFILE_URL_CONSTRAINT = 'ix_social_profiles_user_id_url_hash'
+DUPLICATE_URL_DETAIL = 'A social profile with this URL already exists'
+
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+STREAM_BATCH_SIZE = 500
+
+
+async def stream_profiles(query, response_model: type[BaseModel] = SocialProfileResponse) -> AsyncIterator[str]:
+    """
+    Serialize profiles as NDJSON while they are fetched from a server-side cursor.
+
+    The request's session is closed before a streaming body is sent, so the stream uses
+    a session of its own, on a connection outside the pool.
+
+    Params:
+        - query: The select statement for the profiles.
+        - response_model (type[BaseModel]): The model each profile is serialized with.
+
+    Yields:
+        - str: One JSON-encoded profile per line.
+    """
+
+    async with stream_session_maker() as db:
+        profiles = await db.stream(query.execution_options(yield_per=STREAM_BATCH_SIZE))
+        async for rows in profiles.partitions():
+            for profile in await platform_codes.decode(db, rows):
+                yield response_model.model_validate(profile).model_dump_json() + '\n'
+
+
+def _raise_for_integrity_error(error: IntegrityError, user_id: int) -> None:
+    constraint = get_constraint_name(error)
+    if constraint == PROFILE_URL_CONSTRAINT:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=DUPLICATE_URL_DETAIL)
+    if constraint == PROFILE_OWNER_CONSTRAINT:
+        # The user was deleted after their identity was cached.
+        identity_cache.invalidate(user_id)
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='User not found')
+    raise error
+
 
 @router.get(
     '/',
     summary='Get all social profiles',
-    description='This endpoint retrieves all social profiles associated with the current authenticated user. '
-                'It returns a list of social profiles.',
-    response_model=list[SocialProfileResponse]
+    description='This endpoint retrieves the social profiles associated with the current authenticated user, '
+                'ordered by ID, one page at a time. When more profiles are available, the `Link` (rel="next") '
+                'and `X-Next-Cursor` headers carry the cursor of the next page. With `stream=true` every profile '
+                'after the cursor is streamed as newline-delimited JSON instead. Every response carries an '
+                '`ETag` that changes whenever any of the user\'s profiles change; send it back in '
+                '`If-None-Match` to get an empty `304 Not Modified` while the list is unchanged. Use `fields` '
+                'to select and return only some fields of each profile.',
+    response_model=list[SocialProfileResponse],
+    responses={
+        status.HTTP_200_OK: {'content': {NDJSON_MEDIA_TYPE: {}}},
+        status.HTTP_304_NOT_MODIFIED: {'description': 'The profiles have not changed'},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {'description': 'Too many streams are running on the worker'}
+    }
 )
 async def get_social_profiles(
+    request: Request,
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[UserResponse, Depends(get_current_user)]
+    user: Annotated[UserResponse, Depends(get_current_user)],
+    cursor: Annotated[str | None, Query(description='Cursor from a previous page')] = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE, description='Maximum number of profiles per page')] = DEFAULT_PAGE_SIZE,
+    stream: Annotated[bool, Query(description='Stream all remaining profiles as NDJSON')] = False,
+    fields: Annotated[str | None, Query(
+        description='Comma-separated fields to return, e.g. `id,platform`; all fields by default'
+    )] = None,
+    if_none_match: Annotated[str | None, Header()] = None
 ):
-    profiles = await db.scalars(select(SocialProfile).where(SocialProfile.user_id == user.id))
-    return profiles.all()
+    after_id = decode_cursor(cursor) if cursor is not None else 0
+    profile_fields = parse_fields(fields)
+
+    # The version is read before the profiles, so the rows sent are never older than the tag.
+    version = await db.scalar(profiles_version_query(user.id))
+    etag = make_etag(user.id, version, after_id, None if stream else limit, profile_fields)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+    if stream:
+        query = profiles_page_query(user.id, after_id, selected_columns(profile_fields))
+        return stream_limiter.response(
+            stream_profiles(query, get_response_model(profile_fields)),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers={'ETag': etag}
+        )
+
+    body, next_cursor = await load_profile_page(db, user.id, version, after_id, limit, profile_fields)
+    response = Response(content=body, media_type='application/json', headers={'ETag': etag})
+    set_next_page_headers(request, response, next_cursor)
+    return response
+
+
+@router.get(
+    '/search',
+    summary='Search social profiles of all users',
+    description='This endpoint lets administrators find social profiles of any user by platform, profile type '
+                'and a case-insensitive substring or prefix of the profile URL. At least one filter is required. '
+                'Results are ordered by ID and paginated like the profile list.',
+    response_model=list[SocialProfileSearchResult]
+)
+async def search_social_profiles(
+        request: Request,
+        response: Response,
+        db: Annotated[AsyncSession, Depends(get_db)],
+        admin: Annotated[UserResponse, Depends(get_current_admin)],
+        platform: Annotated[str | None, Query(min_length=1, description='Exact platform, e.g. `Twitter`')] = None,
+        profile_type: Annotated[str | None, Query(min_length=1, description='Exact profile type')] = None,
+        url_contains: Annotated[str | None, Query(min_length=3, description='Substring of the profile URL')] = None,
+        url_prefix: Annotated[str | None, Query(min_length=1, description='Prefix of the profile URL')] = None,
+        cursor: Annotated[str | None, Query(description='Cursor from a previous page')] = None,
+        limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE, description='Maximum number of profiles per page')] = DEFAULT_PAGE_SIZE
+):
+    if platform is None and profile_type is None and url_contains is None and url_prefix is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='At least one of platform, profile_type, url_contains or url_prefix is required'
+        )
+
+    after_id = decode_cursor(cursor) if cursor is not None else 0
+
+    # Stored values are normalized by SocialProfileBase, so the filters are normalized the same way.
+    # Platforms and profile types that were never stored cannot match any profile.
+    platform_code = None
+    if platform is not None:
+        platform = platform.strip()
+        platform_code = await platform_codes.get(db, platform[:1].upper() + platform[1:])
+        if platform_code is None:
+            return []
+    if profile_type is not None:
+        profile_type = profile_type.strip().lower()
+        if profile_type not in VALID_PROFILE_TYPES:
+            return []
+
+    query = profiles_search_query(platform_code, profile_type, url_contains, url_prefix, after_id)
+    profiles = (await db.execute(query.limit(limit + 1))).all()
+    if len(profiles) > limit:
+        profiles = profiles[:limit]
+        set_next_page_headers(request, response, encode_cursor(profiles[-1].id))
+    return await platform_codes.decode(db, profiles)
+
+
+def _export_response(user_id: int | None, export_format: ExportFormat) -> StreamingResponse:
+    return stream_limiter.response(
+        export_profiles(profiles_export_query(user_id), export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={'Content-Disposition': f'attachment; filename="{export_filename(export_format, user_id)}"'}
+    )
+
+
+@router.get(
+    '/export',
+    summary='Export social profiles of all users',
+    description='This endpoint lets administrators download the social profiles of all users, or of one user '
+                'with `user_id`, as newline-delimited JSON or CSV ordered by ID. The rows are streamed while '
+                'they are read, from a single consistent snapshot of the database.',
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {'content': {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()}},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {'description': 'Too many streams are running on the worker'}
+    }
+)
+async def export_social_profiles(
+        admin: Annotated[UserResponse, Depends(get_current_admin)],
+        export_format: Annotated[ExportFormat, Query(alias='format', description='`ndjson` or `csv`')] = 'ndjson',
+        user_id: Annotated[int | None, Query(description='Export only the profiles of this user')] = None
+):
+    return _export_response(user_id, export_format)
+
+
+@router.get(
+    '/export/me',
+    summary='Export your social profiles',
+    description='This endpoint downloads all social profiles of the current authenticated user as '
+                'newline-delimited JSON or CSV, ordered by ID.',
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {'content': {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()}},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {'description': 'Too many streams are running on the worker'}
+    }
+)
+async def export_own_social_profiles(
+        user: Annotated[UserResponse, Depends(get_current_user)],
+        export_format: Annotated[ExportFormat, Query(alias='format', description='`ndjson` or `csv`')] = 'ndjson'
+):
+    return _export_response(user.id, export_format)
+
+
+@router.get(
+    '/stats',
+    summary='Count social profiles by platform and type',
+    description='This endpoint returns how many social profiles the current authenticated user has for each '
+                'platform and profile type, and in total. The counts are kept up to date with every change to '
+                'the profiles, so reading them does not depend on the number of profiles.',
+    response_model=SocialProfileStatsResponse
+)
+async def get_social_profile_stats(
+        db: Annotated[AsyncSession, Depends(get_db)],
+        user: Annotated[UserResponse, Depends(get_current_user)]
+):
+    stats = await platform_codes.decode(db, (await db.execute(profile_stats_query(user.id))).all())
+    stats = sorted(stats, key=lambda stat: (stat.platform, PROFILE_TYPES.index(stat.profile_type)))
+    return SocialProfileStatsResponse(total=sum(stat.count for stat in stats), stats=stats)
+
+
+async def _join_profile_feed() -> None:
+    if profile_feed.full or not await profile_feed.start():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail='The change feed is not available, try again later',
+            headers={'Retry-After': '5'}
+        )
+
+
+async def _sse_events(user_id: int) -> AsyncIterator[str]:
+    subscription = profile_feed.subscribe(user_id)
+    try:
+        yield READY.as_sse()
+        while True:
+            event = await subscription.get(PROFILE_FEED_HEARTBEAT_SECONDS)
+            # A comment line keeps proxies from closing an idle connection.
+            yield ': keep-alive\n\n' if event is None else event.as_sse()
+    finally:
+        profile_feed.unsubscribe(subscription)
+
+
+@router.get(
+    '/stream',
+    summary='Receive changes to your social profiles',
+    description='This endpoint streams Server-Sent Events for every change to the social profiles of the current '
+                'authenticated user, from any device: `create`, `update` and `delete` events carry the IDs of the '
+                'profiles in `{"ids": [...]}`. A `ready` event is sent once the stream is live. A `resync` event '
+                'means changes were missed, and the client should reload its profiles.',
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {'content': {'text/event-stream': {}}},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {'description': 'The change feed of the worker is full or down'}
+    }
+)
+async def stream_profile_changes(user: Annotated[UserResponse, Depends(get_current_user)]):
+    await _join_profile_feed()
+    return StreamingResponse(
+        _sse_events(user.id),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+async def _forward_events(websocket: WebSocket, subscription: Subscription) -> None:
+    await websocket.send_json(READY.as_dict())
+    while True:
+        # The server pings idle WebSocket connections itself, so no keep-alive is needed here.
+        await websocket.send_json((await subscription.get()).as_dict())
+
+
+@router.websocket('/stream/ws')
+async def stream_profile_changes_ws(websocket: WebSocket, token: str | None = None):
+    """
+    The WebSocket equivalent of `GET /social_profiles/stream`, sending each event as a JSON
+    message `{"event": ..., "ids": [...]}`. Browsers cannot set headers on WebSocket requests,
+    so the access token may also be given as the `token` query parameter.
+    """
+
+    scheme, _, credentials = websocket.headers.get('authorization', '').partition(' ')
+    try:
+        user = await get_current_user(credentials if scheme.lower() == 'bearer' else token or '')
+        await _join_profile_feed()
+    except HTTPException as exc:
+        code = status.WS_1013_TRY_AGAIN_LATER if exc.status_code == 503 else status.WS_1008_POLICY_VIOLATION
+        await websocket.close(code=code, reason=str(exc.detail))
+        return
+
+    await websocket.accept()
+    subscription = profile_feed.subscribe(user.id)
+    sender = asyncio.create_task(_forward_events(websocket, subscription))
+    try:
+        # Messages from the client are ignored; receiving only notices when it goes away.
+        while (await websocket.receive())['type'] != 'websocket.disconnect':
+            pass
+    finally:
+        sender.cancel()
+        await asyncio.gather(sender, return_exceptions=True)
+        profile_feed.unsubscribe(subscription)
 
 
 @router.post(
     '/create',
     summary='Create a new social profile',
     description='This endpoint creates a new social profile for the current authenticated user. '
-                'It requires the profile data and returns the created social profile.',
+                'It requires the profile data and returns the created social profile. The URL is stored in '
+                'canonical form; linking a URL the user has already linked returns `409 Conflict`.',
     status_code=status.HTTP_201_CREATED,
-    response_model=SocialProfileResponse
+    response_model=SocialProfileResponse,
+    responses={
+        status.HTTP_409_CONFLICT: {'description': 'The user has already linked this URL'},
+        status.HTTP_429_TOO_MANY_REQUESTS: {'description': 'The user has added too many new platforms within the hour'}
+    }
 )
 async def create_social_profile(
         db: Annotated[AsyncSession, Depends(get_db)],
-        user: Annotated[UserResponse, Depends(get_current_user)],
+        user: Annotated[UserResponse, Depends(get_current_active_user)],
         profile_data: SocialProfileCreate
 ):
-    user = await get_user_by_field('email', user.email, db)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail='User not found'
-        )
-
+    await platform_codes.register(db, [profile_data.platform], user.id)
     new_profile = SocialProfile(
         user_id=user.id,
         platform=profile_data.platform,
-        profile_url=str(profile_data.profile_url),
+        profile_url=canonicalize_url(str(profile_data.profile_url)),
         profile_type=profile_data.profile_type
     )
     db.add(new_profile)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError as error:
+        await db.rollback()
+        _raise_for_integrity_error(error, user.id)
+    await invalidate_profile_pages(user.id)
     await db.refresh(new_profile)
     return new_profile
 
 
+def _succeeded(index: int, op: str, status_code: int, row) -> SocialProfileBatchResult:
+    return SocialProfileBatchResult(
+        index=index, op=op, status_code=status_code, profile=SocialProfileResponse.model_validate(row)
+    )
+
+
+def _failed(index: int, op: str, status_code: int, error: str) -> SocialProfileBatchResult:
+    return SocialProfileBatchResult(index=index, op=op, status_code=status_code, error=error)
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return '; '.join(
+        f'{".".join(map(str, e["loc"]))}: {e["msg"]}' if e['loc'] else e['msg']
+        for e in error.errors(include_url=False)
+    )
+
+
+@router.post(
+    '/batch',
+    summary='Create, update and delete social profiles in one request',
+    description='This endpoint runs up to 100 create, update and delete operations on the current authenticated '
+                'user\'s social profiles in a single transaction. Every operation is validated on its own and '
+                'gets a result with the status code the single-item endpoint would have returned, so invalid or '
+                'missing items do not prevent the others from being applied. Items linking a URL the user has '
+                'already linked, or that an earlier item links, get `409`.',
+    response_model=SocialProfileBatchResponse,
+    responses={status.HTTP_429_TOO_MANY_REQUESTS: {'description': 'The user has added too many new platforms within the hour'}}
+)
+async def batch_social_profiles(
+        db: Annotated[AsyncSession, Depends(get_db)],
+        user: Annotated[UserResponse, Depends(get_current_active_user)],
+        batch: SocialProfileBatchRequest
+):
+    results: list[SocialProfileBatchResult | None] = [None] * len(batch.operations)
+    creates: list[tuple[int, SocialProfileCreate]] = []
+    updates: dict[int, tuple[int, SocialProfileUpdate]] = {}
+    deletes: dict[int, int] = {}
+
+    for index, operation in enumerate(batch.operations):
+        if operation.op != 'create':
+            if operation.id is None:
+                results[index] = _failed(index, operation.op, status.HTTP_422_UNPROCESSABLE_ENTITY, 'id: Field required')
+                continue
+            if operation.id in updates or operation.id in deletes:
+                results[index] = _failed(
+                    index, operation.op, status.HTTP_400_BAD_REQUEST, 'Profile appears more than once in the batch'
+                )
+                continue
+
+        try:
+            if operation.op == 'create':
+                creates.append((index, SocialProfileCreate.model_validate(operation.data or {})))
+            elif operation.op == 'update':
+                updates[operation.id] = (index, SocialProfileUpdate.model_validate(operation.data or {}))
+            else:
+                deletes[operation.id] = index
+        except ValidationError as error:
+            results[index] = _failed(
+                index, operation.op, status.HTTP_422_UNPROCESSABLE_ENTITY, _format_validation_error(error)
+            )
+
+    # A URL may be linked once per user: items linking a URL the user already has, or that an
+    # earlier item of the batch links, are rejected before anything is written.
+    urls = {index: canonicalize_url(str(profile_data.profile_url)) for index, profile_data in creates}
+    urls.update({
+        index: canonicalize_url(str(profile_data.profile_url))
+        for index, profile_data in updates.values() if profile_data.profile_url is not None
+    })
+    profile_ids = {index: profile_id for profile_id, (index, _) in updates.items()}
+    if urls:
+        linked = dict((await db.execute(profiles_by_url_query(user.id, list(set(urls.values()))))).all())
+        claimed = set()
+        for index, url in sorted(urls.items()):
+            linked_id = linked.get(url)
+            if url in claimed or linked_id is not None and linked_id != profile_ids.get(index):
+                results[index] = _failed(index, batch.operations[index].op, status.HTTP_409_CONFLICT, DUPLICATE_URL_DETAIL)
+            else:
+                claimed.add(url)
+        creates = [(index, profile_data) for index, profile_data in creates if results[index] is None]
+        updates = {profile_id: item for profile_id, item in updates.items() if results[item[0]] is None}
+
+    await platform_codes.register(
+        db,
+        [profile_data.platform for _, profile_data in creates]
+        + [profile_data.platform for _, profile_data in updates.values() if profile_data.platform is not None],
+        user.id
+    )
+
+    try:
+        if creates:
+            rows = await db.execute(
+                profiles_insert_query(),
+                [
+                    {
+                        'user_id': user.id,
+                        'platform': profile_data.platform,
+                        'profile_url': urls[index],
+                        'profile_type': profile_data.profile_type
+                    }
+                    for index, profile_data in creates
+                ]
+            )
+            for (index, _), row in zip(creates, rows):
+                results[index] = _succeeded(index, 'create', status.HTTP_201_CREATED, row)
+
+        if updates:
+            rows = await db.execute(profiles_batch_update_query(user.id, [
+                (profile_id, profile_data.platform, urls.get(index), profile_data.profile_type)
+                for profile_id, (index, profile_data) in updates.items()
+            ]))
+            for row in await platform_codes.decode(db, rows.all()):
+                results[updates[row.id][0]] = _succeeded(updates[row.id][0], 'update', status.HTTP_200_OK, row)
+
+        if deletes:
+            rows = await db.execute(profiles_batch_delete_query(user.id, list(deletes)))
+            for row in await platform_codes.decode(db, rows.all()):
+                results[deletes[row.id]] = _succeeded(deletes[row.id], 'delete', status.HTTP_200_OK, row)
+
+        await db.commit()
+    except IntegrityError as error:
+        await db.rollback()
+        _raise_for_integrity_error(error, user.id)
+
+    await invalidate_profile_pages(user.id)
+    return SocialProfileBatchResponse(results=[
+        result or _failed(index, batch.operations[index].op, status.HTTP_404_NOT_FOUND, 'Profile not found')
+        for index, result in enumerate(results)
+    ])
+
+
+@router.post(
+    '/import',
+    summary='Import social profiles from a file',
+    description='This endpoint creates social profiles for the current authenticated user from an uploaded CSV '
+                f'file (with a `platform,profile_url,profile_type` header row) or NDJSON file, sent as the '
+                f'`{IMPORT_FILE_FIELD}` field of a multipart/form-data request. The file is parsed while it is '
+                'uploaded and its rows are validated like the body of the create endpoint; once the whole file '
+                'has arrived they are inserted in chunks, all in one transaction. Rows that are invalid or link a '
+                f'URL the user has already linked are skipped and listed in the response. Uploads larger than '
+                f'{MAX_IMPORT_BYTES} bytes, files of more than {MAX_IMPORT_ROWS} rows, or with a row longer than '
+                f'{MAX_IMPORT_RECORD_LENGTH} characters, are rejected.',
+    response_model=SocialProfileImportResponse,
+    responses={
+        status.HTTP_413_REQUEST_ENTITY_TOO_LARGE: {
+            'description': f'The upload is larger than {MAX_IMPORT_BYTES} bytes, the file has more than '
+                           f'{MAX_IMPORT_ROWS} rows, or a row longer than {MAX_IMPORT_RECORD_LENGTH} characters'
+        },
+        status.HTTP_429_TOO_MANY_REQUESTS: {'description': 'The user has added too many new platforms within the hour'},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {'description': 'Too many imports are in progress on the worker'}
+    },
+    openapi_extra={'requestBody': {'required': True, 'content': {'multipart/form-data': {'schema': {
+        'type': 'object',
+        'properties': {IMPORT_FILE_FIELD: {'type': 'string', 'format': 'binary'}},
+        'required': [IMPORT_FILE_FIELD]
+    }}}}}
+)
+async def import_social_profiles(
+        request: Request,
+        db: Annotated[AsyncSession, Depends(get_db)],
+        user: Annotated[UserResponse, Depends(get_current_active_user)],
+        import_format: Annotated[ImportFormat | None, Query(
+            alias='format', description='`csv` or `ndjson`; defaults to the extension of the uploaded file'
+        )] = None
+):
+    # Validated rows are kept until the whole file has arrived, so imports in progress are bounded.
+    with import_limiter.slot():
+        report = SocialProfileImportResponse()
+        profiles = []
+        async for line, record in read_upload(request, import_format):
+            report.read += 1
+            if report.read > MAX_IMPORT_ROWS:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f'The file has more than {MAX_IMPORT_ROWS} rows'
+                )
+            if isinstance(record, str):
+                report.errors.append(SocialProfileImportError(line=line, error=record))
+                continue
+            try:
+                profile_data = SocialProfileCreate.model_validate(record)
+            except ValidationError as error:
+                report.errors.append(SocialProfileImportError(line=line, error=_format_validation_error(error)))
+                continue
+            profiles.append((line, profile_data, canonicalize_url(str(profile_data.profile_url))))
+
+        # The database is only used once the whole file has arrived, so a slow upload holds no
+        # connection, transaction or lock on the user's row.
+        seen = set()
+        try:
+            for start in range(0, len(profiles), IMPORT_CHUNK_SIZE):
+                chunk = profiles[start:start + IMPORT_CHUNK_SIZE]
+
+                # Profiles inserted from earlier chunks are part of the transaction, so they are found too.
+                urls = list({url for _, _, url in chunk})
+                linked = {url for url, _ in await db.execute(profiles_by_url_query(user.id, urls))}
+
+                rows = []
+                for line, profile_data, url in chunk:
+                    if url in linked or url in seen:
+                        error = 'profile_url repeated in file' if url in seen else DUPLICATE_URL_DETAIL
+                        report.errors.append(SocialProfileImportError(line=line, error=error))
+                        continue
+                    seen.add(url)
+                    rows.append({
+                        'user_id': user.id,
+                        'platform': profile_data.platform,
+                        'profile_url': url,
+                        'profile_type': profile_data.profile_type
+                    })
+
+                if rows:
+                    await platform_codes.register(db, {row['platform'] for row in rows}, user.id)
+                    await db.execute(profiles_insert_query(), rows)
+                    report.inserted += len(rows)
+
+            await db.commit()
+        except IntegrityError as error:
+            await db.rollback()
+            _raise_for_integrity_error(error, user.id)
+
+    if report.inserted:
+        await invalidate_profile_pages(user.id)
+    report.errors.sort(key=lambda error: error.line)
+    return report
+
+
 @router.put(
     '/{profile_id}',
     summary='Update a social profile',
     description='This endpoint updates an existing social profile belonging to the current authenticated user. '
-                'It requires the profile ID and updated data, and returns the updated social profile.',
-    response_model=SocialProfileResponse
+                'It requires the profile ID and updated data, and returns the updated social profile. Changing '
+                'the URL to one of another of the user\'s profiles returns `409 Conflict`.',
+    response_model=SocialProfileResponse,
+    responses={
+        status.HTTP_409_CONFLICT: {'description': 'The user has already linked this URL'},
+        status.HTTP_429_TOO_MANY_REQUESTS: {'description': 'The user has added too many new platforms within the hour'}
+    }
 )
 async def update_social_profile(
         db: Annotated[AsyncSession, Depends(get_db)],
@@ -74,22 +607,26 @@ async def update_social_profile(
         profile_id: int,
         profile_data: SocialProfileUpdate
 ):
-    profile = await db.get(SocialProfile, profile_id)
-    if profile is None or profile.user_id != user.id:
+    changes = profile_data.model_dump(exclude_unset=True, exclude_none=True)
+    if 'profile_url' in changes:
+        changes['profile_url'] = canonicalize_url(str(profile_data.profile_url))
+    if 'platform' in changes:
+        await platform_codes.register(db, [changes['platform']], user.id)
+
+    try:
+        profile = (await db.execute(profile_update_query(profile_id, user.id, changes))).first()
+    except IntegrityError as error:
+        await db.rollback()
+        _raise_for_integrity_error(error, user.id)
+    if profile is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail='Profile not found'
         )
-
-    if profile_data.platform is not None:
-        profile.platform = profile_data.platform
-    if profile_data.profile_url is not None:
-        profile.profile_url = str(profile_data.profile_url)
-    if profile_data.profile_type is not None:
-        profile.profile_type = profile_data.profile_type
+    profile, = await platform_codes.decode(db, [profile])
 
     await db.commit()
-    await db.refresh(profile)
+    await invalidate_profile_pages(user.id)
     return profile
 
 
@@ -105,13 +642,14 @@ async def delete_social_profile(
         user: Annotated[UserResponse, Depends(get_current_user)],
         profile_id: int
 ):
-    profile = await db.get(SocialProfile, profile_id)
-    if profile is None or profile.user_id != user.id:
+    profile = (await db.execute(profile_delete_query(profile_id, user.id))).first()
+    if profile is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail='Profile not found'
         )
+    profile, = await platform_codes.decode(db, [profile])
 
-    await db.delete(profile)
     await db.commit()
+    await invalidate_profile_pages(user.id)
     return profile
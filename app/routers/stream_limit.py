@@ -0,0 +1,91 @@
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Iterator
+
+from app.config import settings
+
+STREAM_MAX_CONNECTIONS = settings.stream_max_connections
+STREAM_RETRY_AFTER_SECONDS = 5
+
+
+class StreamLimiter:
+    """
+    Bounds the streaming responses that read from the database on this worker.
+
+    Each stream holds a database connection for as long as its client takes to download it,
+    so at most `capacity` run at once; further streams are rejected with 503 Service
+    Unavailable instead of opening connections without limit. Requests that hold other
+    resources for as long as their client takes, such as uploads, are bounded with `slot`.
+    """
+
+    def __init__(self, capacity: int = STREAM_MAX_CONNECTIONS):
+        self.capacity = capacity
+        self.active = 0
+        self.rejected = 0
+
+    def response(self, content: AsyncIterator, **kwargs: Any) -> StreamingResponse:
+        """
+        Take a slot for a stream and wrap its body in a response that gives the slot back once sent.
+
+        Params:
+            - content (AsyncIterator): The body; it should only connect once iterated.
+            - kwargs: Passed on to StreamingResponse.
+
+        Returns:
+            - StreamingResponse: The response holding the slot.
+
+        Raises:
+            - HTTPException: If every slot is taken, raises a 503 Service Unavailable error.
+        """
+
+        self._take()
+        return _LimitedStreamingResponse(content, self, **kwargs)
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """
+        Take a slot for the duration of a block.
+
+        Raises:
+            - HTTPException: If every slot is taken, raises a 503 Service Unavailable error.
+        """
+
+        self._take()
+        try:
+            yield
+        finally:
+            self.active -= 1
+
+    def _take(self) -> None:
+        if self.active >= self.capacity:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail='Server is busy, please try again later',
+                headers={'Retry-After': str(STREAM_RETRY_AFTER_SECONDS)}
+            )
+        self.active += 1
+
+
+class _LimitedStreamingResponse(StreamingResponse):
+
+    def __init__(self, content: AsyncIterator, limiter: StreamLimiter, **kwargs: Any):
+        super().__init__(content, **kwargs)
+        self._limiter = limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            # A client that goes away can leave the body suspended; it is closed here, so its
+            # connection is gone before the slot is given back.
+            try:
+                await self.body_iterator.aclose()
+            finally:
+                self._limiter.active -= 1
+
+
+stream_limiter = StreamLimiter()
@@ -55,6 +55,21 @@ class UserResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class AvailabilityResponse(BaseModel):
+    email: bool | None = Field(None, description='Whether the email address is available')
+    username: bool | None = Field(None, description='Whether the username is available')
+    phone_number: bool | None = Field(None, description='Whether the phone number is available')
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            'example': {
+                'email': True,
+                'username': False,
+            }
+        }
+    )
+
+
 class TokenResponse(BaseModel):
     access_token: str = Field(..., description='Access token for authentication')
     refresh_token: str = Field(..., description='Refresh token for generating a new access token')
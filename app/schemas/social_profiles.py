@@ -1,16 +1,18 @@
 from pydantic import BaseModel, constr, Field, HttpUrl, field_validator, ConfigDict
 
+from typing import Any, Literal
+
+from app.models.social_profile import PROFILE_TYPES
+
 MIN_LENGTH_PLATFORM = 3
+MAX_LENGTH_PLATFORM = 50
+MAX_BATCH_OPERATIONS = 100
 
-VALID_PROFILE_TYPES = {
-    'personal', 'business', 'creator', 'brand', 'organization', 'public_figure',
-    'group', 'page', 'channel', 'nonprofit', 'artist', 'support', 'event',
-    'media', 'forum', 'educational', 'professional'
-}
+VALID_PROFILE_TYPES = set(PROFILE_TYPES)
 
 
 class SocialProfileBase(BaseModel):
-    platform: constr(strip_whitespace=True, min_length=MIN_LENGTH_PLATFORM) = Field(..., description='Platform for the social profile')
+    platform: constr(strip_whitespace=True, min_length=MIN_LENGTH_PLATFORM, max_length=MAX_LENGTH_PLATFORM) = Field(..., description='Platform for the social profile')
     profile_url: HttpUrl = Field(..., description='URL of the social profile')
     profile_type: constr(strip_whitespace=True, to_lower=True) = Field(..., description='Type of the social profile')
 
@@ -36,7 +38,7 @@ class SocialProfileCreate(SocialProfileBase):
 
 
 class SocialProfileUpdate(SocialProfileBase):
-    platform: constr(strip_whitespace=True, min_length=MIN_LENGTH_PLATFORM) | None = Field(None, description='Platform for the social profile')
+    platform: constr(strip_whitespace=True, min_length=MIN_LENGTH_PLATFORM, max_length=MAX_LENGTH_PLATFORM) | None = Field(None, description='Platform for the social profile')
     profile_url: HttpUrl | None = Field(None, description='URL of the social profile')
     profile_type: constr(strip_whitespace=True, to_lower=True) | None = Field(None,
                                                                               description='Type of the social profile')
@@ -44,6 +46,8 @@ class SocialProfileUpdate(SocialProfileBase):
 
 class SocialProfileResponse(SocialProfileBase):
     id: int = Field(..., description='Unique identifier of the social profile')
+    # Platforms stored before their length was capped are returned as they are.
+    platform: str = Field(..., description='Platform for the social profile')
 
     model_config = ConfigDict(
         from_attributes=True,
@@ -56,3 +60,92 @@ class SocialProfileResponse(SocialProfileBase):
             }
         }
     )
+
+
+class SocialProfileSearchResult(SocialProfileResponse):
+    user_id: int = Field(..., description='ID of the user the profile belongs to')
+
+
+class SocialProfileStat(BaseModel):
+    platform: str = Field(..., description='Platform of the counted profiles')
+    profile_type: str = Field(..., description='Type of the counted profiles')
+    count: int = Field(..., description='Number of the user\'s profiles with this platform and type')
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SocialProfileStatsResponse(BaseModel):
+    total: int = Field(..., description='Number of the user\'s profiles')
+    stats: list[SocialProfileStat] = Field(..., description='Profile counts by platform and type')
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            'example': {
+                'total': 3,
+                'stats': [
+                    {'platform': 'Github', 'profile_type': 'personal', 'count': 1},
+                    {'platform': 'Twitter', 'profile_type': 'business', 'count': 2},
+                ]
+            }
+        }
+    )
+
+
+class SocialProfileBatchOperation(BaseModel):
+    op: Literal['create', 'update', 'delete'] = Field(..., description='Operation to perform')
+    id: int | None = Field(None, description='ID of the profile to update or delete')
+    data: dict[str, Any] | None = Field(
+        None,
+        description='Profile data, validated like the body of the create or update endpoint'
+    )
+
+
+class SocialProfileBatchRequest(BaseModel):
+    operations: list[SocialProfileBatchOperation] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_OPERATIONS,
+        description=f'Up to {MAX_BATCH_OPERATIONS} operations'
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            'example': {
+                'operations': [
+                    {
+                        'op': 'create',
+                        'data': {
+                            'platform': 'Twitter',
+                            'profile_url': 'https://twitter.com/testuser',
+                            'profile_type': 'personal'
+                        }
+                    },
+                    {'op': 'update', 'id': 1, 'data': {'profile_type': 'business'}},
+                    {'op': 'delete', 'id': 2}
+                ]
+            }
+        }
+    )
+
+
+class SocialProfileBatchResult(BaseModel):
+    index: int = Field(..., description='Position of the operation in the request')
+    op: Literal['create', 'update', 'delete'] = Field(..., description='Operation performed')
+    status_code: int = Field(..., description='HTTP status code the single-item endpoint would have returned')
+    profile: SocialProfileResponse | None = Field(None, description='The created, updated or deleted profile')
+    error: str | None = Field(None, description='Why the operation failed')
+
+
+class SocialProfileBatchResponse(BaseModel):
+    results: list[SocialProfileBatchResult] = Field(..., description='One result per operation, in request order')
+
+
+class SocialProfileImportError(BaseModel):
+    line: int = Field(..., description='Line of the file the rejected row starts on')
+    error: str = Field(..., description='Why the row was rejected')
+
+
+class SocialProfileImportResponse(BaseModel):
+    read: int = Field(0, description='Number of rows read from the file')
+    inserted: int = Field(0, description='Number of profiles created')
+    errors: list[SocialProfileImportError] = Field([], description='One entry per rejected row, in file order')
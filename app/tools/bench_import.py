@@ -0,0 +1,124 @@
+import argparse
+import asyncio
+import statistics
+import time
+
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import delete, insert
+
+from datetime import date
+
+from app.backend.db import async_session_maker, engine
+from app.main import app
+from app.models.social_profile import SocialProfile
+from app.models.user import User
+from app.routers.auth.utils import create_access_token
+
+BENCH_EMAIL = 'bench-import@example.com'
+PLATFORMS = ('Twitter', 'Github', 'Linkedin', 'Facebook', 'Instagram', 'Youtube', 'Reddit', 'Twitch')
+
+
+def generate_csv(rows: int, offset: int = 0) -> bytes:
+    lines = ['platform,profile_url,profile_type']
+    lines.extend(
+        f'{PLATFORMS[n % len(PLATFORMS)]},https://example.com/bench/{n},personal'
+        for n in range(offset, offset + rows)
+    )
+    return ('\n'.join(lines) + '\n').encode()
+
+
+async def _create_user() -> int:
+    async with async_session_maker() as db:
+        await db.execute(delete(User).where(User.email == BENCH_EMAIL))
+        user_id = await db.scalar(insert(User).values(
+            email=BENCH_EMAIL, username='bench-import', password='!', phone_number='+19999999999',
+            date_of_birth=date(2000, 1, 1)
+        ).returning(User.id))
+        await db.commit()
+    return user_id
+
+
+async def _clear_profiles(user_id: int) -> None:
+    async with async_session_maker() as db:
+        await db.execute(delete(SocialProfile).where(SocialProfile.user_id == user_id))
+        await db.commit()
+
+
+async def bench_import(client: AsyncClient, user_id: int, rows: int, iterations: int) -> list[float]:
+    """
+    Measure the throughput of `POST /social_profiles/import`.
+
+    Params:
+        - client (AsyncClient): A client authenticated as the bench user.
+        - user_id (int): The bench user, whose profiles are removed between iterations.
+        - rows (int): The number of rows per uploaded file.
+        - iterations (int): The number of timed uploads.
+
+    Returns:
+        - list[float]: The rate of every upload in rows per second.
+    """
+
+    source = generate_csv(rows)
+    rates = []
+    for _ in range(iterations):
+        await _clear_profiles(user_id)
+        started = time.perf_counter()
+        response = await client.post('/social_profiles/import', files={'file': ('profiles.csv', source)})
+        elapsed = time.perf_counter() - started
+        response.raise_for_status()
+        assert response.json()['inserted'] == rows, response.json()
+        rates.append(rows / elapsed)
+    return rates
+
+
+async def bench_create(client: AsyncClient, user_id: int, rows: int) -> float:
+    """
+    Measure the rate of creating profiles one request at a time, for comparison.
+    """
+
+    await _clear_profiles(user_id)
+    started = time.perf_counter()
+    for n in range(rows):
+        response = await client.post('/social_profiles/create', json={
+            'platform': PLATFORMS[n % len(PLATFORMS)],
+            'profile_url': f'https://example.com/bench/{n}',
+            'profile_type': 'personal'
+        })
+        response.raise_for_status()
+    return rows / (time.perf_counter() - started)
+
+
+async def run(sizes: list[int], iterations: int, create_rows: int) -> None:
+    user_id = await _create_user()
+    token = create_access_token({'sub': BENCH_EMAIL, 'id': user_id})
+    try:
+        async with AsyncClient(
+                transport=ASGITransport(app=app), base_url='http://bench', headers={'Authorization': f'Bearer {token}'}
+        ) as client:
+            print(f'{"request":<24} {"median rows/s":>14} {"best rows/s":>12}')
+            for rows in sizes:
+                rates = await bench_import(client, user_id, rows, iterations)
+                print(f'{f"import {rows:,} rows":<24} {statistics.median(rates):>14,.0f} {max(rates):>12,.0f}')
+            if create_rows:
+                rate = await bench_create(client, user_id, create_rows)
+                print(f'{f"create x {create_rows:,}":<24} {rate:>14,.0f} {rate:>12,.0f}')
+    finally:
+        await _clear_profiles(user_id)
+        async with async_session_maker() as db:
+            await db.execute(delete(User).where(User.id == user_id))
+            await db.commit()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure bulk profile import throughput against the database.')
+    parser.add_argument('--rows', type=int, action='append', help='rows per upload, may be repeated')
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--create-rows', type=int, default=200, help='profiles created one by one for comparison')
+    args = parser.parse_args()
+
+    asyncio.run(run(args.rows or [100, 1000, 10000], args.iterations, args.create_rows))
+
+
+if __name__ == '__main__':
+    main()
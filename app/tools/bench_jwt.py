@@ -0,0 +1,51 @@
+import argparse
+import time
+
+from app.routers.auth.codecs import JWT_CODECS
+from app.routers.auth.consts import SECRET_KEY_ACCESS, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+
+SAMPLE_CLAIMS = {'sub': 'benchmark@example.com', 'id': 123456}
+
+
+def bench_codec(backend: str, iterations: int) -> tuple[float, float]:
+    """
+    Measure encode and decode throughput of a JWT backend.
+
+    Params:
+        - backend (str): The name of the backend in `JWT_CODECS`.
+        - iterations (int): The number of tokens to encode and decode.
+
+    Returns:
+        - tuple[float, float]: The encode and decode rates in tokens per second.
+    """
+
+    codec = JWT_CODECS[backend](SECRET_KEY_ACCESS, ALGORITHM)
+    claims = {**SAMPLE_CLAIMS, 'exp': int(time.time()) + ACCESS_TOKEN_EXPIRE_MINUTES * 60}
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        token = codec.encode(claims)
+    encode_rate = iterations / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        codec.decode(token)
+    decode_rate = iterations / (time.perf_counter() - started)
+
+    return encode_rate, decode_rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare encode/decode throughput of the JWT backends.')
+    parser.add_argument('--iterations', type=int, default=20000)
+    parser.add_argument('--backend', choices=sorted(JWT_CODECS), action='append')
+    args = parser.parse_args()
+
+    print(f'{"backend":<8} {"encode tokens/s":>16} {"decode tokens/s":>16}')
+    for backend in args.backend or sorted(JWT_CODECS):
+        encode_rate, decode_rate = bench_codec(backend, args.iterations)
+        print(f'{backend:<8} {encode_rate:>16,.0f} {decode_rate:>16,.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.backend.db import engine
+from app.routers.pagination import DEFAULT_PAGE_SIZE
+from app.routers.platform_codes import platform_codes
+from app.routers.profile_queries import profiles_search_query
+
+BENCH_SCHEMA = 'bench'
+
+# The copy keeps the columns, defaults and indexes of `social_profiles` but not its foreign
+# key or triggers, so rows can be generated without users.
+CREATE_BENCH_TABLE = f'''
+    CREATE TABLE {BENCH_SCHEMA}.social_profiles (LIKE public.social_profiles INCLUDING ALL)
+'''
+
+# Platform codes come from the shared `platforms` table, which gains these names if it lacks them.
+SEED_BENCH_TABLE = f'''
+    WITH platforms AS (
+        SELECT array_agg(platform_code(name) ORDER BY i) AS codes
+        FROM unnest(ARRAY['Twitter', 'Github', 'Linkedin', 'Facebook', 'Instagram', 'Youtube', 'Reddit', 'Twitch'])
+            WITH ORDINALITY AS platform (name, i)
+    )
+    INSERT INTO {BENCH_SCHEMA}.social_profiles (user_id, platform_code, profile_url, profile_type_code)
+    SELECT n / 10 + 1,
+           platforms.codes[n % 8 + 1],
+           'https://example.com/user' || n || '/' || md5(n::text),
+           (ARRAY['personal', 'business', 'organization', 'group']::profile_type[])[n / 8 % 4 + 1]
+    FROM platforms, generate_series(:start, :stop - 1) AS n
+'''
+
+SEARCHES = {
+    'platform + type': {'platform': 'Github', 'profile_type': 'business'},
+    'url contains': {'url_contains': 'user4242'},
+    'url prefix': {'url_prefix': 'https://example.com/user777'},
+    'platform + url contains': {'platform': 'Twitter', 'url_contains': 'd41d'},
+}
+
+
+async def seed(db_engine: AsyncEngine, rows: int, batch_size: int) -> None:
+    async with db_engine.begin() as conn:
+        await conn.execute(text(f'DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE'))
+        await conn.execute(text(f'CREATE SCHEMA {BENCH_SCHEMA}'))
+        await conn.execute(text(CREATE_BENCH_TABLE))
+
+    for start in range(0, rows, batch_size):
+        async with db_engine.begin() as conn:
+            await conn.execute(text(SEED_BENCH_TABLE), {'start': start, 'stop': min(start + batch_size, rows)})
+
+    async with db_engine.begin() as conn:
+        await conn.execute(text(f'ANALYZE {BENCH_SCHEMA}.social_profiles'))
+
+
+async def bench_search(db_engine: AsyncEngine, filters: dict, iterations: int) -> tuple[float, float]:
+    """
+    Measure the latency of the first page of an admin profile search.
+
+    Params:
+        - db_engine (AsyncEngine): The engine with the seeded bench schema.
+        - filters (dict): Keyword arguments for `profiles_search_query`, with `platform` as a name.
+        - iterations (int): The number of timed searches.
+
+    Returns:
+        - tuple[float, float]: The p50 and p95 latencies in milliseconds.
+    """
+
+    filters = dict(filters)
+    if 'platform' in filters:
+        async with AsyncSession(db_engine) as db:
+            filters['platform_code'] = await platform_codes.get(db, filters.pop('platform'))
+
+    query = profiles_search_query(**filters).limit(DEFAULT_PAGE_SIZE)
+    timings = []
+    async with db_engine.connect() as conn:
+        # Unqualified names resolve to the bench table first; types and functions stay public.
+        await conn.execute(text(f'SET search_path TO {BENCH_SCHEMA}, public'))
+        await conn.execute(query)
+        for _ in range(iterations):
+            started = time.perf_counter()
+            (await conn.execute(query)).all()
+            timings.append((time.perf_counter() - started) * 1000)
+
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+async def run(rows: int, iterations: int, batch_size: int, keep: bool) -> None:
+    started = time.perf_counter()
+    await seed(engine, rows, batch_size)
+    print(f'Seeded {rows:,} profiles in {time.perf_counter() - started:.1f} s')
+
+    try:
+        print(f'{"search":<24} {"p50 ms":>8} {"p95 ms":>8}')
+        for name, filters in SEARCHES.items():
+            p50, p95 = await bench_search(engine, filters, iterations)
+            print(f'{name:<24} {p50:>8.2f} {p95:>8.2f}')
+    finally:
+        if not keep:
+            async with engine.begin() as conn:
+                await conn.execute(text(f'DROP SCHEMA {BENCH_SCHEMA} CASCADE'))
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure admin profile search latency on a generated table.')
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--batch-size', type=int, default=500_000)
+    parser.add_argument('--keep', action='store_true', help=f'keep the \'{BENCH_SCHEMA}\' schema for another run')
+    args = parser.parse_args()
+
+    asyncio.run(run(args.rows, args.iterations, args.batch_size, args.keep))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+import argparse
+import statistics
+import time
+
+from app.routers.auth.utils import build_crypt_context
+from app.routers.auth.consts import (
+    PASSWORD_HASH_SCHEME,
+    PASSWORD_HASH_TARGET_MS,
+    ARGON2_MEMORY_COST,
+    ARGON2_PARALLELISM
+)
+
+BCRYPT_MIN_ROUNDS = 4
+BCRYPT_MAX_ROUNDS = 20
+ARGON2_MAX_TIME_COST = 50
+
+SAMPLE_PASSWORD = 'Calibration-Password-1!'
+
+
+def measure_hash_ms(scheme: str, cost: int, samples: int) -> float:
+    """
+    Measure the median time of a single password hash with the given scheme and cost.
+
+    Params:
+        - scheme (str): The hashing scheme, 'bcrypt' or 'argon2'.
+        - cost (int): The bcrypt rounds or the argon2 time cost.
+        - samples (int): The number of hashes to time.
+
+    Returns:
+        - float: The median hashing time in milliseconds.
+    """
+
+    if scheme == 'bcrypt':
+        context = build_crypt_context(scheme, bcrypt_rounds=cost)
+    else:
+        context = build_crypt_context(scheme, argon2_time_cost=cost)
+
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        context.hash(SAMPLE_PASSWORD)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(scheme: str, target_ms: float, samples: int) -> tuple[int, float]:
+    """
+    Find the highest cost whose hashing time stays within the target latency on this machine.
+
+    Params:
+        - scheme (str): The hashing scheme, 'bcrypt' or 'argon2'.
+        - target_ms (float): The per-hash latency budget in milliseconds.
+        - samples (int): The number of hashes to time for each cost.
+
+    Returns:
+        - tuple[int, float]: The chosen cost and its measured hashing time in milliseconds.
+    """
+
+    low, high = (BCRYPT_MIN_ROUNDS, BCRYPT_MAX_ROUNDS) if scheme == 'bcrypt' else (1, ARGON2_MAX_TIME_COST)
+
+    best_cost = low
+    best_ms = measure_hash_ms(scheme, low, samples)
+    print(f'{scheme} cost={low}: {best_ms:.1f} ms')
+
+    for cost in range(low + 1, high + 1):
+        elapsed_ms = measure_hash_ms(scheme, cost, samples)
+        print(f'{scheme} cost={cost}: {elapsed_ms:.1f} ms')
+        if elapsed_ms > target_ms:
+            break
+        best_cost, best_ms = cost, elapsed_ms
+
+    return best_cost, best_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description='Find the password hashing cost that fits the per-hash latency budget on this hardware.'
+    )
+    parser.add_argument('--scheme', choices=['bcrypt', 'argon2'], default=PASSWORD_HASH_SCHEME)
+    parser.add_argument('--target-ms', type=float, default=PASSWORD_HASH_TARGET_MS)
+    parser.add_argument('--samples', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.scheme == 'argon2':
+        print(f'Using ARGON2_MEMORY_COST={ARGON2_MEMORY_COST} and ARGON2_PARALLELISM={ARGON2_PARALLELISM}')
+
+    cost, elapsed_ms = calibrate(args.scheme, args.target_ms, args.samples)
+
+    print(f'\nChosen cost takes {elapsed_ms:.1f} ms per hash (target {args.target_ms:.0f} ms). Add to your env file:')
+    print(f'PASSWORD_HASH_SCHEME={args.scheme}')
+    if args.scheme == 'bcrypt':
+        print(f'BCRYPT_ROUNDS={cost}')
+    else:
+        print(f'ARGON2_TIME_COST={cost}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from sqlalchemy import select, update, delete, values, column, func, any_, bindparam, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import TextIO
+
+from app.backend.db import engine
+from app.models.social_profile import SocialProfile
+from app.routers.profile_urls import canonicalize_url
+
+
+@dataclass
+class CanonicalizeStats:
+    scanned: int = 0
+    rewritten: int = 0
+    duplicates: int = 0
+    removed: int = 0
+    elapsed: float = 0.0
+
+
+def _batch_query(after_id: int, batch_size: int):
+    return (
+        select(SocialProfile.id, SocialProfile.user_id, SocialProfile.profile_url, SocialProfile.url_hash.is_(None))
+        .where(SocialProfile.id > after_id)
+        .order_by(SocialProfile.id)
+        .limit(batch_size)
+    )
+
+
+def _holders_query(rows: list[tuple[int, int, str]]):
+    """
+    Select, for each `(id, user_id, canonical_url)`, the other profiles of the user already
+    storing the canonical URL.
+    """
+
+    candidates = values(
+        column('id', Integer), column('user_id', Integer), column('url', String), name='candidates'
+    ).data(rows)
+    return (
+        select(candidates.c.id, func.min(SocialProfile.id))
+        .join(SocialProfile, (SocialProfile.user_id == candidates.c.user_id)
+              & (SocialProfile.url_hash == func.profile_url_hash(candidates.c.url))
+              & (SocialProfile.id != candidates.c.id))
+        .group_by(candidates.c.id)
+    )
+
+
+def _rewrite_query(rows: list[tuple[int, str]]):
+    # Setting `profile_url`, even to its current value, has the trigger set `url_hash`.
+    changes = values(column('id', Integer), column('url', String), name='changes').data(rows)
+    return (
+        update(SocialProfile)
+        .where(SocialProfile.id == changes.c.id)
+        .values(profile_url=changes.c.url)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _remove_query(profile_ids: list[int]):
+    return (
+        delete(SocialProfile)
+        .where(SocialProfile.id == any_(bindparam('ids', profile_ids, type_=ARRAY(Integer))))
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def canonicalize_profile_urls(
+        report: TextIO,
+        batch_size: int = 1000,
+        remove_duplicates: bool = False,
+        dry_run: bool = False,
+        db_engine: AsyncEngine = engine
+) -> CanonicalizeStats:
+    """
+    Rewrite stored profile URLs to their canonical form and find the URLs a user has twice.
+
+    Profiles are walked in id order, one batch per transaction. A profile is a duplicate if
+    the user already has its canonical URL on an earlier profile, or on any profile whose URL
+    is canonical while its own is not. Duplicates are written to the report and, with
+    `remove_duplicates`, deleted; otherwise they are left as they are.
+
+    Params:
+        - report (TextIO): Where to write one JSON object per duplicate.
+        - batch_size (int): The number of profiles per batch.
+        - remove_duplicates (bool): Whether to delete duplicates.
+        - dry_run (bool): Whether to roll everything back at the end.
+        - db_engine (AsyncEngine): The engine to work through.
+
+    Returns:
+        - CanonicalizeStats: Profile counts and the elapsed time.
+    """
+
+    stats = CanonicalizeStats()
+    started = time.perf_counter()
+
+    async with db_engine.connect() as conn:
+        after_id = 0
+        while True:
+            batch = (await conn.execute(_batch_query(after_id, batch_size))).all()
+            if not batch:
+                break
+            after_id = batch[-1].id
+            stats.scanned += len(batch)
+
+            canonical = {profile_id: canonicalize_url(url) for profile_id, _, url, _ in batch}
+            holders = dict((await conn.execute(_holders_query(
+                [(profile_id, user_id, canonical[profile_id]) for profile_id, user_id, _, _ in batch]
+            ))).all())
+
+            rewrites, duplicates, seen = [], [], {}
+            for profile_id, user_id, url, unhashed in batch:
+                key = (user_id, canonical[profile_id])
+                holder = seen.get(key, holders.get(profile_id))
+                if holder is not None and (holder < profile_id or url != canonical[profile_id]):
+                    duplicates.append(profile_id)
+                    report.write(json.dumps({
+                        'id': profile_id, 'user_id': user_id, 'profile_url': url, 'duplicate_of': holder
+                    }) + '\n')
+                    continue
+
+                seen[key] = profile_id
+                if unhashed or url != canonical[profile_id]:
+                    rewrites.append((profile_id, canonical[profile_id]))
+
+            stats.duplicates += len(duplicates)
+            if duplicates and remove_duplicates:
+                await conn.execute(_remove_query(duplicates))
+                stats.removed += len(duplicates)
+            if rewrites:
+                await conn.execute(_rewrite_query(rewrites))
+                stats.rewritten += len(rewrites)
+
+            # A dry run keeps one transaction, so later batches still see the earlier rewrites.
+            if not dry_run:
+                await conn.commit()
+
+        await conn.rollback()
+
+    stats.elapsed = time.perf_counter() - started
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Canonicalize stored social profile URLs and find duplicates.')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--remove-duplicates', action='store_true', help='delete the later profile of each duplicate')
+    parser.add_argument('--dry-run', action='store_true', help='report what would change without writing')
+    parser.add_argument('--report', help='file for duplicates (NDJSON), defaults to stderr')
+    args = parser.parse_args()
+
+    with (open(args.report, 'w', encoding='utf-8') if args.report else nullcontext(sys.stderr)) as report:
+        stats = asyncio.run(canonicalize_profile_urls(
+            report, args.batch_size, args.remove_duplicates, args.dry_run
+        ))
+
+    print(
+        f'Scanned {stats.scanned} profiles in {stats.elapsed:.1f} s: {stats.rewritten} rewritten, '
+        f'{stats.duplicates} duplicates, {stats.removed} removed' + (' (dry run)' if args.dry_run else '')
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from sqlalchemy import select, or_, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, TextIO
+
+from app.backend import url_checker
+from app.backend.db import engine
+from app.backend.url_checker import UrlChecker
+from app.models.social_profile import SocialProfile
+
+
+# Arrays rather than VALUES, so a batch whose statuses are all NULL still has typed columns.
+WRITE_RESULTS = '''
+    UPDATE social_profiles SET last_checked_at = results.checked_at, status = results.status
+    FROM unnest(CAST(:ids AS integer[]), CAST(:checked_at AS timestamptz[]), CAST(:statuses AS smallint[]))
+        AS results (id, checked_at, status)
+    WHERE social_profiles.id = results.id
+'''
+
+
+@dataclass
+class CheckStats:
+    checked: int = 0
+    reachable: int = 0
+    unreachable: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def urls_per_second(self) -> float:
+        return self.checked / self.elapsed if self.elapsed else 0.0
+
+
+def _batch_query(after_id: int, checked_before: datetime, batch_size: int):
+    return (
+        select(SocialProfile.id, SocialProfile.profile_url)
+        .where(SocialProfile.id > after_id)
+        .where(or_(SocialProfile.last_checked_at.is_(None), SocialProfile.last_checked_at < checked_before))
+        .order_by(SocialProfile.id)
+        .limit(batch_size)
+    )
+
+
+async def _due_profiles(
+        db_engine: AsyncEngine, checked_before: datetime, batch_size: int
+) -> AsyncIterator[tuple[int, str]]:
+    # Each batch is read on its own connection, so none is held while the URLs are checked.
+    after_id = 0
+    while True:
+        async with db_engine.connect() as conn:
+            batch = (await conn.execute(_batch_query(after_id, checked_before, batch_size))).all()
+        if not batch:
+            return
+        after_id = batch[-1].id
+        for profile_id, profile_url in batch:
+            yield profile_id, profile_url
+
+
+async def _write_results(db_engine: AsyncEngine, rows: list[tuple[int, datetime, int | None]]) -> None:
+    async with db_engine.begin() as conn:
+        ids, checked_at, statuses = zip(*rows)
+        await conn.execute(
+            text(WRITE_RESULTS), {'ids': list(ids), 'checked_at': list(checked_at), 'statuses': list(statuses)}
+        )
+
+
+async def check_profile_urls(
+        checker: UrlChecker,
+        report: TextIO,
+        max_age: timedelta = timedelta(days=7),
+        batch_size: int = 500,
+        db_engine: AsyncEngine = engine
+) -> CheckStats:
+    """
+    Check whether the URL of every social profile answers and store the outcome on the profile.
+
+    Profiles not checked within `max_age` are read in id order and checked concurrently by
+    `checker`; results are written back `batch_size` at a time as they complete. Profiles are
+    only marked checked once their result is written, so an interrupted run resumes where it
+    stopped.
+
+    Params:
+        - checker (UrlChecker): The checker to request the URLs with.
+        - report (TextIO): Where to write one JSON object per unreachable URL.
+        - max_age (timedelta): How long a check stays fresh.
+        - batch_size (int): The number of profiles per read and per write.
+        - db_engine (AsyncEngine): The engine to work through.
+
+    Returns:
+        - CheckStats: URL counts, the elapsed time and the rate of checks.
+    """
+
+    stats = CheckStats()
+    started = time.perf_counter()
+    checked_before = datetime.now(timezone.utc) - max_age
+
+    results: list[tuple[int, datetime, int | None]] = []
+    profiles = _due_profiles(db_engine, checked_before, batch_size)
+    async for profile_id, result in checker.check_all(profiles):
+        results.append((profile_id, datetime.now(timezone.utc), result.status))
+        stats.checked += 1
+        if result.reachable:
+            stats.reachable += 1
+        else:
+            stats.unreachable += 1
+            report.write(json.dumps({
+                'id': profile_id, 'profile_url': result.url, 'status': result.status, 'error': result.error
+            }) + '\n')
+
+        if len(results) >= batch_size:
+            await _write_results(db_engine, results)
+            results = []
+
+    if results:
+        await _write_results(db_engine, results)
+
+    stats.elapsed = time.perf_counter() - started
+    return stats
+
+
+async def run(args: argparse.Namespace, report: TextIO) -> CheckStats:
+    async with UrlChecker(
+            concurrency=args.concurrency, per_host=args.per_host, host_delay=args.host_delay, timeout=args.timeout
+    ) as checker:
+        stats = await check_profile_urls(checker, report, timedelta(hours=args.max_age_hours), args.batch_size)
+    await engine.dispose()
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Check that social profile URLs answer and record their status.')
+    parser.add_argument('--concurrency', type=int, default=url_checker.DEFAULT_CONCURRENCY, help='requests in flight')
+    parser.add_argument('--per-host', type=int, default=url_checker.DEFAULT_PER_HOST, help='requests in flight per host')
+    parser.add_argument('--host-delay', type=float, default=url_checker.DEFAULT_HOST_DELAY,
+                        help='seconds between requests to the same host')
+    parser.add_argument('--timeout', type=float, default=url_checker.DEFAULT_TIMEOUT, help='seconds per request')
+    parser.add_argument('--max-age-hours', type=float, default=24 * 7, help='recheck profiles checked longer ago')
+    parser.add_argument('--batch-size', type=int, default=500, help='profiles per read and per write')
+    parser.add_argument('--report', help='file for unreachable URLs (NDJSON), defaults to stderr')
+    args = parser.parse_args()
+
+    with (open(args.report, 'w', encoding='utf-8') if args.report else nullcontext(sys.stderr)) as report:
+        stats = asyncio.run(run(args, report))
+
+    print(
+        f'Checked {stats.checked} URLs in {stats.elapsed:.1f} s ({stats.urls_per_second:.1f} URLs/s): '
+        f'{stats.reachable} reachable, {stats.unreachable} unreachable'
+    )
+
+
+if __name__ == '__main__':
+    main()
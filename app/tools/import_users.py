@@ -0,0 +1,265 @@
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+import time
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Iterable, Iterator, TextIO
+
+from app.backend.db import engine
+from app.routers.auth.utils import get_password_hash
+from app.schemas.auth import UserCreate
+
+STAGING_TABLE = 'users_import'
+STAGING_COLUMNS = ('line', 'email', 'username', 'password', 'phone_number', 'date_of_birth')
+
+CREATE_STAGING_TABLE = f'''
+    CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} (
+        line integer NOT NULL,
+        email varchar NOT NULL,
+        username varchar NOT NULL,
+        password varchar NOT NULL,
+        phone_number varchar NOT NULL,
+        date_of_birth date NOT NULL
+    ) ON COMMIT DELETE ROWS
+'''
+
+# Inserts every staged row that does not violate a unique constraint on `users` and returns
+# the staged rows that were skipped, together with the first field they collide on.
+MERGE_STAGED_USERS = f'''
+    WITH inserted AS (
+        INSERT INTO users (email, username, password, phone_number, date_of_birth)
+        SELECT email, username, password, phone_number, date_of_birth FROM {STAGING_TABLE} ORDER BY line
+        ON CONFLICT DO NOTHING
+        RETURNING email
+    )
+    SELECT s.line,
+           CASE
+               WHEN EXISTS (SELECT 1 FROM users u WHERE u.email = s.email) THEN 'email'
+               WHEN EXISTS (SELECT 1 FROM users u WHERE u.username = s.username) THEN 'username'
+               ELSE 'phone_number'
+           END
+    FROM {STAGING_TABLE} s
+    WHERE NOT EXISTS (SELECT 1 FROM inserted i WHERE i.email = s.email)
+    ORDER BY s.line
+'''
+
+UNIQUE_FIELDS = ('email', 'username', 'phone_number')
+
+
+@dataclass
+class ImportStats:
+    read: int = 0
+    inserted: int = 0
+    invalid: int = 0
+    conflicts: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.read / self.elapsed if self.elapsed else 0.0
+
+
+def read_rows(file: TextIO, file_format: str) -> Iterator[tuple[int, dict]]:
+    """
+    Stream raw user records from a CSV (with a header row) or NDJSON file.
+
+    Params:
+        - file (TextIO): The opened source file.
+        - file_format (str): 'csv' or 'ndjson'.
+
+    Returns:
+        - Iterator[tuple[int, dict]]: The line number and the raw record of each row.
+    """
+
+    if file_format == 'csv':
+        reader = csv.DictReader(file)
+        for record in reader:
+            yield reader.line_num, record
+        return
+
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield line_number, record if isinstance(record, dict) else {}
+
+
+def batched(rows: Iterable, size: int) -> Iterator[list]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def validate_batch(batch: list[tuple[int, dict]], report: TextIO) -> list[tuple[int, UserCreate]]:
+    """
+    Validate a batch of raw records with the registration schema.
+
+    Invalid rows and rows repeating a unique field of an earlier row of the same batch are
+    written to the report and dropped. Rows without `password_repeat` are accepted as confirmed.
+
+    Params:
+        - batch (list[tuple[int, dict]]): Line numbers and raw records.
+        - report (TextIO): Where to write one JSON object per rejected row.
+
+    Returns:
+        - list[tuple[int, UserCreate]]: The line numbers and validated users.
+    """
+
+    users = []
+    seen = {field: set() for field in UNIQUE_FIELDS}
+    for line, record in batch:
+        record.setdefault('password_repeat', record.get('password'))
+        try:
+            user = UserCreate.model_validate(record)
+        except ValidationError as error:
+            errors = [f'{".".join(map(str, e["loc"]))}: {e["msg"]}' for e in error.errors(include_url=False)]
+            report.write(json.dumps({'line': line, 'error': '; '.join(errors)}) + '\n')
+            continue
+
+        duplicate = next((field for field in UNIQUE_FIELDS if getattr(user, field) in seen[field]), None)
+        if duplicate is not None:
+            report.write(json.dumps({'line': line, 'error': f'{duplicate} repeated in file'}) + '\n')
+            continue
+
+        for field in UNIQUE_FIELDS:
+            seen[field].add(getattr(user, field))
+        users.append((line, user))
+    return users
+
+
+def hash_passwords(pool: Executor, passwords: list[str], workers: int) -> list[str]:
+    return list(pool.map(get_password_hash, passwords, chunksize=max(1, len(passwords) // (workers * 4))))
+
+
+async def copy_and_merge(connection, users: list[tuple[int, UserCreate]], hashes: list[str]) -> list[tuple[int, str]]:
+    """
+    Load a batch into the staging table with COPY and merge it into `users`.
+
+    Params:
+        - connection: The raw asyncpg connection.
+        - users (list[tuple[int, UserCreate]]): The line numbers and validated users.
+        - hashes (list[str]): The password hashes, in the same order as `users`.
+
+    Returns:
+        - list[tuple[int, str]]: The line numbers of skipped rows and the field they conflict on.
+    """
+
+    records = [
+        (line, user.email, user.username, password, user.phone_number, user.date_of_birth)
+        for (line, user), password in zip(users, hashes)
+    ]
+    async with connection.transaction():
+        await connection.copy_records_to_table(STAGING_TABLE, records=records, columns=STAGING_COLUMNS)
+        return [(line, field) for line, field in await connection.fetch(MERGE_STAGED_USERS)]
+
+
+async def _merge_pending(connection, pending: tuple[list, list], report: TextIO) -> int:
+    users, hashes = pending
+    if not users:
+        return 0
+
+    conflicts = await copy_and_merge(connection, users, hashes)
+    for line, field in conflicts:
+        report.write(json.dumps({'line': line, 'error': f'{field} already registered'}) + '\n')
+    return len(conflicts)
+
+
+async def import_users(
+        file: TextIO,
+        file_format: str,
+        report: TextIO,
+        batch_size: int = 1000,
+        workers: int | None = None,
+        db_engine: AsyncEngine = engine
+) -> ImportStats:
+    """
+    Import users from a CSV or NDJSON file with constant memory.
+
+    Each batch is validated, its passwords are hashed on a process pool while the previous
+    batch is copied into a staging table and merged into `users`. Rows that fail validation
+    or conflict with existing users are written to the report.
+
+    Params:
+        - file (TextIO): The opened source file.
+        - file_format (str): 'csv' or 'ndjson'.
+        - report (TextIO): Where to write one JSON object per rejected row.
+        - batch_size (int): The number of rows per batch.
+        - workers (int | None): The number of hashing processes, defaults to the number of CPUs.
+        - db_engine (AsyncEngine): The engine to import through.
+
+    Returns:
+        - ImportStats: Row counts and the elapsed time.
+    """
+
+    stats = ImportStats()
+    started = time.perf_counter()
+    loop = asyncio.get_running_loop()
+
+    async with db_engine.connect() as conn:
+        raw_connection = await conn.get_raw_connection()
+        connection = raw_connection.driver_connection
+        await connection.execute(CREATE_STAGING_TABLE)
+
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = None
+            for batch in batched(read_rows(file, file_format), batch_size):
+                stats.read += len(batch)
+                users = validate_batch(batch, report)
+                stats.invalid += len(batch) - len(users)
+
+                hashing = loop.run_in_executor(
+                    None, hash_passwords, pool, [user.password for _, user in users], workers
+                )
+                if pending is not None:
+                    stats.conflicts += await _merge_pending(connection, pending, report)
+                pending = (users, await hashing)
+
+            if pending is not None:
+                stats.conflicts += await _merge_pending(connection, pending, report)
+
+    stats.inserted = stats.read - stats.invalid - stats.conflicts
+    stats.elapsed = time.perf_counter() - started
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Bulk import users from a CSV or NDJSON file.')
+    parser.add_argument('path', help='CSV file with a header row, or NDJSON file with one user per line')
+    parser.add_argument('--format', choices=['csv', 'ndjson'], help='defaults to the file extension')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--workers', type=int, help='password hashing processes, defaults to the number of CPUs')
+    parser.add_argument('--report', help='file for rejected rows (NDJSON), defaults to stderr')
+    args = parser.parse_args()
+
+    file_format = args.format or ('csv' if args.path.endswith('.csv') else 'ndjson')
+
+    with open(args.path, newline='', encoding='utf-8') as file, \
+            (open(args.report, 'w', encoding='utf-8') if args.report else nullcontext(sys.stderr)) as report:
+        stats = asyncio.run(import_users(file, file_format, report, args.batch_size, args.workers))
+
+    print(
+        f'Read {stats.read} rows in {stats.elapsed:.1f} s ({stats.rows_per_second:,.0f} rows/s): '
+        f'{stats.inserted} inserted, {stats.invalid} invalid, {stats.conflicts} conflicts'
+    )
+
+
+if __name__ == '__main__':
+    main()
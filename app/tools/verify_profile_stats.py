@@ -0,0 +1,152 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import TextIO
+
+from app.backend.db import engine
+
+# Locking the owners waits for their in-flight profile writes and holds off new ones until the
+# batch commits, so the counts read by the next statement stay exact while they are repaired.
+LOCK_USERS = '''
+    SELECT id FROM users WHERE id > :after_id ORDER BY id LIMIT :batch_size FOR UPDATE
+'''
+
+# The counters of the locked users that differ from a recount of their profiles. A NULL
+# `actual` is a counter without profiles, a NULL `stored` a missing counter.
+FIND_DRIFT = '''
+    WITH actual AS (
+        SELECT user_id, platform_code AS platform, profile_type_code AS profile_type, count(*) AS profile_count
+        FROM social_profiles WHERE user_id = ANY(:user_ids)
+        GROUP BY 1, 2, 3
+    ), stored AS (
+        SELECT user_id, platform, profile_type, profile_count
+        FROM profile_stats WHERE user_id = ANY(:user_ids)
+    )
+    SELECT user_id, platform, profile_type, platform_name(platform) AS platform_name,
+           actual.profile_count AS actual, stored.profile_count AS stored
+    FROM actual FULL JOIN stored USING (user_id, platform, profile_type)
+    WHERE actual.profile_count IS DISTINCT FROM stored.profile_count
+    ORDER BY 1, 2, 3
+'''
+
+REPAIR_COUNTS = '''
+    INSERT INTO profile_stats AS stats (user_id, platform, profile_type, profile_count)
+    SELECT user_id, platform, profile_type, profile_count
+    FROM unnest(CAST(:user_ids AS integer[]), CAST(:platforms AS integer[]),
+                CAST(:profile_types AS profile_type[]), CAST(:counts AS integer[]))
+        AS repaired (user_id, platform, profile_type, profile_count)
+    ON CONFLICT (user_id, platform, profile_type) DO UPDATE SET profile_count = excluded.profile_count
+'''
+
+REMOVE_COUNTS = '''
+    DELETE FROM profile_stats
+    WHERE (user_id, platform, profile_type) IN (
+        SELECT * FROM unnest(CAST(:user_ids AS integer[]), CAST(:platforms AS integer[]),
+                             CAST(:profile_types AS profile_type[]))
+    )
+'''
+
+
+@dataclass
+class VerifyStats:
+    users: int = 0
+    drifted: int = 0
+    repaired: int = 0
+    elapsed: float = 0.0
+
+
+def _columns(rows: list, count: bool = False) -> dict:
+    params = {
+        'user_ids': [row.user_id for row in rows],
+        'platforms': [row.platform for row in rows],
+        'profile_types': [row.profile_type for row in rows],
+    }
+    if count:
+        params['counts'] = [row.actual for row in rows]
+    return params
+
+
+async def verify_profile_stats(
+        report: TextIO,
+        batch_size: int = 1000,
+        dry_run: bool = False,
+        db_engine: AsyncEngine = engine
+) -> VerifyStats:
+    """
+    Recount the profiles of every user and repair the counters in `profile_stats` that drifted.
+
+    Users are walked in id order, one batch per transaction. Every counter that differs from
+    the recount is written to the report and, unless `dry_run` is set, corrected.
+
+    Params:
+        - report (TextIO): Where to write one JSON object per drifted counter.
+        - batch_size (int): The number of users per batch.
+        - dry_run (bool): Whether to only report the drift.
+        - db_engine (AsyncEngine): The engine to work through.
+
+    Returns:
+        - VerifyStats: User and counter counts and the elapsed time.
+    """
+
+    stats = VerifyStats()
+    started = time.perf_counter()
+
+    async with db_engine.connect() as conn:
+        after_id = 0
+        while True:
+            user_ids = (await conn.scalars(
+                text(LOCK_USERS), {'after_id': after_id, 'batch_size': batch_size}
+            )).all()
+            if not user_ids:
+                break
+            after_id = user_ids[-1]
+            stats.users += len(user_ids)
+
+            drift = (await conn.execute(text(FIND_DRIFT), {'user_ids': user_ids})).all()
+            for row in drift:
+                report.write(json.dumps({
+                    'user_id': row.user_id, 'platform': row.platform_name, 'profile_type': row.profile_type,
+                    'stored': row.stored, 'actual': row.actual
+                }) + '\n')
+            stats.drifted += len(drift)
+
+            if not dry_run:
+                repaired = [row for row in drift if row.actual is not None]
+                removed = [row for row in drift if row.actual is None]
+                if repaired:
+                    await conn.execute(text(REPAIR_COUNTS), _columns(repaired, count=True))
+                if removed:
+                    await conn.execute(text(REMOVE_COUNTS), _columns(removed))
+                stats.repaired += len(drift)
+            await conn.commit()
+
+    stats.elapsed = time.perf_counter() - started
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Recount social profiles and repair drifted profile stats.')
+    parser.add_argument('--batch-size', type=int, default=1000, help='users per transaction')
+    parser.add_argument('--dry-run', action='store_true', help='report drifted counters without repairing them')
+    parser.add_argument('--report', help='file for drifted counters (NDJSON), defaults to stderr')
+    args = parser.parse_args()
+
+    with (open(args.report, 'w', encoding='utf-8') if args.report else nullcontext(sys.stderr)) as report:
+        stats = asyncio.run(verify_profile_stats(report, args.batch_size, args.dry_run))
+
+    print(
+        f'Verified {stats.users} users in {stats.elapsed:.1f} s: '
+        f'{stats.drifted} counters drifted, {stats.repaired} repaired'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,13 @@
+import asyncio
+import time
+
 import pytest
 
-from sqlalchemy import delete
+from sqlalchemy import delete, event
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine, AsyncConnection
 
 from httpx import AsyncClient, ASGITransport
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Generator
 from datetime import date
 
 from app.main import app
@@ -12,6 +15,7 @@ from app.backend.db import Base, DATABASE_URL
 from app.backend.db_depends import get_db
 from app.models.user import User
 from app.models.social_profile import SocialProfile
+from app.routers.platform_codes import platform_codes
 from app.routers.auth.utils import get_password_hash
 
 test_engine = create_async_engine(DATABASE_URL)
@@ -66,6 +70,24 @@ async def clear_tables(db_engine: AsyncEngine) -> None:
         conn: AsyncConnection
         for table in reversed(Base.metadata.sorted_tables):
             await conn.execute(delete(table))
+    platform_codes.clear()
+
+
+@pytest.fixture(scope='function')
+def query_counter(db_engine: AsyncEngine) -> Generator[list[str], None, None]:
+    """
+    Records the SQL statements executed through the test engine while the test runs.
+    Clear the list right before the code under test to count only its statements.
+    """
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db_engine.sync_engine, 'before_cursor_execute', record)
+    yield statements
+    event.remove(db_engine.sync_engine, 'before_cursor_execute', record)
 
 
 @pytest.fixture(scope='function')
@@ -132,3 +154,141 @@ async def test_social_profile(db_session: AsyncSession, test_user: User) -> Soci
     await db_session.commit()
     await db_session.refresh(profile)
     return profile
+
+
+class RedisStandIn:
+    """
+    A minimal server speaking the Redis protocol, supporting what RedisCache uses.
+    """
+
+    def __init__(self):
+        self.data: dict[bytes, tuple[float, bytes]] = {}
+        self.commands: list[list[bytes]] = []
+        self.server: asyncio.Server | None = None
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self._serve, '127.0.0.1', 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                count = int((await reader.readuntil(b'\r\n'))[1:-2])
+                args = []
+                for _ in range(count):
+                    length = int((await reader.readuntil(b'\r\n'))[1:-2])
+                    args.append((await reader.readexactly(length + 2))[:-2])
+                self.commands.append(args)
+                writer.write(self._execute(args))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    def _execute(self, args: list[bytes]) -> bytes:
+        command = args[0].upper()
+        if command in (b'PING', b'SELECT', b'AUTH'):
+            return b'+OK\r\n'
+        if command == b'GET':
+            entry = self.data.get(args[1])
+            if entry is None or entry[0] <= time.time():
+                return b'$-1\r\n'
+            return b'$%d\r\n%s\r\n' % (len(entry[1]), entry[1])
+        if command == b'SET':
+            expires_at = time.time() + int(args[4]) / 1000 if len(args) > 4 else float('inf')
+            self.data[args[1]] = (expires_at, args[2])
+            return b'+OK\r\n'
+        if command == b'DEL':
+            return b':%d\r\n' % sum(self.data.pop(key, None) is not None for key in args[1:])
+        return b'-ERR unknown command\r\n'
+
+
+@pytest.fixture(scope='function')
+async def redis_stand_in() -> AsyncGenerator[RedisStandIn, None]:
+    server = RedisStandIn()
+    await server.start()
+    yield server
+    await server.stop()
+
+
+class HttpStandIn:
+    """
+    A minimal HTTP/1.1 server with keep-alive, answering by path:
+
+    - /status/<code>: <code> to any method.
+    - /head/<code>: <code> to HEAD, 200 to GET.
+    - /redirect/<code>: 302 to /status/<code>.
+    - /away/<host:port>: 302 to /status/200 on the given host.
+    - /slow/<seconds>: 200 after the given delay.
+    - /drop: closes the connection without answering.
+    """
+
+    # Link checks only reach loopback addresses once they are allowed.
+    network = '127.0.0.1/32'
+
+    def __init__(self):
+        self.requests: list[tuple[str, str]] = []
+        # The (start, end) time of every answered request.
+        self.intervals: list[tuple[float, float]] = []
+        self.connections = 0
+        self.server: asyncio.Server | None = None
+        self.port = 0
+
+    def url(self, path: str) -> str:
+        return f'http://127.0.0.1:{self.port}{path}'
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self._serve, '127.0.0.1', 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                method, path, _ = (await reader.readuntil(b'\r\n')).decode().split(' ', 2)
+                while await reader.readuntil(b'\r\n') != b'\r\n':
+                    pass
+                started = time.monotonic()
+                self.requests.append((method, path))
+
+                route, _, argument = path.strip('/').partition('/')
+                if route == 'drop':
+                    break
+                headers = ''
+                code = 200
+                if route == 'status':
+                    code = int(argument)
+                elif route == 'head' and method == 'HEAD':
+                    code = int(argument)
+                elif route == 'redirect':
+                    code, headers = 302, f'Location: /status/{argument}\r\n'
+                elif route == 'away':
+                    code, headers = 302, f'Location: http://{argument}/status/200\r\n'
+                elif route == 'slow':
+                    await asyncio.sleep(float(argument))
+
+                body = b'' if method == 'HEAD' else b'stand-in'
+                writer.write(
+                    f'HTTP/1.1 {code} Stand-In\r\nContent-Length: 8\r\n{headers}\r\n'.encode() + body
+                )
+                await writer.drain()
+                self.intervals.append((started, time.monotonic()))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        writer.close()
+
+
+@pytest.fixture(scope='function')
+async def http_stand_in() -> AsyncGenerator[HttpStandIn, None]:
+    server = HttpStandIn()
+    await server.start()
+    yield server
+    await server.stop()
@@ -0,0 +1,42 @@
+import pytest
+
+from app.backend.bloom import BloomFilter
+
+pytestmark = pytest.mark.anyio
+
+
+class TestBloomFilter:
+
+    async def test_added_items_are_members(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        items = [f'item-{i}' for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+        assert all(item in bloom for item in items)
+        assert 990 <= bloom.count <= 1000
+
+    async def test_false_positive_rate_is_bounded(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f'item-{i}')
+        false_positives = sum(f'other-{i}' in bloom for i in range(10000))
+        assert false_positives < 300
+
+    async def test_repeated_items_are_counted_once(self):
+        bloom = BloomFilter(capacity=10)
+        bloom.add('item')
+        bloom.add('item')
+        assert bloom.count == 1
+
+    async def test_clear(self):
+        bloom = BloomFilter(capacity=10)
+        bloom.add('item')
+        bloom.clear()
+        assert 'item' not in bloom
+        assert bloom.count == 0
+
+    async def test_invalid_parameters(self):
+        with pytest.raises(ValueError, match='capacity must be positive'):
+            BloomFilter(capacity=0)
+        with pytest.raises(ValueError, match='error rate must be between 0 and 1'):
+            BloomFilter(capacity=10, error_rate=1)
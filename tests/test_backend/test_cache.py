@@ -0,0 +1,157 @@
+import asyncio
+
+import pytest
+
+from app.backend.cache import MemoryCache, RedisCache, SingleFlight, create_cache
+
+from tests.conftest import RedisStandIn
+
+pytestmark = pytest.mark.anyio
+
+
+class TestMemoryCache:
+
+    async def test_get_set_delete(self):
+        cache = MemoryCache(max_bytes=1024)
+        assert await cache.get('key') is None
+
+        await cache.set('key', b'value', ttl=60)
+        assert await cache.get('key') == b'value'
+        assert cache.size == len('key') + len(b'value')
+
+        await cache.delete('key')
+        assert await cache.get('key') is None
+        assert cache.size == 0
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 2
+
+    async def test_entries_expire(self):
+        now = [0.0]
+        cache = MemoryCache(max_bytes=1024, clock=lambda: now[0])
+        await cache.set('key', b'value', ttl=10)
+
+        now[0] = 9.9
+        assert await cache.get('key') == b'value'
+        now[0] = 10
+        assert await cache.get('key') is None
+        assert len(cache) == 0
+
+    async def test_evicts_least_recently_used_by_size(self):
+        cache = MemoryCache(max_bytes=30)
+        await cache.set('a', b'x' * 9, ttl=60)
+        await cache.set('b', b'x' * 9, ttl=60)
+        await cache.set('c', b'x' * 9, ttl=60)
+        await cache.get('a')
+
+        await cache.set('d', b'x' * 9, ttl=60)
+        assert await cache.get('b') is None
+        assert await cache.get('a') is not None
+        assert cache.size <= cache.max_bytes
+
+    async def test_value_larger_than_cache_is_not_stored(self):
+        cache = MemoryCache(max_bytes=10)
+        await cache.set('key', b'x' * 10, ttl=60)
+        assert len(cache) == 0
+
+
+class TestRedisCache:
+
+    async def test_get_set_delete(self, redis_stand_in: RedisStandIn):
+        port = redis_stand_in.server.sockets[0].getsockname()[1]
+        cache = create_cache(f'redis://127.0.0.1:{port}/2')
+        assert isinstance(cache, RedisCache)
+
+        assert await cache.get('key') is None
+        await cache.set('key', b'line\r\nbreak', ttl=60)
+        assert await cache.get('key') == b'line\r\nbreak'
+        await cache.delete('key')
+        assert await cache.get('key') is None
+        await cache.close()
+
+        assert redis_stand_in.commands[0] == [b'SELECT', b'2']
+        assert redis_stand_in.commands[2] == [b'SET', b'key', b'line\r\nbreak', b'PX', b'60000']
+
+    async def test_unavailable_server_behaves_like_empty_cache(self, redis_stand_in: RedisStandIn):
+        port = redis_stand_in.server.sockets[0].getsockname()[1]
+        await redis_stand_in.stop()
+
+        cache = RedisCache('127.0.0.1', port)
+        await cache.set('key', b'value', ttl=60)
+        assert await cache.get('key') is None
+        assert cache.errors == 2
+
+
+class TestCreateCache:
+
+    def test_memory(self):
+        assert isinstance(create_cache('memory://', max_bytes=100), MemoryCache)
+
+    def test_redis_url(self):
+        cache = create_cache('redis://:secret@cache:6380/1')
+        assert (cache.host, cache.port, cache.db, cache.password) == ('cache', 6380, 1, 'secret')
+
+    def test_unsupported_url(self):
+        with pytest.raises(ValueError, match='Unsupported cache URL'):
+            create_cache('memcached://localhost')
+
+
+class TestSingleFlight:
+
+    async def test_concurrent_callers_share_one_build(self):
+        builds = []
+
+        async def build():
+            builds.append(1)
+            await asyncio.sleep(0.01)
+            return 'result'
+
+        single_flight = SingleFlight()
+        results = await asyncio.gather(*(single_flight.run('key', build) for _ in range(5)))
+        assert results == ['result'] * 5
+        assert len(builds) == 1
+
+        assert await single_flight.run('key', build) == 'result'
+        assert len(builds) == 2
+
+    async def test_errors_are_shared(self):
+        async def build():
+            await asyncio.sleep(0.01)
+            raise RuntimeError('failed')
+
+        single_flight = SingleFlight()
+        results = await asyncio.gather(*(single_flight.run('key', build) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    async def test_cancelled_build_is_taken_over(self):
+        builds = []
+
+        async def build():
+            builds.append(1)
+            await asyncio.sleep(0.05)
+            return 'result'
+
+        single_flight = SingleFlight()
+        leader = asyncio.create_task(single_flight.run('key', build))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(single_flight.run('key', build)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        assert await asyncio.gather(*followers) == ['result'] * 3
+        assert leader.cancelled()
+        assert len(builds) == 2
+
+    async def test_cancelled_follower_leaves_build_alone(self):
+        async def build():
+            await asyncio.sleep(0.05)
+            return 'result'
+
+        single_flight = SingleFlight()
+        leader = asyncio.create_task(single_flight.run('key', build))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(single_flight.run('key', build))
+        await asyncio.sleep(0.01)
+        follower.cancel()
+
+        assert await leader == 'result'
+        assert follower.cancelled()
@@ -0,0 +1,56 @@
+import pytest
+
+from app.backend.lru import TTLCache
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeClock:
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTTLCache:
+
+    async def test_get_and_set(self):
+        cache = TTLCache(maxsize=2, clock=FakeClock())
+        cache.set('a', 1, expires_at=2000)
+        assert cache.get('a') == 1
+        assert cache.get('b') is None
+        assert cache.stats() == {'hits': 1, 'misses': 1, 'size': 1, 'maxsize': 2}
+
+    async def test_evicts_least_recently_used(self):
+        cache = TTLCache(maxsize=2, clock=FakeClock())
+        cache.set('a', 1, expires_at=2000)
+        cache.set('b', 2, expires_at=2000)
+        cache.get('a')
+        cache.set('c', 3, expires_at=2000)
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3
+
+    async def test_expired_entry_is_evicted(self):
+        clock = FakeClock()
+        cache = TTLCache(maxsize=2, clock=clock)
+        cache.set('a', 1, expires_at=1010)
+        clock.now = 1010
+        assert cache.get('a') is None
+        assert len(cache) == 0
+
+    async def test_zero_size_disables_cache(self):
+        cache = TTLCache(maxsize=0, clock=FakeClock())
+        cache.set('a', 1, expires_at=2000)
+        assert cache.get('a') is None
+
+    async def test_pop_and_clear(self):
+        cache = TTLCache(maxsize=2, clock=FakeClock())
+        cache.set('a', 1, expires_at=2000)
+        cache.set('b', 2, expires_at=2000)
+        cache.pop('a')
+        assert cache.get('a') is None
+        cache.clear()
+        assert len(cache) == 0
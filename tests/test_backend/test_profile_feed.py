@@ -0,0 +1,207 @@
+import asyncio
+import tracemalloc
+
+import pytest
+
+from sqlalchemy import delete, insert, update, text, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from typing import AsyncGenerator
+from datetime import date
+
+from app.backend.db import DATABASE_URL, POSTGRES_HOST, POSTGRES_PORT
+from app.backend.profile_feed import ProfileFeed, ProfileEvent, Subscription, RESYNC
+from app.models.social_profile import SocialProfile, PROFILE_CHANGES_CHUNK_SIZE
+from app.models.user import User
+
+pytestmark = pytest.mark.anyio
+
+
+class FreezingProxy:
+    """
+    Forwards TCP connections to Postgres. Once frozen, the connections open at the time stay
+    open but pass no more data, like a half-open connection; new connections work as usual.
+    """
+
+    def __init__(self):
+        self.port = 0
+        self._server: asyncio.Server | None = None
+        self._connections: list[dict] = []
+
+    async def start(self) -> int:
+        self._server = await asyncio.start_server(self._serve, '127.0.0.1', 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    def freeze(self) -> None:
+        for connection in self._connections:
+            connection['frozen'] = True
+
+    async def stop(self) -> None:
+        self._server.close()
+        for connection in self._connections:
+            for task in connection['tasks']:
+                task.cancel()
+            for writer in connection['writers']:
+                writer.close()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        upstream_reader, upstream_writer = await asyncio.open_connection(POSTGRES_HOST, int(POSTGRES_PORT))
+        connection = {'frozen': False, 'writers': [writer, upstream_writer], 'tasks': []}
+        self._connections.append(connection)
+
+        async def pipe(source: asyncio.StreamReader, target: asyncio.StreamWriter) -> None:
+            try:
+                while data := await source.read(65536):
+                    if connection['frozen']:
+                        await asyncio.Event().wait()
+                    target.write(data)
+                    await target.drain()
+            finally:
+                # Pass on the end of the stream; asyncpg waits for it after a cancel request.
+                target.close()
+
+        connection['tasks'] = [
+            asyncio.create_task(pipe(reader, upstream_writer)), asyncio.create_task(pipe(upstream_reader, writer))
+        ]
+        await asyncio.gather(*connection['tasks'], return_exceptions=True)
+
+
+class TestSubscription:
+
+    async def test_get(self):
+        subscription = Subscription(1, queue_size=4)
+        assert await subscription.get(timeout=0.01) is None
+
+        waiting = asyncio.create_task(subscription.get(timeout=1))
+        await asyncio.sleep(0)
+        subscription.push(ProfileEvent('create', (1,)))
+        assert await waiting == ProfileEvent('create', (1,))
+
+    async def test_backlog_is_bounded(self):
+        subscription = Subscription(1, queue_size=3)
+        for profile_id in range(5):
+            subscription.push(ProfileEvent('update', (profile_id,)))
+
+        assert len(subscription) == 2
+        assert subscription.dropped == 3
+        assert await subscription.get() == RESYNC
+        assert await subscription.get() == ProfileEvent('update', (4,))
+
+
+class TestProfileFeed:
+
+    def test_dispatches_by_owner(self):
+        feed = ProfileFeed(max_subscribers=3)
+        first, second, other = feed.subscribe(1), feed.subscribe(1), feed.subscribe(2)
+        assert len(feed) == 3 and feed.full
+
+        feed._on_notification(None, 0, feed.channel, '1 create 4,5')
+        feed._on_notification(None, 0, feed.channel, '3 delete 6')
+        feed._on_notification(None, 0, feed.channel, 'garbage')
+        assert len(first) == len(second) == 1 and len(other) == 0
+        assert feed.errors == 1
+
+        feed.unsubscribe(first)
+        feed.unsubscribe(first)
+        assert len(feed) == 2
+
+    def test_idle_subscribers_memory(self):
+        feed = ProfileFeed(max_subscribers=20000)
+        tracemalloc.start()
+        try:
+            subscriptions = [feed.subscribe(user_id) for user_id in range(10000)]
+            size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert len(feed) == len(subscriptions) == 10000
+        assert size / len(subscriptions) < 512
+
+    @pytest.fixture(scope='function')
+    async def feed(self, db_engine: AsyncEngine) -> AsyncGenerator[ProfileFeed, None]:
+        feed = ProfileFeed()
+        assert await feed.start()
+        yield feed
+        await feed.stop()
+
+    async def _events(self, subscription: Subscription) -> list[ProfileEvent]:
+        events = []
+        while (event := await subscription.get(timeout=0.2)) is not None:
+            events.append(event)
+        return events
+
+    async def test_relays_changes(
+            self, feed: ProfileFeed, db_session: AsyncSession, test_user: User, test_social_profile: SocialProfile
+    ):
+        other_user_id = await db_session.scalar(insert(User).values(
+            email='other@example.com', username='other', password='!', phone_number='+1999', date_of_birth=date(2000, 1, 1)
+        ).returning(User.id))
+        await db_session.commit()
+        subscription = feed.subscribe(test_user.id)
+        other = feed.subscribe(other_user_id)
+
+        profile = SocialProfile(
+            user_id=test_user.id, platform='Github', profile_url='https://github.com/testuser', profile_type='personal'
+        )
+        db_session.add(profile)
+        await db_session.commit()
+        await db_session.execute(
+            update(SocialProfile).where(SocialProfile.id == profile.id).values(profile_type='business')
+        )
+        # Recording a URL check is not a change owners see.
+        await db_session.execute(update(SocialProfile).values(status=200))
+        await db_session.execute(delete(SocialProfile).where(SocialProfile.id == test_social_profile.id))
+        await db_session.commit()
+
+        assert await self._events(subscription) == [
+            ProfileEvent('create', (profile.id,)),
+            ProfileEvent('update', (profile.id,)),
+            ProfileEvent('delete', (test_social_profile.id,)),
+        ]
+        assert await self._events(other) == []
+
+    async def test_large_statements_are_chunked(self, feed: ProfileFeed, db_session: AsyncSession, test_user: User):
+        subscription = feed.subscribe(test_user.id)
+        count = PROFILE_CHANGES_CHUNK_SIZE * 2 + 1
+        await db_session.execute(text('''
+            INSERT INTO social_profiles (user_id, platform_code, profile_url, profile_type_code)
+            SELECT :user_id, platform_code('Github'), 'https://github.com/' || n, 'personal'
+            FROM generate_series(1, :count) AS n
+        '''), {'user_id': test_user.id, 'count': count})
+        await db_session.commit()
+
+        events = await self._events(subscription)
+        assert [len(event.ids) for event in events] == [PROFILE_CHANGES_CHUNK_SIZE, PROFILE_CHANGES_CHUNK_SIZE, 1]
+        assert len({profile_id for event in events for profile_id in event.ids}) == count
+
+    async def test_reconnects(self, feed: ProfileFeed, db_session: AsyncSession, test_user: User):
+        subscription = feed.subscribe(test_user.id)
+        await db_session.execute(text('''
+            SELECT pg_terminate_backend(pid) FROM pg_stat_activity
+            WHERE query LIKE 'LISTEN%profile_changes%' AND pid <> pg_backend_pid()
+        '''))
+        await db_session.commit()
+
+        assert await subscription.get(timeout=5) == RESYNC
+        assert await feed.start()
+        assert feed.reconnects == 1
+
+    async def test_reconnects_when_connection_stops_answering(self, db_engine: AsyncEngine, test_user: User):
+        proxy = FreezingProxy()
+        port = await proxy.start()
+        engine = create_async_engine(make_url(DATABASE_URL).set(host='127.0.0.1', port=port), poolclass=NullPool)
+        feed = ProfileFeed(db_engine=engine, heartbeat=0.1, ping_timeout=0.2)
+        try:
+            assert await feed.start()
+            subscription = feed.subscribe(test_user.id)
+            proxy.freeze()
+
+            assert await subscription.get(timeout=5) == RESYNC
+            assert feed.reconnects == 1
+            assert feed.errors >= 1
+        finally:
+            await feed.stop()
+            await proxy.stop()
+            await engine.dispose()
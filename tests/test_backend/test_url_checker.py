@@ -0,0 +1,160 @@
+import asyncio
+
+import pytest
+
+from app.backend.url_checker import UrlChecker
+
+from tests.conftest import HttpStandIn
+
+pytestmark = pytest.mark.anyio
+
+
+def max_overlap(intervals: list[tuple[float, float]]) -> int:
+    events = sorted([(start, 1) for start, _ in intervals] + [(end, -1) for _, end in intervals])
+    in_flight = peak = 0
+    for _, change in events:
+        in_flight += change
+        peak = max(peak, in_flight)
+    return peak
+
+
+class TestUrlChecker:
+
+    async def test_results(self, http_stand_in: HttpStandIn):
+        async with UrlChecker(host_delay=0, timeout=0.5, allowed_networks=[HttpStandIn.network]) as checker:
+            ok, missing, head_refused, redirected, slow, dropped, refused = await asyncio.gather(
+                checker.check(http_stand_in.url('/status/204')),
+                checker.check(http_stand_in.url('/status/404')),
+                checker.check(http_stand_in.url('/head/405')),
+                checker.check(http_stand_in.url('/redirect/200')),
+                checker.check(http_stand_in.url('/slow/2')),
+                checker.check(http_stand_in.url('/drop')),
+                checker.check('http://127.0.0.1:1/'),
+            )
+
+        assert (ok.status, ok.method, ok.reachable) == (204, 'HEAD', True)
+        assert (missing.status, missing.method, missing.reachable) == (404, 'GET', False)
+        assert (head_refused.status, head_refused.method, head_refused.reachable) == (200, 'GET', True)
+        assert redirected.status == 200
+        assert (slow.status, slow.error, slow.reachable) == (None, 'ReadTimeout', False)
+        assert (dropped.status, dropped.error, dropped.method) == (None, 'RemoteProtocolError', 'GET')
+        assert (refused.status, refused.error, refused.method) == (None, 'ConnectError', 'HEAD')
+
+        assert ('GET', '/status/204') not in http_stand_in.requests
+        assert http_stand_in.requests.count(('HEAD', '/head/405')) == 1
+        assert http_stand_in.requests.count(('GET', '/head/405')) == 1
+
+    async def test_rate_limited_head_is_not_retried(self, http_stand_in: HttpStandIn):
+        async with UrlChecker(host_delay=0, allowed_networks=[HttpStandIn.network]) as checker:
+            result = await checker.check(http_stand_in.url('/status/429'))
+
+        assert (result.status, result.method) == (429, 'HEAD')
+        assert http_stand_in.requests == [('HEAD', '/status/429')]
+
+    async def test_per_host_limit_and_connection_reuse(self, http_stand_in: HttpStandIn):
+        urls = [(n, http_stand_in.url('/slow/0.02')) for n in range(20)]
+        async with UrlChecker(concurrency=10, per_host=2, host_delay=0, allowed_networks=[HttpStandIn.network]) as checker:
+            results = [item async for item in checker.check_all(urls)]
+
+        assert sorted(key for key, _ in results) == list(range(20))
+        assert all(result.status == 200 for _, result in results)
+        assert max_overlap(http_stand_in.intervals) <= 2
+        assert http_stand_in.connections <= 2
+
+    async def test_global_limit(self):
+        servers = [HttpStandIn() for _ in range(3)]
+        for server in servers:
+            await server.start()
+        try:
+            urls = [(n, servers[n % 3].url('/slow/0.05')) for n in range(18)]
+            async with UrlChecker(concurrency=4, per_host=4, host_delay=0, allowed_networks=[HttpStandIn.network]) as checker:
+                results = [item async for item in checker.check_all(urls)]
+        finally:
+            for server in servers:
+                await server.stop()
+
+        assert len(results) == 18
+        intervals = [interval for server in servers for interval in server.intervals]
+        assert max_overlap(intervals) <= 4
+        assert all(max_overlap(server.intervals) >= 1 for server in servers)
+
+    async def test_host_delay(self, http_stand_in: HttpStandIn):
+        urls = [(n, http_stand_in.url('/status/200')) for n in range(5)]
+        async with UrlChecker(per_host=5, host_delay=0.05, allowed_networks=[HttpStandIn.network]) as checker:
+            results = [item async for item in checker.check_all(urls)]
+
+        assert len(results) == 5
+        starts = sorted(start for start, _ in http_stand_in.intervals)
+        assert all(later - earlier >= 0.04 for earlier, later in zip(starts, starts[1:]))
+
+    async def test_host_delay_after_waiting_for_a_slot(self, http_stand_in: HttpStandIn):
+        busy = HttpStandIn()
+        await busy.start()
+        try:
+            async with UrlChecker(concurrency=1, per_host=2, host_delay=0.05, allowed_networks=[HttpStandIn.network]) as checker:
+                # The slow check holds the only slot past the start times booked for the others.
+                await asyncio.gather(
+                    checker.check(busy.url('/slow/0.2')),
+                    checker.check(http_stand_in.url('/status/200')),
+                    checker.check(http_stand_in.url('/status/200')),
+                )
+        finally:
+            await busy.stop()
+
+        starts = sorted(start for start, _ in http_stand_in.intervals)
+        assert len(starts) == 2
+        assert starts[1] - starts[0] >= 0.04
+
+    async def test_redirects_wait_for_their_host(self, http_stand_in: HttpStandIn):
+        async with UrlChecker(host_delay=0.05, allowed_networks=[HttpStandIn.network]) as checker:
+            result = await checker.check(http_stand_in.url('/redirect/200'))
+
+        assert (result.status, result.method) == (200, 'HEAD')
+        assert http_stand_in.requests == [('HEAD', '/redirect/200'), ('HEAD', '/status/200')]
+        starts = sorted(start for start, _ in http_stand_in.intervals)
+        assert starts[1] - starts[0] >= 0.04
+
+    async def test_too_many_redirects(self, http_stand_in: HttpStandIn):
+        async with UrlChecker(host_delay=0, max_redirects=0, allowed_networks=[HttpStandIn.network]) as checker:
+            result = await checker.check(http_stand_in.url('/redirect/200'))
+
+        assert (result.status, result.error, result.method) == (None, 'TooManyRedirects', 'HEAD')
+        assert http_stand_in.requests == [('HEAD', '/redirect/200')]
+
+    async def test_window_bounds_pending_checks(self, http_stand_in: HttpStandIn):
+        taken = []
+
+        async def source():
+            for n in range(10):
+                taken.append(n)
+                yield n, http_stand_in.url('/status/200')
+
+        async with UrlChecker(host_delay=0, allowed_networks=[HttpStandIn.network]) as checker:
+            results = checker.check_all(source(), window=3)
+            await anext(results)
+            assert len(taken) <= 4
+            remaining = [item async for item in results]
+
+        assert len(remaining) == 9
+
+    async def test_refuses_non_public_addresses(self, http_stand_in: HttpStandIn):
+        async with UrlChecker(host_delay=0) as checker:
+            results = await asyncio.gather(
+                checker.check(http_stand_in.url('/status/200')),
+                checker.check(f'http://localhost:{http_stand_in.port}/status/200'),
+                checker.check(f'http://[::1]:{http_stand_in.port}/status/200'),
+                checker.check('http://169.254.169.254/latest/meta-data/'),
+                checker.check('http://10.0.0.1/'),
+                checker.check('http://[::ffff:127.0.0.1]/'),
+            )
+
+        assert all((result.status, result.error) == (None, 'ForbiddenAddress') for result in results)
+        assert http_stand_in.connections == 0
+
+    async def test_refuses_non_public_redirect_target(self, http_stand_in: HttpStandIn):
+        # Only the stand-in's own address is allowed, so the hop to 127.0.0.2 is refused.
+        async with UrlChecker(host_delay=0, allowed_networks=[HttpStandIn.network]) as checker:
+            result = await checker.check(http_stand_in.url(f'/away/127.0.0.2:{http_stand_in.port}'))
+
+        assert (result.status, result.error, result.method) == (None, 'ForbiddenAddress', 'HEAD')
+        assert http_stand_in.requests == [('HEAD', f'/away/127.0.0.2:{http_stand_in.port}')]
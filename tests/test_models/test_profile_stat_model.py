@@ -0,0 +1,51 @@
+import pytest
+
+from sqlalchemy import select, update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.models.social_profile import SocialProfile
+from app.models.profile_stat import ProfileStat
+
+pytestmark = pytest.mark.anyio
+
+
+async def _stats(db_session: AsyncSession) -> dict[tuple[str, str], int]:
+    rows = await db_session.execute(select(ProfileStat.platform, ProfileStat.profile_type, ProfileStat.profile_count))
+    return {(platform, profile_type): count for platform, profile_type, count in rows}
+
+
+async def test_profile_changes_update_stats(db_session: AsyncSession, test_user: User):
+    db_session.add_all([
+        SocialProfile(owner=test_user, platform=platform, profile_url=f'https://example.com/{i}', profile_type=profile_type)
+        for i, (platform, profile_type) in enumerate([
+            ('Github', 'personal'), ('Github', 'personal'), ('Twitter', 'business')
+        ])
+    ])
+    await db_session.commit()
+    assert await _stats(db_session) == {('Github', 'personal'): 2, ('Twitter', 'business'): 1}
+
+    await db_session.execute(
+        update(SocialProfile).where(SocialProfile.profile_type == 'business').values(profile_type='personal')
+    )
+    await db_session.commit()
+    assert await _stats(db_session) == {('Github', 'personal'): 2, ('Twitter', 'personal'): 1}
+
+    await db_session.execute(update(SocialProfile).values(profile_url=SocialProfile.profile_url + '/'))
+    await db_session.commit()
+    assert await _stats(db_session) == {('Github', 'personal'): 2, ('Twitter', 'personal'): 1}
+
+    await db_session.execute(delete(SocialProfile).where(SocialProfile.platform == 'Github'))
+    await db_session.commit()
+    assert await _stats(db_session) == {('Twitter', 'personal'): 1}
+
+
+async def test_rolled_back_changes_keep_stats(db_session: AsyncSession, test_user: User):
+    db_session.add(SocialProfile(
+        owner=test_user, platform='Github', profile_url='https://github.com/testuser', profile_type='personal'
+    ))
+    await db_session.commit()
+
+    await db_session.execute(delete(SocialProfile))
+    await db_session.rollback()
+    assert await _stats(db_session) == {('Github', 'personal'): 1}
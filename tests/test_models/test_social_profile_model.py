@@ -1,12 +1,16 @@
+import hashlib
+
 import pytest
 
-from sqlalchemy import select
+from sqlalchemy import select, insert, update, delete, text
 from sqlalchemy.orm import selectinload
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import IntegrityError, DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
 from app.models.social_profile import SocialProfile
+from app.models.platform import Platform
+from app.routers.platform_codes import platform_codes
 
 pytestmark = pytest.mark.anyio
 
@@ -177,3 +181,108 @@ async def test_create_multiple_social_profiles_for_user(db_session: AsyncSession
     assert retrieved_user.social_profiles[1].profile_type == 'business'
     assert retrieved_user.social_profiles[0].user_id == test_user.id
     assert retrieved_user.social_profiles[1].user_id == test_user.id
+
+
+async def _profiles_version(db_session: AsyncSession, user: User) -> int:
+    return await db_session.scalar(select(User.profiles_version).where(User.id == user.id))
+
+
+async def test_profile_changes_bump_owner_version(db_session: AsyncSession, test_user: User):
+    assert await _profiles_version(db_session, test_user) == 0
+
+    await platform_codes.register(db_session, ['Telegram'])
+    await db_session.execute(insert(SocialProfile).values([
+        {'user_id': test_user.id, 'platform': 'Telegram', 'profile_url': f'https://t.me/testuser{i}', 'profile_type': 'personal'}
+        for i in range(3)
+    ]))
+    assert await _profiles_version(db_session, test_user) == 1
+
+    await db_session.execute(update(SocialProfile).values(profile_type='business'))
+    assert await _profiles_version(db_session, test_user) == 2
+
+    await db_session.execute(delete(SocialProfile))
+    assert await _profiles_version(db_session, test_user) == 3
+
+    await db_session.execute(delete(SocialProfile))
+    assert await _profiles_version(db_session, test_user) == 3
+
+
+async def test_profile_changes_do_not_bump_other_users(
+        db_session: AsyncSession, test_user: User, test_social_profile: SocialProfile
+):
+    other_user = User(
+        email='other@example.com',
+        username='otheruser',
+        password='hashedpassword',
+        phone_number='+1987654321',
+        date_of_birth=test_user.date_of_birth
+    )
+    db_session.add(other_user)
+    await db_session.commit()
+    version = await _profiles_version(db_session, test_user)
+
+    db_session.add(SocialProfile(
+        user_id=other_user.id, platform='Telegram', profile_url='https://t.me/other', profile_type='personal'
+    ))
+    await db_session.commit()
+
+    assert await _profiles_version(db_session, test_user) == version
+    assert await _profiles_version(db_session, other_user) == 1
+
+
+async def test_platform_is_stored_as_code(db_session: AsyncSession, test_user: User):
+    db_session.add_all([
+        SocialProfile(owner=test_user, platform=platform, profile_url=f'https://example.com/{i}', profile_type='personal')
+        for i, platform in enumerate(['Telegram', 'Github', 'Telegram'])
+    ])
+    await db_session.commit()
+
+    platforms = dict((await db_session.execute(select(Platform.name, Platform.id))).all())
+    codes = (await db_session.scalars(text('SELECT platform_code FROM social_profiles ORDER BY id'))).all()
+    assert sorted(platforms) == ['Github', 'Telegram']
+    assert codes == [platforms['Telegram'], platforms['Github'], platforms['Telegram']]
+
+    profiles = (await db_session.scalars(select(SocialProfile).order_by(SocialProfile.id))).all()
+    assert [profile.platform for profile in profiles] == ['Telegram', 'Github', 'Telegram']
+
+
+async def test_rolled_back_platform_is_not_kept(db_session: AsyncSession, test_user: User):
+    db_session.add(SocialProfile(
+        owner=test_user, platform='Telegram', profile_url='https://t.me/testuser', profile_type='personal'
+    ))
+    await db_session.flush()
+    await db_session.rollback()
+
+    assert (await db_session.scalars(select(Platform.name))).all() == []
+
+
+async def test_invalid_profile_type_is_rejected(db_session: AsyncSession, test_user: User):
+    db_session.add(SocialProfile(
+        owner=test_user, platform='Telegram', profile_url='https://t.me/testuser', profile_type='unknown'
+    ))
+    with pytest.raises(DBAPIError):
+        await db_session.commit()
+
+
+async def test_url_hash_follows_profile_url(db_session: AsyncSession, test_user: User):
+    profile = SocialProfile(
+        owner=test_user, platform='Github', profile_url='https://github.com/testuser', profile_type='personal'
+    )
+    db_session.add(profile)
+    await db_session.commit()
+    await db_session.refresh(profile)
+    assert profile.url_hash == hashlib.md5(b'https://github.com/testuser').digest()
+
+    profile.profile_url = 'https://github.com/other'
+    await db_session.commit()
+    await db_session.refresh(profile)
+    assert profile.url_hash == hashlib.md5(b'https://github.com/other').digest()
+
+
+async def test_duplicate_url_is_rejected(db_session: AsyncSession, test_user: User):
+    db_session.add_all([
+        SocialProfile(owner=test_user, platform=platform, profile_url='https://github.com/testuser', profile_type='personal')
+        for platform in ('Github', 'Other')
+    ])
+    with pytest.raises(IntegrityError):
+        await db_session.commit()
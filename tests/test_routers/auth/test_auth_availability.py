@@ -0,0 +1,93 @@
+import pytest
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.routers.auth.availability import AvailabilityIndex
+
+pytestmark = pytest.mark.anyio
+
+
+class FailingSession:
+    """
+    Streams the rows of a real session, but loses the connection after `rows` of them.
+    """
+
+    def __init__(self, db: AsyncSession, rows: int):
+        self.db = db
+        self.rows = rows
+
+    async def stream(self, query):
+        result = await self.db.stream(query)
+
+        async def rows():
+            sent = 0
+            async for row in result:
+                if sent == self.rows:
+                    raise ConnectionError('connection lost')
+                yield row
+                sent += 1
+
+        return rows()
+
+
+class TestAvailabilityIndex:
+
+    async def test_available_value_skips_database(self, db_session: AsyncSession, test_user: User):
+        index = AvailabilityIndex(capacity=100, sync_seconds=3600)
+        await index.sync(db_session)
+
+        assert await index.is_taken('username', 'freeusername', db_session) is False
+        assert index.db_checks == 0
+
+    @pytest.mark.parametrize('field_name', ['email', 'username', 'phone_number'])
+    async def test_taken_value_is_confirmed(self, db_session: AsyncSession, test_user: User, field_name: str):
+        index = AvailabilityIndex(capacity=100, sync_seconds=3600)
+        await index.sync(db_session)
+
+        assert await index.is_taken(field_name, getattr(test_user, field_name), db_session) is True
+        assert index.db_checks == 1
+
+    async def test_added_value_is_taken_after_confirmation(self, db_session: AsyncSession):
+        index = AvailabilityIndex(capacity=100, sync_seconds=3600)
+        await index.sync(db_session)
+        index.add(username='pendinguser')
+
+        assert await index.is_taken('username', 'pendinguser', db_session) is False
+        assert index.db_checks == 1
+
+    async def test_sync_picks_up_new_users(self, db_session: AsyncSession, test_user: User):
+        index = AvailabilityIndex(capacity=100, sync_seconds=0)
+        await index.sync(db_session)
+
+        user = User(
+            email='later@example.com',
+            username='lateruser',
+            password=test_user.password,
+            phone_number='+1987654321',
+            date_of_birth=test_user.date_of_birth
+        )
+        db_session.add(user)
+        await db_session.commit()
+
+        assert await index.is_taken('email', 'later@example.com', db_session) is True
+
+    async def test_failed_rebuild_keeps_filters(self, db_session: AsyncSession, test_user: User):
+        later = User(
+            email='later@example.com',
+            username='lateruser',
+            password=test_user.password,
+            phone_number='+1987654321',
+            date_of_birth=test_user.date_of_birth
+        )
+        db_session.add(later)
+        await db_session.commit()
+        index = AvailabilityIndex(capacity=1, sync_seconds=3600)
+        await index.sync(db_session)
+
+        # The filters hold more values than they were sized for, so the next sync rebuilds them.
+        with pytest.raises(ConnectionError):
+            await index.sync(FailingSession(db_session, rows=1))
+
+        assert await index.is_taken('email', later.email, db_session) is True
+        assert await index.is_taken('email', test_user.email, db_session) is True
@@ -0,0 +1,66 @@
+import time
+
+import pytest
+
+from app.routers.auth.codecs import JWT_CODECS, HmacCodec, InvalidTokenError, TokenExpiredError
+from app.routers.auth.consts import SECRET_KEY_ACCESS, SECRET_KEY_REFRESH, ALGORITHM
+from app.routers.auth.utils import create_token_pair, decode_token
+
+BACKENDS = sorted(JWT_CODECS)
+
+
+class TestJWTCodecs:
+
+    @pytest.mark.parametrize('backend', BACKENDS)
+    def test_encode_decode(self, backend: str):
+        codec = JWT_CODECS[backend](SECRET_KEY_ACCESS, ALGORITHM)
+        claims = {'sub': 'test@example.com', 'id': 1, 'exp': int(time.time()) + 60}
+        assert codec.decode(codec.encode(claims)) == claims
+
+    @pytest.mark.parametrize('encoder', BACKENDS)
+    @pytest.mark.parametrize('decoder', BACKENDS)
+    def test_backends_are_interchangeable(self, encoder: str, decoder: str):
+        claims = {'sub': 'test@example.com', 'id': 1, 'exp': int(time.time()) + 60}
+        token = JWT_CODECS[encoder](SECRET_KEY_ACCESS, ALGORITHM).encode(claims)
+        assert JWT_CODECS[decoder](SECRET_KEY_ACCESS, ALGORITHM).decode(token) == claims
+
+    @pytest.mark.parametrize('backend', BACKENDS)
+    def test_decode_expired_token(self, backend: str):
+        codec = JWT_CODECS[backend](SECRET_KEY_ACCESS, ALGORITHM)
+        token = codec.encode({'id': 1, 'exp': int(time.time()) - 10})
+        with pytest.raises(TokenExpiredError):
+            codec.decode(token)
+
+    @pytest.mark.parametrize('backend', BACKENDS)
+    def test_decode_wrong_key(self, backend: str):
+        token = JWT_CODECS[backend](SECRET_KEY_ACCESS, ALGORITHM).encode({'id': 1})
+        with pytest.raises(InvalidTokenError):
+            JWT_CODECS[backend]('wrong_key', ALGORITHM).decode(token)
+
+    @pytest.mark.parametrize('backend', BACKENDS)
+    @pytest.mark.parametrize('token', ['invalid_token', 'a.b.c', '', 'e30.e30.'])
+    def test_decode_malformed_token(self, backend: str, token: str):
+        with pytest.raises(InvalidTokenError):
+            JWT_CODECS[backend](SECRET_KEY_ACCESS, ALGORITHM).decode(token)
+
+    def test_hmac_rejects_unsigned_token(self):
+        header = 'eyJhbGciOiJub25lIiwidHlwIjoiSldUIn0'
+        payload = 'eyJpZCI6MX0'
+        with pytest.raises(InvalidTokenError):
+            HmacCodec(SECRET_KEY_ACCESS, ALGORITHM).decode(f'{header}.{payload}.')
+
+    def test_hmac_rejects_asymmetric_algorithm(self):
+        with pytest.raises(ValueError, match='\'RS256\' is not supported by the hmac JWT backend'):
+            HmacCodec(SECRET_KEY_ACCESS, 'RS256')
+
+
+class TestCreateTokenPairFunction:
+
+    def test_create_token_pair(self):
+        access_token, refresh_token = create_token_pair({'sub': 'test@example.com', 'id': 1})
+
+        access_payload = decode_token(access_token, SECRET_KEY_ACCESS)
+        refresh_payload = decode_token(refresh_token, SECRET_KEY_REFRESH)
+        assert access_payload['id'] == refresh_payload['id'] == 1
+        assert isinstance(access_payload['exp'], int)
+        assert access_payload['exp'] < refresh_payload['exp']
@@ -8,7 +8,8 @@ from jose import jwt
 from datetime import date, timedelta, datetime, timezone
 
 from app.models.user import User
-from app.routers.auth.depends import get_user_by_field, get_current_user
+from app.routers.auth import depends
+from app.routers.auth.depends import get_user_by_field, get_current_user, token_cache
 from app.routers.auth.consts import SECRET_KEY_ACCESS, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
 
 pytestmark = pytest.mark.anyio
@@ -115,3 +116,60 @@ class TestGetCurrentUser:
             await get_current_user(incomplete_token)
         assert error.value.status_code == status.HTTP_401_UNAUTHORIZED
         assert error.value.detail == 'Could not validate user'
+
+    async def test_get_current_user_uses_token_cache(self, monkeypatch: pytest.MonkeyPatch, test_user: User):
+        token = _create_test_access_token(
+            {'id': test_user.id, 'sub': test_user.email},
+            timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        )
+        decoded_tokens = []
+        original_decode_token = depends.decode_token
+
+        def counting_decode_token(*args):
+            decoded_tokens.append(args[0])
+            return original_decode_token(*args)
+
+        monkeypatch.setattr(depends, 'decode_token', counting_decode_token)
+        hits = token_cache.hits
+
+        for _ in range(3):
+            user_response = await get_current_user(token)
+            assert user_response.id == test_user.id
+
+        assert decoded_tokens == [token]
+        assert token_cache.hits == hits + 2
+
+    async def test_get_current_user_cache_entry_expires_with_token(
+            self, monkeypatch: pytest.MonkeyPatch, test_user: User
+    ):
+        token = _create_test_access_token(
+            {'id': test_user.id, 'sub': test_user.email},
+            timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES, seconds=5)
+        )
+        await get_current_user(token)
+        misses = token_cache.misses
+
+        expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES, seconds=6)
+        monkeypatch.setattr(token_cache, '_clock', expire.timestamp)
+
+        await get_current_user(token)
+        assert token_cache.misses == misses + 1
+
+    async def test_get_current_user_confirms_user(
+            self, monkeypatch: pytest.MonkeyPatch, db_session: AsyncSession, test_user: User
+    ):
+        token = _create_test_access_token(
+            {'id': test_user.id, 'sub': test_user.email},
+            timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        )
+        monkeypatch.setattr(depends, 'CONFIRM_CURRENT_USER', True)
+        assert (await get_current_user(token)).id == test_user.id
+
+        await db_session.delete(test_user)
+        await db_session.commit()
+        depends.identity_cache.invalidate(test_user.id)
+
+        with pytest.raises(HTTPException) as error:
+            await get_current_user(token)
+        assert error.value.status_code == status.HTTP_401_UNAUTHORIZED
+        assert error.value.detail == 'Could not validate user'
@@ -0,0 +1,57 @@
+import asyncio
+import threading
+
+import pytest
+
+from fastapi import HTTPException, status
+
+from app.routers.auth.hasher import PasswordHasher
+
+pytestmark = pytest.mark.anyio
+
+
+class TestPasswordHasher:
+
+    @pytest.mark.parametrize('executor_type', ['thread', 'process'])
+    async def test_hash_and_verify(self, executor_type: str):
+        hasher = PasswordHasher(executor_type, workers=1, queue_size=4)
+        try:
+            hashed_password = await hasher.hash('my_secret_password')
+            assert hashed_password != 'my_secret_password'
+            assert await hasher.verify('my_secret_password', hashed_password) is True
+            assert await hasher.verify('wrong_password', hashed_password) is False
+        finally:
+            hasher.shutdown()
+
+    async def test_metrics_are_recorded(self):
+        hasher = PasswordHasher('thread', workers=1, queue_size=4)
+        try:
+            await hasher.hash('my_secret_password')
+        finally:
+            hasher.shutdown()
+
+        metrics = hasher.metrics.snapshot()
+        assert metrics['completed'] == 1
+        assert metrics['rejected'] == 0
+        assert metrics['in_flight'] == 0
+        assert metrics['hash_time_max'] > 0
+        assert metrics['queue_wait_max'] >= 0
+
+    async def test_rejects_when_queue_is_full(self):
+        hasher = PasswordHasher('thread', workers=1, queue_size=0)
+        release = threading.Event()
+        blocking_job = asyncio.create_task(hasher._submit(release.wait, 5))
+        await asyncio.sleep(0.05)
+        try:
+            with pytest.raises(HTTPException) as error:
+                await hasher.hash('my_secret_password')
+            assert error.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+            assert hasher.metrics.rejected == 1
+        finally:
+            release.set()
+            await blocking_job
+            hasher.shutdown()
+
+    def test_invalid_executor_type(self):
+        with pytest.raises(ValueError, match='\'fiber\' is not a valid executor type'):
+            PasswordHasher('fiber')
@@ -0,0 +1,53 @@
+import pytest
+
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.routers.auth.identity import IdentityCache, MISSING
+
+pytestmark = pytest.mark.anyio
+
+
+class TestIdentityCache:
+
+    async def test_get_existing_user(self, test_user: User):
+        cache = IdentityCache(maxsize=10, ttl_seconds=60)
+        identity = await cache.get(test_user.id)
+
+        assert identity.exists is True
+        assert identity.email == test_user.email
+        assert identity.is_active is True
+
+    async def test_get_missing_user(self, db_session: AsyncSession):
+        cache = IdentityCache(maxsize=10, ttl_seconds=60)
+        assert await cache.get(999999) == MISSING
+
+    async def test_entries_are_served_from_cache(self, db_session: AsyncSession, test_user: User):
+        cache = IdentityCache(maxsize=10, ttl_seconds=60)
+        await cache.get(test_user.id)
+
+        await db_session.execute(delete(User).where(User.id == test_user.id))
+        await db_session.commit()
+
+        assert (await cache.get(test_user.id)).exists is True
+        assert cache.stats()['hits'] == 1
+
+    async def test_invalidate(self, db_session: AsyncSession, test_user: User):
+        cache = IdentityCache(maxsize=10, ttl_seconds=60)
+        await cache.get(test_user.id)
+
+        await db_session.execute(update(User).where(User.id == test_user.id).values(is_active=False))
+        await db_session.commit()
+        cache.invalidate(test_user.id)
+
+        assert (await cache.get(test_user.id)).is_active is False
+
+    async def test_entries_expire(self, db_session: AsyncSession, test_user: User):
+        cache = IdentityCache(maxsize=10, ttl_seconds=0)
+        await cache.get(test_user.id)
+
+        await db_session.execute(delete(User).where(User.id == test_user.id))
+        await db_session.commit()
+
+        assert await cache.get(test_user.id) == MISSING
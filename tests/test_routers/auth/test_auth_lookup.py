@@ -0,0 +1,34 @@
+import pytest
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.routers.auth.lookup import get_login_credentials, user_exists
+
+pytestmark = pytest.mark.anyio
+
+
+class TestGetLoginCredentials:
+
+    async def test_get_login_credentials(self, db_session: AsyncSession, test_user: User):
+        row = await get_login_credentials(test_user.email, db_session)
+        assert row is not None
+        assert row._fields == ('id', 'email', 'password')
+        assert (row.id, row.email, row.password) == (test_user.id, test_user.email, test_user.password)
+
+    async def test_get_login_credentials_not_found(self, db_session: AsyncSession):
+        assert await get_login_credentials('non_existing@example.com', db_session) is None
+
+
+class TestUserExists:
+
+    @pytest.mark.parametrize('field_name', ['email', 'username', 'phone_number'])
+    async def test_user_exists(self, db_session: AsyncSession, test_user: User, field_name: str):
+        assert await user_exists(field_name, getattr(test_user, field_name), db_session) is True
+
+    async def test_user_does_not_exist(self, db_session: AsyncSession, test_user: User):
+        assert await user_exists('username', 'someoneelse', db_session) is False
+
+    async def test_user_exists_invalid_field(self, db_session: AsyncSession):
+        with pytest.raises(ValueError, match='\'password\' is not a unique attribute of User'):
+            await user_exists('password', 'value', db_session)
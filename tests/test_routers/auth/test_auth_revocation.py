@@ -0,0 +1,75 @@
+import time
+import uuid
+
+import pytest
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.routers.auth.revocation import RevocationIndex
+
+pytestmark = pytest.mark.anyio
+
+
+class FailingSession:
+
+    async def execute(self, *args, **kwargs):
+        raise ConnectionError('connection lost')
+
+
+class TestRevocationIndex:
+
+    async def test_unrevoked_token_skips_database(self, db_session: AsyncSession):
+        index = RevocationIndex(capacity=100, sync_seconds=3600)
+        await index.sync(db_session)
+
+        assert await index.is_revoked(uuid.uuid4().hex) is False
+        assert index.db_checks == 0
+
+    async def test_revoke(self, db_session: AsyncSession):
+        index = RevocationIndex(capacity=100, sync_seconds=3600)
+        await index.sync(db_session)
+        jti = uuid.uuid4().hex
+
+        assert await index.revoke(jti, int(time.time()) + 60, db_session) is True
+        await db_session.commit()
+        assert await index.revoke(jti, int(time.time()) + 60, db_session) is False
+        await db_session.commit()
+
+        assert await index.is_revoked(jti) is True
+        assert index.db_checks == 1
+
+    async def test_sync_picks_up_revocations_from_other_workers(self, db_session: AsyncSession):
+        index = RevocationIndex(capacity=100, sync_seconds=0)
+        other_worker_index = RevocationIndex(capacity=100, sync_seconds=3600)
+        await index.sync(db_session)
+        jti = uuid.uuid4().hex
+
+        await other_worker_index.revoke(jti, int(time.time()) + 60, db_session)
+        await db_session.commit()
+
+        assert await index.is_revoked(jti) is True
+
+    async def test_expired_revocations_are_not_loaded(self, db_session: AsyncSession):
+        index = RevocationIndex(capacity=100, sync_seconds=3600)
+        jti = uuid.uuid4().hex
+        await index.revoke(jti, int(time.time()) - 60, db_session)
+        await db_session.commit()
+
+        fresh_index = RevocationIndex(capacity=100, sync_seconds=3600)
+        await fresh_index.sync(db_session)
+        assert await fresh_index.is_revoked(jti) is False
+
+    async def test_failed_rebuild_keeps_filter(self, db_session: AsyncSession):
+        index = RevocationIndex(capacity=1, sync_seconds=3600)
+        await index.sync(db_session)
+        jtis = [uuid.uuid4().hex, uuid.uuid4().hex]
+        for jti in jtis:
+            await index.revoke(jti, int(time.time()) + 60, db_session)
+        await db_session.commit()
+
+        # The filter now holds more ids than it was sized for, so the next sync rebuilds it.
+        with pytest.raises(ConnectionError):
+            await index.sync(FailingSession())
+
+        for jti in jtis:
+            assert await index.is_revoked(jti) is True
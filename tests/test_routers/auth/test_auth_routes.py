@@ -1,14 +1,20 @@
+import asyncio
+
 import pytest
 
 from fastapi import status
 
-from httpx import AsyncClient
+from httpx import AsyncClient, ASGITransport
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncEngine, async_sessionmaker
 
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from app.main import app
+from app.backend.db_depends import get_db
 
 from app.schemas.auth import TokenResponse, UserResponse
 from app.models.user import User
+from app.routers.auth.utils import build_crypt_context, password_needs_update, verify_password
 
 pytestmark = pytest.mark.anyio
 
@@ -74,6 +80,74 @@ class TestRegisterUser:
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert response.json() == {'detail': 'Phone number already registered'}
 
+    async def test_register_concurrent_duplicate_emails(self, db_engine: AsyncEngine, db_session: AsyncSession):
+        session_maker = async_sessionmaker(db_engine, expire_on_commit=False, class_=AsyncSession)
+
+        async def get_separate_db():
+            async with session_maker() as session:
+                yield session
+
+        payloads = [
+            {
+                'email': 'racer@example.com',
+                'username': f'racer{i}',
+                'password': 'Newpassword1!',
+                'password_repeat': 'Newpassword1!',
+                'phone_number': f'+12345678{i:02d}',
+                'date_of_birth': '2000-01-01'
+            }
+            for i in range(8)
+        ]
+
+        app.dependency_overrides[get_db] = get_separate_db
+        try:
+            async with AsyncClient(transport=ASGITransport(app=app), base_url='http://test') as client:
+                responses = await asyncio.gather(*(client.post('/auth/register', json=p) for p in payloads))
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+
+        status_codes = sorted(response.status_code for response in responses)
+        assert status_codes == [status.HTTP_201_CREATED] + [status.HTTP_400_BAD_REQUEST] * 7
+        assert all(
+            response.json() == {'detail': 'Email already registered'}
+            for response in responses if response.status_code == status.HTTP_400_BAD_REQUEST
+        )
+
+        users_count = await db_session.scalar(select(func.count()).where(User.email == 'racer@example.com'))
+        assert users_count == 1
+
+
+class TestCheckAvailability:
+
+    async def test_availability(self, client: AsyncClient, test_user: User):
+        response = await client.get(
+            '/auth/availability',
+            params={'email': test_user.email, 'username': 'freeusername'}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {'email': False, 'username': True}
+
+    async def test_availability_after_registration(self, client: AsyncClient):
+        payload = {
+            'email': 'newuser@example.com',
+            'username': 'newuser',
+            'password': 'Newpassword1!',
+            'password_repeat': 'Newpassword1!',
+            'phone_number': '+1234567891',
+            'date_of_birth': '2000-01-01'
+        }
+        response = await client.post('/auth/register', json=payload)
+        assert response.status_code == status.HTTP_201_CREATED
+
+        response = await client.get('/auth/availability', params={'phone_number': payload['phone_number']})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {'phone_number': False}
+
+    async def test_availability_no_values(self, client: AsyncClient):
+        response = await client.get('/auth/availability')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {'detail': 'At least one of email, username or phone_number is required'}
+
 
 class TestLoginUser:
 
@@ -90,6 +164,23 @@ class TestLoginUser:
         assert tokens.refresh_token
         assert tokens.token_type == 'bearer'
 
+    async def test_login_user_rehashes_outdated_password(
+            self, client: AsyncClient, db_session: AsyncSession, test_user: User
+    ):
+        test_user.password = build_crypt_context('bcrypt', bcrypt_rounds=4).hash('Newpassword1!')
+        await db_session.commit()
+
+        payload = {
+            'username': test_user.email,
+            'password': 'Newpassword1!'
+        }
+        response = await client.post('/auth/login', data=payload)
+        assert response.status_code == status.HTTP_200_OK
+
+        await db_session.refresh(test_user)
+        assert password_needs_update(test_user.password) is False
+        assert verify_password('Newpassword1!', test_user.password) is True
+
     async def test_user_login_incorrect_username(self, client: AsyncClient):
         payload = {
             'username': 'wronguser',
@@ -127,12 +218,76 @@ class TestRefreshUserToken:
         assert refresh_tokens.refresh_token
         assert refresh_tokens.token_type == 'bearer'
 
+    async def test_refresh_token_rotation_revokes_old_token(self, client: AsyncClient, test_user: User):
+        payload = {
+            'username': test_user.email,
+            'password': 'Newpassword1!',
+        }
+        response = await client.post('/auth/login', data=payload)
+        tokens = TokenResponse(**response.json())
+
+        refresh_response = await client.post(f'/auth/refresh?token={tokens.refresh_token}')
+        assert refresh_response.status_code == status.HTTP_200_OK
+
+        reuse_response = await client.post(f'/auth/refresh?token={tokens.refresh_token}')
+        assert reuse_response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert reuse_response.json() == {'detail': 'Token revoked'}
+
+        headers = {'Authorization': f'Bearer {tokens.access_token}'}
+        me_response = await client.get('/auth/me', headers=headers)
+        assert me_response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert me_response.json() == {'detail': 'Token revoked'}
+
+        new_tokens = TokenResponse(**refresh_response.json())
+        headers = {'Authorization': f'Bearer {new_tokens.access_token}'}
+        me_response = await client.get('/auth/me', headers=headers)
+        assert me_response.status_code == status.HTTP_200_OK
+
     async def test_refresh_token_invalid(self, client: AsyncClient):
         response = await client.post('/auth/refresh?token=invalidtoken')
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
         assert response.json() == {'detail': 'Could not validate user'}
 
 
+class TestLogoutUser:
+
+    async def test_logout_success(self, client: AsyncClient, test_user: User):
+        payload = {
+            'username': test_user.email,
+            'password': 'Newpassword1!',
+        }
+        response = await client.post('/auth/login', data=payload)
+        tokens = TokenResponse(**response.json())
+
+        logout_response = await client.post(f'/auth/logout?token={tokens.refresh_token}')
+        assert logout_response.status_code == status.HTTP_204_NO_CONTENT
+
+        refresh_response = await client.post(f'/auth/refresh?token={tokens.refresh_token}')
+        assert refresh_response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert refresh_response.json() == {'detail': 'Token revoked'}
+
+        headers = {'Authorization': f'Bearer {tokens.access_token}'}
+        me_response = await client.get('/auth/me', headers=headers)
+        assert me_response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_logout_twice(self, client: AsyncClient, test_user: User):
+        payload = {
+            'username': test_user.email,
+            'password': 'Newpassword1!',
+        }
+        response = await client.post('/auth/login', data=payload)
+        tokens = TokenResponse(**response.json())
+
+        for _ in range(2):
+            logout_response = await client.post(f'/auth/logout?token={tokens.refresh_token}')
+            assert logout_response.status_code == status.HTTP_204_NO_CONTENT
+
+    async def test_logout_invalid_token(self, client: AsyncClient):
+        response = await client.post('/auth/logout?token=invalidtoken')
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.json() == {'detail': 'Could not validate user'}
+
+
 class TestReadCurrentUser:
     async def test_read_current_user_success(self, client: AsyncClient, test_user: User):
         payload = {
@@ -6,6 +6,8 @@ from jose import jwt
 from datetime import datetime, timedelta, timezone
 
 from app.routers.auth.utils import (
+    build_crypt_context,
+    password_needs_update,
     verify_password,
     get_password_hash,
     create_access_token,
@@ -59,6 +61,40 @@ class TestGetPasswordHashFunction:
         assert len(hashed_password) > 0
 
 
+class TestBuildCryptContextFunction:
+
+    def test_build_crypt_context_argon2(self):
+        context = build_crypt_context('argon2', argon2_memory_cost=1024)
+        hashed_password = context.hash('my_secret_password')
+        assert hashed_password.startswith('$argon2id$')
+        assert context.verify('my_secret_password', hashed_password) is True
+        assert context.needs_update(hashed_password) is False
+
+    def test_build_crypt_context_other_scheme_needs_update(self):
+        bcrypt_hash = build_crypt_context('bcrypt', bcrypt_rounds=4).hash('my_secret_password')
+        context = build_crypt_context('argon2', argon2_memory_cost=1024)
+        assert context.verify('my_secret_password', bcrypt_hash) is True
+        assert context.needs_update(bcrypt_hash) is True
+
+    def test_build_crypt_context_other_cost_needs_update(self):
+        old_hash = build_crypt_context('bcrypt', bcrypt_rounds=4).hash('my_secret_password')
+        assert build_crypt_context('bcrypt', bcrypt_rounds=5).needs_update(old_hash) is True
+
+    def test_build_crypt_context_invalid_scheme(self):
+        with pytest.raises(ValueError, match='\'md5\' is not a supported password hash scheme'):
+            build_crypt_context('md5')
+
+
+class TestPasswordNeedsUpdateFunction:
+
+    def test_password_needs_update_current_policy(self):
+        assert password_needs_update(get_password_hash('my_secret_password')) is False
+
+    def test_password_needs_update_outdated_cost(self):
+        old_hash = build_crypt_context('bcrypt', bcrypt_rounds=4).hash('my_secret_password')
+        assert password_needs_update(old_hash) is True
+
+
 class TestCreateAccessTokenFunction:
 
     def test_create_access_token(self):
@@ -0,0 +1,26 @@
+import pytest
+
+from app.routers.etag import make_etag, etag_matches
+
+
+class TestETag:
+
+    def test_make_etag(self):
+        etag = make_etag(1, 5, 0, 100)
+        assert etag.startswith('"') and etag.endswith('"')
+        assert etag == make_etag(1, 5, 0, 100)
+        assert etag != make_etag(1, 6, 0, 100)
+        assert etag != make_etag(1, 5, 0, 50)
+
+    @pytest.mark.parametrize('if_none_match, expected', [
+        (None, False),
+        ('', False),
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"other", "abc"', True),
+        ('*', True),
+        ('"other"', False),
+        ('abc', False),
+    ])
+    def test_etag_matches(self, if_none_match: str | None, expected: bool):
+        assert etag_matches(if_none_match, '"abc"') is expected
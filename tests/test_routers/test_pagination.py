@@ -0,0 +1,21 @@
+import pytest
+
+from fastapi import HTTPException, status
+
+from app.routers.pagination import encode_cursor, decode_cursor
+
+
+class TestCursor:
+
+    @pytest.mark.parametrize('last_id', [0, 1, 2 ** 31 - 1])
+    def test_round_trip(self, last_id: int):
+        cursor = encode_cursor(last_id)
+        assert '=' not in cursor
+        assert decode_cursor(cursor) == last_id
+
+    @pytest.mark.parametrize('cursor', ['', '!!!', 'e30', 'dHJ1ZQ', 'eyJpZCI6IHRydWV9'])
+    def test_invalid_cursor(self, cursor: str):
+        with pytest.raises(HTTPException) as error:
+            decode_cursor(cursor)
+        assert error.value.status_code == status.HTTP_400_BAD_REQUEST
+        assert error.value.detail == 'Invalid cursor'
@@ -0,0 +1,108 @@
+import pytest
+
+from fastapi import HTTPException, status
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.platform import Platform
+from app.models.social_profile import SocialProfile
+from app.models.user import User
+from app.routers.platform_codes import PlatformCodes, platform_codes
+
+from tests.conftest import test_async_session_maker as session_maker
+
+pytestmark = pytest.mark.anyio
+
+
+async def _codes(db: AsyncSession) -> dict[str, int]:
+    return dict((await db.execute(select(Platform.name, Platform.id))).all())
+
+
+class TestPlatformCodes:
+
+    async def test_load(self, db_session: AsyncSession, test_social_profiles: list[SocialProfile]):
+        codes = PlatformCodes()
+        await codes.load(db_session)
+
+        assert len(codes) == 2
+        twitter = (await _codes(db_session))['Twitter']
+        assert codes.code('Twitter') == twitter
+        assert codes.name(twitter) == 'Twitter'
+
+    async def test_get_looks_up_platforms_added_later(self, db_session: AsyncSession, test_social_profile: SocialProfile):
+        codes = PlatformCodes()
+        await codes.load(db_session)
+        assert 'Telegram' not in codes
+
+        await db_session.execute(select(func.platform_code('Telegram')))
+        await db_session.commit()
+
+        assert await codes.get(db_session, 'Telegram') == (await _codes(db_session))['Telegram']
+        assert 'Telegram' in codes
+
+    async def test_get_unknown_platform(self, db_session: AsyncSession):
+        codes = PlatformCodes()
+        assert await codes.get(db_session, 'Unknown') is None
+        assert 'Unknown' not in codes
+
+    async def test_unregistered_platform(self):
+        with pytest.raises(LookupError):
+            PlatformCodes().code('Unknown')
+
+    async def test_register(self, db_session: AsyncSession, test_social_profile: SocialProfile):
+        codes = PlatformCodes()
+        await codes.register(db_session, ['Instagram', 'Telegram', 'Telegram'])
+
+        # Added in the session's transaction: usable there, shared once committed.
+        added = await _codes(db_session)
+        assert sorted(added) == ['Instagram', 'Telegram']
+        assert codes.code('Telegram') == added['Telegram']
+        assert codes.name(added['Telegram']) == 'Telegram'
+        assert 'Telegram' not in codes
+        async with session_maker() as other:
+            assert await _codes(other) == {'Instagram': added['Instagram']}
+
+        await db_session.commit()
+        assert 'Telegram' in codes
+        assert len(codes) == 2
+
+    async def test_rolled_back_register(self, db_session: AsyncSession):
+        codes = PlatformCodes()
+        await codes.register(db_session, ['Telegram'])
+        code = codes.code('Telegram')
+        await db_session.rollback()
+
+        with pytest.raises(LookupError):
+            codes.code('Telegram')
+        assert codes.name(code) == code
+        assert await _codes(db_session) == {}
+
+    async def test_decode_platforms_added_by_other_workers(
+            self, db_session: AsyncSession, test_social_profile: SocialProfile
+    ):
+        platform_codes.clear()
+        query = select(SocialProfile.id, SocialProfile.platform)
+
+        rows = (await db_session.execute(query)).all()
+        assert rows[0].platform == (await _codes(db_session))['Instagram']
+
+        rows = await platform_codes.decode(db_session, rows)
+        assert rows == [(test_social_profile.id, 'Instagram')]
+        assert rows[0].platform == 'Instagram'
+        assert (await db_session.execute(query)).all() == rows
+
+    async def test_register_limits_new_platforms_per_user(self, db_session: AsyncSession, test_user: User):
+        codes = PlatformCodes(max_new_per_hour=2)
+        await codes.register(db_session, ['Instagram', 'Telegram'], test_user.id)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await codes.register(db_session, ['Mastodon'], test_user.id)
+        assert exc_info.value.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert 0 < int(exc_info.value.headers['Retry-After']) <= 3600
+
+        # Existing platforms and other users are not limited.
+        await codes.register(db_session, ['Telegram'], test_user.id)
+        await codes.register(db_session, ['Mastodon'], test_user.id + 1)
+        await codes.register(db_session, ['Bluesky'])
+        assert sorted(await _codes(db_session)) == ['Bluesky', 'Instagram', 'Mastodon', 'Telegram']
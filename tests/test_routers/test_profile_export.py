@@ -0,0 +1,54 @@
+import csv
+import io
+import json
+
+import pytest
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.models.social_profile import SocialProfile
+from app.routers import profile_export
+from app.routers.profile_export import EXPORT_COLUMNS, export_profiles
+from app.routers.profile_queries import profiles_export_query
+
+pytestmark = pytest.mark.anyio
+
+
+class TestExportProfiles:
+
+    @pytest.fixture(scope='function')
+    async def profiles(self, db_session: AsyncSession, test_user: User) -> list[SocialProfile]:
+        profiles = [
+            SocialProfile(
+                user_id=test_user.id, platform='Github', profile_url=f'https://github.com/user{i}', profile_type='personal'
+            )
+            for i in range(5)
+        ]
+        db_session.add_all(profiles)
+        await db_session.commit()
+        return profiles
+
+    async def test_ndjson_chunks(self, monkeypatch: pytest.MonkeyPatch, profiles: list[SocialProfile]):
+        monkeypatch.setattr(profile_export, 'EXPORT_CHUNK_SIZE', 2)
+        chunks = [chunk async for chunk in export_profiles(profiles_export_query(), 'ndjson')]
+
+        assert [chunk.count(b'\n') for chunk in chunks] == [2, 2, 1]
+        rows = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+        assert [row['id'] for row in rows] == [profile.id for profile in profiles]
+        assert set(rows[0]) == set(EXPORT_COLUMNS)
+
+    async def test_csv_chunks(self, monkeypatch: pytest.MonkeyPatch, profiles: list[SocialProfile]):
+        monkeypatch.setattr(profile_export, 'EXPORT_CHUNK_SIZE', 3)
+        chunks = [chunk async for chunk in export_profiles(profiles_export_query(), 'csv')]
+
+        assert [chunk.count(b'\n') for chunk in chunks] == [1, 3, 2]
+        rows = list(csv.reader(io.StringIO(b''.join(chunks).decode())))
+        assert rows[0] == list(EXPORT_COLUMNS)
+        assert rows[1] == [str(profiles[0].id), str(profiles[0].user_id), 'Github', 'https://github.com/user0', 'personal']
+
+    async def test_empty_export(self):
+        assert [chunk async for chunk in export_profiles(profiles_export_query(), 'ndjson')] == []
+        assert [chunk async for chunk in export_profiles(profiles_export_query(), 'csv')] == [
+            b'id,user_id,platform,profile_url,profile_type\n'
+        ]
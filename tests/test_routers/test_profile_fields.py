@@ -0,0 +1,37 @@
+import pytest
+
+from fastapi import HTTPException, status
+
+from app.routers.profile_fields import PROFILE_FIELDS, parse_fields, selected_columns, get_response_model
+from app.models.social_profile import SocialProfile
+from app.schemas.social_profiles import SocialProfileResponse
+
+
+class TestParseFields:
+
+    def test_default(self):
+        assert parse_fields(None) == PROFILE_FIELDS
+
+    def test_canonical_order(self):
+        assert parse_fields(' id ,platform,id') == ('platform', 'id')
+
+    @pytest.mark.parametrize('fields', ['password', 'id,user_id', '', ','])
+    def test_invalid_fields(self, fields: str):
+        with pytest.raises(HTTPException) as error:
+            parse_fields(fields)
+        assert error.value.status_code == status.HTTP_400_BAD_REQUEST
+        assert error.value.detail.endswith('Valid options are: platform, profile_url, profile_type, id')
+
+
+class TestResponseModel:
+
+    def test_full_fieldset_uses_response_model(self):
+        assert get_response_model(PROFILE_FIELDS) is SocialProfileResponse
+
+    def test_trimmed_model(self):
+        model = get_response_model(('platform',))
+        assert tuple(model.model_fields) == ('platform',)
+        assert model is get_response_model(('platform',))
+
+    def test_id_is_always_selected(self):
+        assert selected_columns(('platform',)) == (SocialProfile.platform, SocialProfile.id)
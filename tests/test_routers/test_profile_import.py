@@ -0,0 +1,101 @@
+import pytest
+
+from fastapi import HTTPException, status
+
+from app.routers.profile_import import RecordParser
+
+CSV_FILE = (
+    '\ufeffplatform,profile_url,profile_type\r\n'
+    'Twitter,https://twitter.com/testuser,personal\r\n'
+    '\r\n'
+    'Github,"https://github.com/a,b",business\r\n'
+    'Reddit,"https://reddit.com/u/""quoted""\nname",personal\r\n'
+    'Tiktok,https://tiktok.com/@тест,creator'
+).encode()
+
+
+def _feed(parser: RecordParser, data: bytes, piece_size: int) -> list[tuple[int, dict | str]]:
+    records = []
+    for start in range(0, len(data), piece_size):
+        records.extend(parser.feed(data[start:start + piece_size]))
+    return records + parser.feed(b'', final=True)
+
+
+class TestRecordParser:
+
+    @pytest.mark.parametrize('piece_size', [1, 7, len(CSV_FILE)])
+    def test_csv(self, piece_size: int):
+        records = _feed(RecordParser('csv'), CSV_FILE, piece_size)
+
+        assert records == [
+            (2, {'platform': 'Twitter', 'profile_url': 'https://twitter.com/testuser', 'profile_type': 'personal'}),
+            (4, {'platform': 'Github', 'profile_url': 'https://github.com/a,b', 'profile_type': 'business'}),
+            (5, {'platform': 'Reddit', 'profile_url': 'https://reddit.com/u/"quoted"\nname', 'profile_type': 'personal'}),
+            (7, {'platform': 'Tiktok', 'profile_url': 'https://tiktok.com/@тест', 'profile_type': 'creator'}),
+        ]
+
+    def test_csv_keeps_only_unfinished_lines(self):
+        parser = RecordParser('csv')
+        assert parser.feed(b'platform,profile_url,profile_type\nTwitter,https://twitter.com/a,personal\nGit') == [
+            (2, {'platform': 'Twitter', 'profile_url': 'https://twitter.com/a', 'profile_type': 'personal'})
+        ]
+        assert parser.feed(b'hub,"https://github.com/') == []
+        assert parser.feed(b'a",personal\n') == [
+            (3, {'platform': 'Github', 'profile_url': 'https://github.com/a', 'profile_type': 'personal'})
+        ]
+
+    @pytest.mark.parametrize('piece_size', [1, 1000])
+    def test_csv_quote_inside_unquoted_field(self, piece_size: int):
+        data = (
+            b'platform,profile_url,profile_type\n'
+            b'Twitter,https://twitter.com/a"b,personal\n'
+            b'Github,https://github.com/c,personal\n'
+        )
+        assert _feed(RecordParser('csv'), data, piece_size) == [
+            (2, {'platform': 'Twitter', 'profile_url': 'https://twitter.com/a"b', 'profile_type': 'personal'}),
+            (3, {'platform': 'Github', 'profile_url': 'https://github.com/c', 'profile_type': 'personal'}),
+        ]
+
+    @pytest.mark.parametrize('piece_size', [1, 1000])
+    def test_csv_reports_lines_not_read(self, piece_size: int):
+        data = (
+            b'platform,profile_url,profile_type\n'
+            b'Twitter,https://twitter.com/a,personal,extra\n'
+            b'Github,"https://github.com/b\n'
+            b'Reddit,https://reddit.com/u/c,personal\n'
+            b'Tiktok,https://tiktok.com/@d",personal,personal\n'
+            b'Twitter,https://twitter.com/e,personal\n'
+            b'Github,"https://github.com/f,personal\n'
+            b'Reddit,https://reddit.com/u/g,personal\n'
+        )
+        assert _feed(RecordParser('csv'), data, piece_size) == [
+            (2, 'expected 3 fields, found 4'),
+            (3, 'expected 3 fields, found 4 (lines 3-5)'),
+            (6, {'platform': 'Twitter', 'profile_url': 'https://twitter.com/e', 'profile_type': 'personal'}),
+            (7, 'quoted field left open at the end of the file (lines 7-8)'),
+        ]
+
+    def test_csv_without_rows(self):
+        assert _feed(RecordParser('csv'), b'platform,profile_url,profile_type', 5) == []
+
+    @pytest.mark.parametrize('piece_size', [1, 10])
+    def test_ndjson(self, piece_size: int):
+        data = b'{"platform": "Twitter"}\n\nnot json\n[1, 2]\n{"platform": "Github"}'
+        assert _feed(RecordParser('ndjson'), data, piece_size) == [
+            (1, {'platform': 'Twitter'}), (3, {}), (4, {}), (5, {'platform': 'Github'})
+        ]
+
+    @pytest.mark.parametrize('file_format, data', [
+        ('ndjson', b'{"platform": "Twitter"}\n{"platform": "Github", "profile_url": "https://github.com/a"}\n'),
+        ('ndjson', b'{"platform": "Twitter"}\n{"platform": "Github", "profile_url": "https://github.com/a'),
+        ('csv', b'platform,profile_url\nTwitter,"https://\ntwitter.com/\naaaaaaaaaaaaaaaaa\n'),
+    ])
+    def test_rejects_long_rows(self, monkeypatch: pytest.MonkeyPatch, file_format: str, data: bytes):
+        monkeypatch.setattr('app.routers.profile_import.MAX_IMPORT_RECORD_LENGTH', 40)
+        parser = RecordParser(file_format)
+
+        with pytest.raises(HTTPException) as exc_info:
+            for start in range(0, len(data), 8):
+                parser.feed(data[start:start + 8])
+        assert exc_info.value.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        assert exc_info.value.detail == 'The row on line 2 is longer than 40 characters'
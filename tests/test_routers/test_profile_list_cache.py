@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+
+from fastapi import status
+
+from httpx import AsyncClient
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.backend.cache import MemoryCache, RedisCache
+from app.models.user import User
+from app.models.social_profile import SocialProfile
+from app.routers import profile_list_cache
+from app.routers.profile_list_cache import load_profile_page, page_key
+
+from tests.conftest import RedisStandIn, test_async_session_maker as session_maker
+
+pytestmark = pytest.mark.anyio
+
+
+async def _login(client: AsyncClient, user: User) -> dict:
+    response = await client.post('/auth/login', data={'username': user.email, 'password': 'Newpassword1!'})
+    return {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+
+@pytest.fixture(scope='function')
+def memory_cache(monkeypatch: pytest.MonkeyPatch) -> MemoryCache:
+    cache = MemoryCache(max_bytes=1024 * 1024)
+    monkeypatch.setattr(profile_list_cache, 'profile_cache', cache)
+    return cache
+
+
+class TestProfileListCache:
+
+    async def test_cached_page_skips_profile_query(
+            self, client: AsyncClient, test_user: User, test_social_profiles: list[SocialProfile],
+            memory_cache: MemoryCache, query_counter: list[str]
+    ):
+        headers = await _login(client, test_user)
+        first = await client.get('/social_profiles/', headers=headers)
+        assert first.status_code == status.HTTP_200_OK
+
+        query_counter.clear()
+        second = await client.get('/social_profiles/', headers=headers)
+        assert second.status_code == status.HTTP_200_OK
+        assert second.json() == first.json()
+        assert second.headers['ETag'] == first.headers['ETag']
+        assert len(query_counter) == 1
+        assert 'social_profiles' not in query_counter[0]
+        assert memory_cache.hits == 1
+
+    async def test_next_cursor_is_cached(
+            self, client: AsyncClient, test_user: User, test_social_profiles: list[SocialProfile],
+            memory_cache: MemoryCache
+    ):
+        headers = await _login(client, test_user)
+        first = await client.get('/social_profiles/', params={'limit': 1}, headers=headers)
+        second = await client.get('/social_profiles/', params={'limit': 1}, headers=headers)
+
+        assert memory_cache.hits == 1
+        assert second.headers['X-Next-Cursor'] == first.headers['X-Next-Cursor']
+        assert second.headers['Link'] == first.headers['Link']
+
+    async def test_writes_invalidate_page(
+            self, client: AsyncClient, test_user: User, test_social_profile: SocialProfile,
+            memory_cache: MemoryCache
+    ):
+        headers = await _login(client, test_user)
+        await client.get('/social_profiles/', headers=headers)
+        assert await memory_cache.get(page_key(test_user.id)) is not None
+
+        response = await client.put(
+            f'/social_profiles/{test_social_profile.id}', json={'profile_type': 'business'}, headers=headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert await memory_cache.get(page_key(test_user.id)) is None
+
+        response = await client.get('/social_profiles/', headers=headers)
+        assert [profile['profile_type'] for profile in response.json()] == ['business']
+
+    async def test_stale_entry_is_not_served(
+            self, client: AsyncClient, db_session: AsyncSession, test_user: User,
+            test_social_profile: SocialProfile, memory_cache: MemoryCache
+    ):
+        headers = await _login(client, test_user)
+        await client.get('/social_profiles/', headers=headers)
+
+        # A write that does not go through this worker's endpoints leaves the entry in place.
+        db_session.add(SocialProfile(
+            user_id=test_user.id, platform='Twitter', profile_url='https://twitter.com/testuser',
+            profile_type='personal'
+        ))
+        await db_session.commit()
+
+        response = await client.get('/social_profiles/', headers=headers)
+        assert len(response.json()) == 2
+
+    async def test_cold_entry_is_built_once(
+            self, db_session: AsyncSession, test_user: User, test_social_profiles: list[SocialProfile],
+            memory_cache: MemoryCache, query_counter: list[str]
+    ):
+        sessions = [session_maker() for _ in range(5)]
+        query_counter.clear()
+        try:
+            pages = await asyncio.gather(*(
+                load_profile_page(session, test_user.id, 1, 0, 100) for session in sessions
+            ))
+        finally:
+            for session in sessions:
+                await session.close()
+
+        assert len({page for page in pages}) == 1
+        assert len(query_counter) == 1
+
+    async def test_redis_backend(
+            self, client: AsyncClient, test_user: User, test_social_profiles: list[SocialProfile],
+            redis_stand_in: RedisStandIn, monkeypatch: pytest.MonkeyPatch, query_counter: list[str]
+    ):
+        cache = RedisCache('127.0.0.1', redis_stand_in.server.sockets[0].getsockname()[1])
+        monkeypatch.setattr(profile_list_cache, 'profile_cache', cache)
+
+        headers = await _login(client, test_user)
+        first = await client.get('/social_profiles/', headers=headers)
+        assert page_key(test_user.id).encode() in redis_stand_in.data
+
+        query_counter.clear()
+        second = await client.get('/social_profiles/', headers=headers)
+        assert second.json() == first.json()
+        assert len(query_counter) == 1
+        await cache.close()
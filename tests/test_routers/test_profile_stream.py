@@ -0,0 +1,182 @@
+import asyncio
+import json
+import tracemalloc
+
+import pytest
+
+from fastapi import status
+
+from httpx import AsyncClient
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from typing import AsyncGenerator
+
+from app.main import app
+from app.backend.profile_feed import profile_feed
+from app.models.social_profile import SocialProfile
+from app.models.user import User
+from app.routers.auth.utils import create_access_token
+
+pytestmark = pytest.mark.anyio
+
+
+class AsgiConnection:
+    """
+    Runs one request through the application and hands out the ASGI messages it sends as they
+    come, which lets a test read a response that never ends.
+    """
+
+    def __init__(self, scope: dict, first_message: dict):
+        self.incoming: asyncio.Queue = asyncio.Queue()
+        self.outgoing: asyncio.Queue = asyncio.Queue()
+        self.incoming.put_nowait(first_message)
+        self.task = asyncio.create_task(app(scope, self.incoming.get, self.outgoing.put))
+
+    async def receive(self, timeout: float = 5.0) -> dict:
+        return await asyncio.wait_for(self.outgoing.get(), timeout)
+
+    async def close(self, message: dict) -> None:
+        await self.incoming.put(message)
+        await asyncio.wait_for(self.task, 5.0)
+
+
+def _scope(scope_type: str, path: str, headers: dict, query_string: bytes = b'') -> dict:
+    return {
+        'type': scope_type, 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+        'scheme': 'http' if scope_type == 'http' else 'ws', 'path': path, 'raw_path': path.encode(),
+        'query_string': query_string, 'root_path': '', 'client': ('127.0.0.1', 50000), 'server': ('test', 80),
+        'headers': [(name.lower().encode(), value.encode()) for name, value in {'host': 'test', **headers}.items()],
+    }
+
+
+def _sse_event(chunk: bytes) -> tuple[str, dict]:
+    fields = dict(line.split(': ', 1) for line in chunk.decode().strip().split('\n'))
+    return fields['event'], json.loads(fields['data'])
+
+
+@pytest.fixture(scope='function')
+async def feed() -> AsyncGenerator[None, None]:
+    yield
+    await profile_feed.stop()
+
+
+@pytest.fixture(scope='function')
+def token(test_user: User) -> str:
+    return create_access_token({'sub': test_user.email, 'id': test_user.id})
+
+
+class TestStreamProfileChanges:
+
+    async def test_streams_events(self, feed: None, token: str, db_session: AsyncSession, test_user: User):
+        stream = AsgiConnection(
+            _scope('http', '/social_profiles/stream', {'Authorization': f'Bearer {token}'}),
+            {'type': 'http.request', 'body': b'', 'more_body': False}
+        )
+        start = await stream.receive()
+        assert start['status'] == status.HTTP_200_OK
+        assert (b'content-type', b'text/event-stream; charset=utf-8') in start['headers']
+        assert _sse_event((await stream.receive())['body']) == ('ready', {'ids': []})
+        assert len(profile_feed) == 1
+
+        profile = SocialProfile(
+            user_id=test_user.id, platform='Github', profile_url='https://github.com/testuser', profile_type='personal'
+        )
+        db_session.add(profile)
+        await db_session.commit()
+        assert _sse_event((await stream.receive())['body']) == ('create', {'ids': [profile.id]})
+
+        await stream.close({'type': 'http.disconnect'})
+        assert len(profile_feed) == 0
+
+    async def test_idle_connections_memory(self, feed: None, token: str):
+        # Every connection shares one receive and one send, so only what the application keeps
+        # for each connection is measured: its tasks, response, generator and subscription.
+        connections = 10000
+        disconnected = asyncio.Event()
+        ready = 0
+
+        async def receive() -> dict:
+            await disconnected.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message: dict) -> None:
+            nonlocal ready
+            if message['type'] == 'http.response.body' and message['body'].startswith(b'event: ready'):
+                ready += 1
+
+        headers = {'Authorization': f'Bearer {token}'}
+        # The listening connection is opened first, so it is not counted.
+        assert await profile_feed.start()
+        tracemalloc.start()
+        try:
+            tasks = [
+                asyncio.create_task(app(_scope('http', '/social_profiles/stream', headers), receive, send))
+                for _ in range(connections)
+            ]
+            while ready < connections:
+                await asyncio.sleep(0.05)
+            size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            disconnected.set()
+            await asyncio.gather(*tasks)
+
+        assert len(profile_feed) == 0
+        assert size / connections < 20 * 1024
+
+    async def test_full_feed(self, feed: None, token: str, client: AsyncClient):
+        subscriptions = [profile_feed.subscribe(0) for _ in range(profile_feed.max_subscribers)]
+        try:
+            response = await client.get('/social_profiles/stream', headers={'Authorization': f'Bearer {token}'})
+        finally:
+            for subscription in subscriptions:
+                profile_feed.unsubscribe(subscription)
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.headers['retry-after'] == '5'
+
+    async def test_requires_token(self, client: AsyncClient):
+        response = await client.get('/social_profiles/stream')
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+class TestStreamProfileChangesWebSocket:
+
+    async def test_streams_events(self, feed: None, token: str, db_session: AsyncSession, test_user: User):
+        socket = AsgiConnection(
+            _scope('websocket', '/social_profiles/stream/ws', {}, f'token={token}'.encode()),
+            {'type': 'websocket.connect'}
+        )
+        assert (await socket.receive())['type'] == 'websocket.accept'
+        assert json.loads((await socket.receive())['text']) == {'event': 'ready', 'ids': []}
+
+        profile = SocialProfile(
+            user_id=test_user.id, platform='Github', profile_url='https://github.com/testuser', profile_type='personal'
+        )
+        db_session.add(profile)
+        await db_session.commit()
+        await db_session.delete(profile)
+        await db_session.commit()
+        assert json.loads((await socket.receive())['text']) == {'event': 'create', 'ids': [profile.id]}
+        assert json.loads((await socket.receive())['text']) == {'event': 'delete', 'ids': [profile.id]}
+
+        await socket.close({'type': 'websocket.disconnect', 'code': 1000})
+        assert len(profile_feed) == 0
+
+    async def test_bearer_header(self, feed: None, token: str):
+        socket = AsgiConnection(
+            _scope('websocket', '/social_profiles/stream/ws', {'Authorization': f'Bearer {token}'}),
+            {'type': 'websocket.connect'}
+        )
+        assert (await socket.receive())['type'] == 'websocket.accept'
+        await socket.close({'type': 'websocket.disconnect', 'code': 1000})
+
+    async def test_rejects_invalid_token(self, test_user: User):
+        socket = AsgiConnection(
+            _scope('websocket', '/social_profiles/stream/ws', {}, b'token=invalid'),
+            {'type': 'websocket.connect'}
+        )
+        message = await socket.receive()
+        assert (message['type'], message['code']) == ('websocket.close', status.WS_1008_POLICY_VIOLATION)
+        await asyncio.wait_for(socket.task, 5.0)
@@ -0,0 +1,120 @@
+import json
+
+import pytest
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.social_profile import has_pg_trgm
+from app.routers.auth.identity import _IDENTITY_QUERY
+from app.routers.auth.lookup import _LOGIN_CREDENTIALS_QUERY, _EXISTS_QUERIES
+from app.routers.profile_queries import (
+    profiles_version_query, profiles_page_query, profiles_search_query, profile_stats_query, profile_update_query,
+    profile_delete_query, profiles_batch_update_query, profiles_batch_delete_query
+)
+
+pytestmark = pytest.mark.anyio
+
+USERS = 2000
+PROFILES_PER_USER = 10
+USER_ID = 1000
+
+# Each router statement, its parameters and the index it is expected to be answered from.
+QUERIES = {
+    'profiles version': (profiles_version_query(USER_ID), {}, 'users'),
+    'profiles page': (profiles_page_query(USER_ID, 0).limit(101), {}, 'social_profiles'),
+    'profiles next page': (profiles_page_query(USER_ID, 15000).limit(101), {}, 'social_profiles'),
+    'update profile': (profile_update_query(1, USER_ID, {'profile_type': 'business'}), {}, 'social_profiles'),
+    'select profile': (profile_update_query(1, USER_ID, {}), {}, 'social_profiles'),
+    'delete profile': (profile_delete_query(1, USER_ID), {}, 'social_profiles'),
+    'batch update profiles': (
+        profiles_batch_update_query(USER_ID, [(1, None, None, 'business'), (2, 1, None, None)]),
+        {},
+        'social_profiles'
+    ),
+    'batch delete profiles': (profiles_batch_delete_query(USER_ID, [1, 2, 3]), {}, 'social_profiles'),
+    'search by platform and type': (profiles_search_query(4, 'creator').limit(101), {}, 'social_profiles'),
+    'profile stats': (profile_stats_query(USER_ID), {}, 'profile_stats'),
+    'login credentials': (_LOGIN_CREDENTIALS_QUERY, {'value': 'user1000@example.com'}, 'users'),
+    'email exists': (_EXISTS_QUERIES['email'], {'value': 'user1000@example.com'}, 'users'),
+    'username exists': (_EXISTS_QUERIES['username'], {'value': 'user1000'}, 'users'),
+    'phone number exists': (_EXISTS_QUERIES['phone_number'], {'value': '+10000001000'}, 'users'),
+    'identity': (_IDENTITY_QUERY, {'user_id': USER_ID}, 'users'),
+}
+
+
+@pytest.fixture(scope='function')
+async def seeded_db(db_session: AsyncSession) -> AsyncSession:
+    await db_session.execute(text('''
+        INSERT INTO users (id, email, username, password, phone_number, date_of_birth)
+        SELECT i, 'user' || i || '@example.com', 'user' || i, 'hash', '+1' || lpad(i::text, 10, '0'), '2000-01-01'
+        FROM generate_series(1, :users) AS i
+    '''), {'users': USERS})
+    await db_session.execute(text('''
+        INSERT INTO platforms (id, name)
+        SELECT i, (ARRAY['Twitter', 'Facebook', 'Instagram', 'Github', 'Gitlab', 'Youtube', 'Telegram', 'Reddit'])[i]
+        FROM generate_series(1, 8) AS i
+    '''))
+    await db_session.execute(text('''
+        INSERT INTO social_profiles (user_id, platform_code, profile_url, profile_type_code)
+        SELECT u.id,
+               1 + (u.id + n) % 8,
+               'https://example.com/' || u.username || '/' || n,
+               ((ARRAY['personal', 'business', 'creator', 'brand', 'group', 'page', 'channel', 'media'])[1 + (u.id * n) % 8])::profile_type
+        FROM users u CROSS JOIN generate_series(1, :profiles) AS n
+    '''), {'profiles': PROFILES_PER_USER})
+    for table in ('users', 'platforms'):
+        await db_session.execute(text(f'''
+            SELECT setval(pg_get_serial_sequence('{table}', 'id'), GREATEST(
+                (SELECT max(id) FROM {table}), (SELECT last_value FROM {table}_id_seq)
+            ))
+        '''))
+    await db_session.execute(text('ANALYZE users'))
+    await db_session.execute(text('ANALYZE social_profiles'))
+    await db_session.execute(text('ANALYZE profile_stats'))
+    await db_session.commit()
+    return db_session
+
+
+def _scans(plan: dict):
+    if 'Relation Name' in plan and plan['Node Type'] != 'ModifyTable':
+        yield plan['Node Type'], plan['Relation Name'], plan.get('Index Name')
+    for child in plan.get('Plans', []):
+        yield from _scans(child)
+
+
+async def _explain(db: AsyncSession, query, params: dict) -> dict:
+    connection = await db.connection()
+    compiled = query.compile(dialect=connection.dialect)
+    bound = compiled.construct_params(params)
+    result = await connection.exec_driver_sql(
+        f'EXPLAIN (FORMAT JSON) {compiled}',
+        tuple(bound[name] for name in compiled.positiontup)
+    )
+    plan = result.scalar_one()
+    return (json.loads(plan) if isinstance(plan, str) else plan)[0]['Plan']
+
+
+class TestQueryPlans:
+
+    async def test_url_search_uses_trigram_index(self, seeded_db: AsyncSession):
+        connection = await seeded_db.connection()
+        if not await connection.run_sync(lambda sync_connection: has_pg_trgm(sync_connection)):
+            pytest.skip('pg_trgm is not available')
+
+        for query in (
+            profiles_search_query(url_contains='user1234/'),
+            profiles_search_query(url_prefix='https://example.com/user1234/')
+        ):
+            plan = await _explain(seeded_db, query.limit(101), {})
+            indexes = {index for _, relation, index in _scans(plan) if relation == 'social_profiles'}
+            assert indexes == {'ix_social_profiles_profile_url_trgm'}, plan
+
+    @pytest.mark.parametrize('name', QUERIES)
+    async def test_query_uses_index(self, seeded_db: AsyncSession, name: str):
+        query, params, table = QUERIES[name]
+        plan = await _explain(seeded_db, query, params)
+
+        scans = [(node_type, index) for node_type, relation, index in _scans(plan) if relation == table]
+        assert scans, plan
+        assert all(node_type in ('Index Scan', 'Index Only Scan', 'Bitmap Heap Scan') for node_type, _ in scans), plan
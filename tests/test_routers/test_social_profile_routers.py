@@ -1,20 +1,50 @@
+import csv
+import io
+import json
+
 import pytest
 
 from fastapi import status
 
+from datetime import date
+
+from typing import AsyncIterator
+
 from httpx import AsyncClient
 
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
 from app.schemas.auth import TokenResponse, UserResponse
-from app.schemas.social_profiles import SocialProfileResponse
+from app.schemas.social_profiles import SocialProfileResponse, MAX_BATCH_OPERATIONS
 from app.models.user import User
+from app.models.platform import Platform
 from app.models.social_profile import SocialProfile
+from app.routers.auth.identity import identity_cache
+from app.routers.auth.utils import get_password_hash
+from app.routers.platform_codes import platform_codes
+from app.routers.profile_import import import_limiter
 
 pytestmark = pytest.mark.anyio
 
 
+@pytest.fixture(scope='function')
+async def admin_headers(client: AsyncClient, db_session: AsyncSession) -> dict:
+    admin = User(
+        email='admin@example.com',
+        username='adminuser',
+        password=get_password_hash('Newpassword1!'),
+        phone_number='+1987654321',
+        date_of_birth=date(1990, 1, 1),
+        is_admin=True
+    )
+    db_session.add(admin)
+    await db_session.commit()
+
+    response = await client.post('/auth/login', data={'username': admin.email, 'password': 'Newpassword1!'})
+    return {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+
 class TestGetSocialProfiles:
 
     async def test_get_social_profiles_success(self, client: AsyncClient, test_user: User, test_social_profiles: list[SocialProfile]):
@@ -36,6 +66,156 @@ class TestGetSocialProfiles:
         test_profile_ids = {profile.id for profile in test_social_profiles}
         assert profile_ids == test_profile_ids
 
+    async def test_get_social_profiles_pages(self, client: AsyncClient, db_session: AsyncSession, test_user: User):
+        db_session.add_all([
+            SocialProfile(
+                user_id=test_user.id,
+                platform='Twitter',
+                profile_url=f'https://twitter.com/testuser{i}',
+                profile_type='personal'
+            )
+            for i in range(5)
+        ])
+        await db_session.commit()
+
+        response = await client.post('/auth/login', data={'username': test_user.email, 'password': 'Newpassword1!'})
+        headers = {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+        pages = []
+        params = {'limit': 2}
+        while True:
+            response = await client.get('/social_profiles/', params=params, headers=headers)
+            assert response.status_code == status.HTTP_200_OK
+            pages.append([profile['profile_url'] for profile in response.json()])
+
+            next_cursor = response.headers.get('X-Next-Cursor')
+            if next_cursor is None:
+                assert 'Link' not in response.headers
+                break
+            assert response.headers['Link'].endswith('; rel="next"')
+            assert f'cursor={next_cursor}' in response.headers['Link']
+            params['cursor'] = next_cursor
+
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert sum(pages, []) == [f'https://twitter.com/testuser{i}' for i in range(5)]
+
+    async def test_get_social_profiles_stream(
+            self, client: AsyncClient, test_user: User, test_social_profiles: list[SocialProfile]
+    ):
+        response = await client.post('/auth/login', data={'username': test_user.email, 'password': 'Newpassword1!'})
+        headers = {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+        response = await client.get('/social_profiles/', params={'stream': True}, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers['content-type'] == 'application/x-ndjson'
+
+        profiles = [SocialProfileResponse.model_validate_json(line) for line in response.text.splitlines()]
+        assert [profile.id for profile in profiles] == sorted(profile.id for profile in test_social_profiles)
+
+    @pytest.mark.parametrize('params', [{'cursor': 'not-a-cursor'}, {'cursor': 'eyJpZCI6ICIxIn0'}])
+    async def test_get_social_profiles_invalid_cursor(self, client: AsyncClient, test_user: User, params: dict):
+        response = await client.post('/auth/login', data={'username': test_user.email, 'password': 'Newpassword1!'})
+        headers = {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+        response = await client.get('/social_profiles/', params=params, headers=headers)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {'detail': 'Invalid cursor'}
+
+    async def test_get_social_profiles_limit_cap(self, client: AsyncClient, test_user: User):
+        response = await client.post('/auth/login', data={'username': test_user.email, 'password': 'Newpassword1!'})
+        headers = {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+        response = await client.get('/social_profiles/', params={'limit': 100000}, headers=headers)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    async def test_get_social_profiles_not_modified(
+            self, client: AsyncClient, test_user: User, test_social_profiles: list[SocialProfile],
+            query_counter: list[str]
+    ):
+        response = await client.post('/auth/login', data={'username': test_user.email, 'password': 'Newpassword1!'})
+        headers = {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+        response = await client.get('/social_profiles/', headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        etag = response.headers['ETag']
+
+        query_counter.clear()
+        response = await client.get('/social_profiles/', headers={**headers, 'If-None-Match': etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers['ETag'] == etag
+        assert response.content == b''
+        assert len(query_counter) == 1
+        assert 'social_profiles' not in query_counter[0]
+
+        response = await client.get('/social_profiles/', headers={**headers, 'If-None-Match': f'"other", W/{etag}'})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        response = await client.get('/social_profiles/', params={'limit': 1}, headers={**headers, 'If-None-Match': etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers['ETag'] != etag
+
+    async def test_get_social_profiles_etag_changes_on_write(
+            self, client: AsyncClient, test_user: User, test_social_profile: SocialProfile
+    ):
+        response = await client.post('/auth/login', data={'username': test_user.email, 'password': 'Newpassword1!'})
+        headers = {'Authorization': f'Bearer {response.json()["access_token"]}'}
+        profile_data = {
+            'platform': 'Twitter',
+            'profile_url': 'https://twitter.com/testuser',
+            'profile_type': 'personal'
+        }
+
+        etags = []
+        for method, url, body in [
+            ('POST', '/social_profiles/create', profile_data),
+            ('PUT', f'/social_profiles/{test_social_profile.id}', {'profile_type': 'business'}),
+            ('DELETE', f'/social_profiles/{test_social_profile.id}', None),
+            ('POST', '/social_profiles/batch', {'operations': [
+                {'op': 'create', 'data': {**profile_data, 'profile_url': 'https://twitter.com/testuser2'}}
+            ]}),
+        ]:
+            etag = (await client.get('/social_profiles/', headers=headers)).headers['ETag']
+            etags.append(etag)
+            response = await client.request(method, url, json=body, headers=headers)
+            assert response.status_code < 300
+
+            response = await client.get('/social_profiles/', headers={**headers, 'If-None-Match': etag})
+            assert response.status_code == status.HTTP_200_OK
+
+        assert len(set(etags)) == len(etags)
+
+    async def test_get_social_profiles_fields(
+            self, client: AsyncClient, test_user: User, test_social_profiles: list[SocialProfile],
+            query_counter: list[str]
+    ):
+        response = await client.post('/auth/login', data={'username': test_user.email, 'password': 'Newpassword1!'})
+        headers = {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+        query_counter.clear()
+        response = await client.get('/social_profiles/', params={'fields': 'platform,id'}, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [
+            {'id': profile.id, 'platform': profile.platform} for profile in test_social_profiles
+        ]
+        assert 'profile_url' not in query_counter[-1]
+
+        response = await client.get(
+            '/social_profiles/', params={'fields': 'platform', 'stream': True}, headers=headers
+        )
+        assert response.text.splitlines() == [
+            f'{{"platform":"{profile.platform}"}}' for profile in test_social_profiles
+        ]
+
+    async def test_get_social_profiles_invalid_fields(self, client: AsyncClient, test_user: User):
+        response = await client.post('/auth/login', data={'username': test_user.email, 'password': 'Newpassword1!'})
+        headers = {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+        response = await client.get('/social_profiles/', params={'fields': 'id,password'}, headers=headers)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {
+            'detail': 'Invalid fields: password. Valid options are: platform, profile_url, profile_type, id'
+        }
+
     async def test_get_social_profiles_no_auth(self, client: AsyncClient):
         response = await client.get('/social_profiles/')
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -65,6 +245,79 @@ class TestCreateSocialProfile:
         assert str(profile.profile_url) == profile_data['profile_url']
         assert profile.profile_type == profile_data['profile_type']
 
+    async def test_create_social_profile_canonical_url(self, client: AsyncClient, test_user: User):
+        response = await client.post('/auth/login', data={'username': test_user.email, 'password': 'Newpassword1!'})
+        headers = {'Authorization': f'Bearer {response.json()["access_token"]}'}
+        profile_data = {
+            'platform': 'Twitter',
+            'profile_url': 'https://www.x.com/TestUser/?utm_source=share',
+            'profile_type': 'personal'
+        }
+        response = await client.post('/social_profiles/create', json=profile_data, headers=headers)
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()['profile_url'] == 'https://twitter.com/testuser'
+
+    async def test_create_social_profile_duplicate_url(
+            self, client: AsyncClient, test_user: User, test_social_profiles: list[SocialProfile]
+    ):
+        response = await client.post('/auth/login', data={'username': test_user.email, 'password': 'Newpassword1!'})
+        headers = {'Authorization': f'Bearer {response.json()["access_token"]}'}
+        profile_data = {
+            'platform': 'Twitter',
+            'profile_url': 'http://mobile.twitter.com/TestUser#top',
+            'profile_type': 'business'
+        }
+        response = await client.post('/social_profiles/create', json=profile_data, headers=headers)
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert response.json() == {'detail': 'A social profile with this URL already exists'}
+
+    async def test_create_social_profile_deleted_user(
+            self, client: AsyncClient, db_session: AsyncSession, test_user: User
+    ):
+        response = await client.post('/auth/login', data={'username': test_user.email, 'password': 'Newpassword1!'})
+        headers = {'Authorization': f'Bearer {response.json()["access_token"]}'}
+        profile_data = {
+            'platform': 'Twitter',
+            'profile_url': 'https://twitter.com/testuser',
+            'profile_type': 'personal'
+        }
+        response = await client.post('/social_profiles/create', json=profile_data, headers=headers)
+        assert response.status_code == status.HTTP_201_CREATED
+
+        await db_session.execute(delete(SocialProfile))
+        await db_session.execute(delete(User).where(User.id == test_user.id))
+        await db_session.commit()
+
+        # The identity is still cached, so the foreign key has to reject the insert.
+        response = await client.post('/social_profiles/create', json=profile_data, headers=headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json() == {'detail': 'User not found'}
+
+        # The failed insert invalidated the entry, so the user is now rejected before inserting.
+        misses = identity_cache.stats()['misses']
+        response = await client.post('/social_profiles/create', json=profile_data, headers=headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert identity_cache.stats()['misses'] == misses + 1
+
+    async def test_create_social_profile_inactive_user(
+            self, client: AsyncClient, db_session: AsyncSession, test_user: User
+    ):
+        response = await client.post('/auth/login', data={'username': test_user.email, 'password': 'Newpassword1!'})
+        headers = {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+        await db_session.execute(update(User).where(User.id == test_user.id).values(is_active=False))
+        await db_session.commit()
+        identity_cache.invalidate(test_user.id)
+
+        profile_data = {
+            'platform': 'Twitter',
+            'profile_url': 'https://twitter.com/testuser',
+            'profile_type': 'personal'
+        }
+        response = await client.post('/social_profiles/create', json=profile_data, headers=headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json() == {'detail': 'User not found'}
+
     async def test_create_social_profile_user_not_found(self, client: AsyncClient):
         headers = {'Authorization': 'Bearer invalidtoken'}
         profile_data = {
@@ -77,6 +330,179 @@ class TestCreateSocialProfile:
         assert response.json() == {'detail': 'Could not validate user'}
 
 
+class TestImportSocialProfiles:
+
+    async def _login(self, client: AsyncClient, user: User) -> dict:
+        response = await client.post('/auth/login', data={'username': user.email, 'password': 'Newpassword1!'})
+        return {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+    async def test_import_csv(
+            self, client: AsyncClient, db_session: AsyncSession, test_user: User, test_social_profile: SocialProfile
+    ):
+        headers = await self._login(client, test_user)
+        source = (
+            'platform,profile_url,profile_type\n'
+            'Twitter,https://twitter.com/TestUser/,personal\n'
+            'Github,not a url,personal\n'
+            'Instagram,https://www.instagram.com/testuser,personal\n'
+            'Github,"https://github.com/testuser",unknown\n'
+            'Twitter,https://x.com/testuser,business\n'
+            'Github,https://github.com/testuser,business\n'
+            'Reddit,https://reddit.com/u/testuser,personal,extra\n'
+        )
+        response = await client.post(
+            '/social_profiles/import', files={'file': ('profiles.csv', source, 'text/csv')}, headers=headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        report = response.json()
+        assert (report['read'], report['inserted']) == (7, 2)
+        errors = {error['line']: error['error'] for error in report['errors']}
+        assert set(errors) == {3, 4, 5, 6, 8}
+        assert errors[3].startswith('profile_url: ')
+        assert errors[4] == 'A social profile with this URL already exists'
+        assert errors[5].startswith('profile_type: ')
+        assert errors[6] == 'profile_url repeated in file'
+        assert errors[8] == 'expected 3 fields, found 4'
+
+        profiles = (await db_session.execute(
+            select(SocialProfile.platform, SocialProfile.profile_url, SocialProfile.profile_type)
+            .where(SocialProfile.user_id == test_user.id)
+            .order_by(SocialProfile.id)
+        )).all()
+        assert [tuple(profile) for profile in profiles] == [
+            ('Instagram', 'https://instagram.com/testuser', 'personal'),
+            ('Twitter', 'https://twitter.com/testuser', 'personal'),
+            ('Github', 'https://github.com/testuser', 'business'),
+        ]
+
+    async def test_import_ndjson_in_chunks(
+            self, client: AsyncClient, db_session: AsyncSession, test_user: User, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr('app.routers.social_profiles.IMPORT_CHUNK_SIZE', 2)
+        headers = await self._login(client, test_user)
+        rows = [
+            {'platform': 'Github', 'profile_url': f'https://github.com/user{i % 4}', 'profile_type': 'personal'}
+            for i in range(5)
+        ]
+        source = '\n'.join(map(json.dumps, rows))
+        response = await client.post(
+            '/social_profiles/import', params={'format': 'ndjson'},
+            files={'file': ('profiles.txt', source)}, headers=headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            'read': 5, 'inserted': 4, 'errors': [{'line': 5, 'error': 'profile_url repeated in file'}]
+        }
+
+        response = await client.get('/social_profiles/stats', headers=headers)
+        assert response.json()['total'] == 4
+
+    async def test_import_holds_no_lock_during_upload(
+            self, client: AsyncClient, db_engine: AsyncEngine, test_user: User, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr('app.routers.social_profiles.IMPORT_CHUNK_SIZE', 1)
+        headers = await self._login(client, test_user)
+        boundary = 'import-boundary'
+
+        async def upload() -> AsyncIterator[bytes]:
+            yield (
+                f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="profiles.csv"\r\n\r\n'
+                'platform,profile_url,profile_type\nGithub,https://github.com/a,personal\n'
+            ).encode()
+            # The first row has been read, but the user's row must not be locked before the upload ends.
+            async with db_engine.connect() as conn:
+                await conn.execute(select(User.id).where(User.id == test_user.id).with_for_update(nowait=True))
+            yield f'Github,https://github.com/b,personal\n\r\n--{boundary}--\r\n'.encode()
+
+        response = await client.post(
+            '/social_profiles/import', content=upload(),
+            headers={**headers, 'Content-Type': f'multipart/form-data; boundary={boundary}'}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {'read': 2, 'inserted': 2, 'errors': []}
+
+    async def test_import_too_many_rows(
+            self, client: AsyncClient, db_session: AsyncSession, test_user: User, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr('app.routers.social_profiles.MAX_IMPORT_ROWS', 2)
+        monkeypatch.setattr('app.routers.social_profiles.IMPORT_CHUNK_SIZE', 1)
+        headers = await self._login(client, test_user)
+        source = 'platform,profile_url,profile_type\n' + ''.join(
+            f'Github,https://github.com/user{i},personal\n' for i in range(3)
+        )
+        response = await client.post(
+            '/social_profiles/import', files={'file': ('profiles.csv', source)}, headers=headers
+        )
+        assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        assert await db_session.scalar(select(SocialProfile.id)) is None
+
+    async def test_import_too_large(
+            self, client: AsyncClient, db_session: AsyncSession, test_user: User, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr('app.routers.profile_import.MAX_IMPORT_BYTES', 200)
+        headers = await self._login(client, test_user)
+        source = 'platform,profile_url,profile_type\n' + ''.join(
+            f'Github,https://github.com/user{i},personal\n' for i in range(10)
+        )
+        response = await client.post(
+            '/social_profiles/import', files={'file': ('profiles.csv', source)}, headers=headers
+        )
+        assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+
+        boundary = 'import-boundary'
+
+        async def upload() -> AsyncIterator[bytes]:
+            yield f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="a.csv"\r\n\r\n'.encode()
+            yield source.encode()
+            yield f'\r\n--{boundary}--\r\n'.encode()
+
+        # Without a length header the body is counted as it arrives.
+        response = await client.post(
+            '/social_profiles/import', content=upload(),
+            headers={**headers, 'Content-Type': f'multipart/form-data; boundary={boundary}'}
+        )
+        assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        assert await db_session.scalar(select(SocialProfile.id)) is None
+
+    async def test_import_rejected_when_busy(self, client: AsyncClient, test_user: User):
+        headers = await self._login(client, test_user)
+        active = import_limiter.active
+        import_limiter.active = import_limiter.capacity
+        try:
+            response = await client.post(
+                '/social_profiles/import', files={'file': ('profiles.csv', 'platform,profile_url,profile_type\n')},
+                headers=headers
+            )
+        finally:
+            import_limiter.active = active
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.headers['retry-after'] == '5'
+
+        response = await client.post(
+            '/social_profiles/import', files={'file': ('profiles.csv', 'platform,profile_url,profile_type\n')},
+            headers=headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert import_limiter.active == active
+
+    async def test_import_requires_file(self, client: AsyncClient, test_user: User):
+        headers = await self._login(client, test_user)
+
+        response = await client.post(
+            '/social_profiles/import', data={'other': 'value'}, files={'upload': ('a.csv', '')}, headers=headers
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = await client.post('/social_profiles/import', json={'file': 'profiles'}, headers=headers)
+        assert response.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+
+    async def test_import_no_auth(self, client: AsyncClient):
+        response = await client.post('/social_profiles/import', files={'file': ('profiles.csv', '')})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
 class TestUpdateSocialProfile:
 
     async def test_update_social_profile_success(self, client: AsyncClient, test_user: User, test_social_profile: SocialProfile):
@@ -101,6 +527,73 @@ class TestUpdateSocialProfile:
         assert str(updated_profile.profile_url) == update_data['profile_url']
         assert updated_profile.profile_type == update_data['profile_type']
 
+    async def test_update_social_profile_single_statement(
+            self, client: AsyncClient, db_session: AsyncSession, test_user: User,
+            test_social_profile: SocialProfile, query_counter: list[str]
+    ):
+        response = await client.post('/auth/login', data={'username': test_user.email, 'password': 'Newpassword1!'})
+        headers = {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+        query_counter.clear()
+        response = await client.put(
+            f'/social_profiles/{test_social_profile.id}',
+            json={'profile_type': 'business'},
+            headers=headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert len(query_counter) == 1
+        assert query_counter[0].startswith('UPDATE social_profiles SET profile_type_code=')
+
+        await db_session.refresh(test_social_profile)
+        assert test_social_profile.profile_type == 'business'
+        assert test_social_profile.platform == 'Instagram'
+
+    async def test_update_social_profile_other_user(
+            self, client: AsyncClient, db_session: AsyncSession, test_user: User,
+            test_social_profile: SocialProfile, query_counter: list[str]
+    ):
+        other_user = User(
+            email='other@example.com',
+            username='otheruser',
+            password=test_user.password,
+            phone_number='+1987654321',
+            date_of_birth=test_user.date_of_birth
+        )
+        db_session.add(other_user)
+        await db_session.commit()
+
+        response = await client.post('/auth/login', data={'username': other_user.email, 'password': 'Newpassword1!'})
+        headers = {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+        query_counter.clear()
+        response = await client.put(
+            f'/social_profiles/{test_social_profile.id}',
+            json={'profile_type': 'business'},
+            headers=headers
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json() == {'detail': 'Profile not found'}
+        assert len(query_counter) == 1
+
+    async def test_update_social_profile_duplicate_url(
+            self, client: AsyncClient, db_session: AsyncSession, test_user: User,
+            test_social_profiles: list[SocialProfile]
+    ):
+        response = await client.post('/auth/login', data={'username': test_user.email, 'password': 'Newpassword1!'})
+        headers = {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+        twitter, facebook = test_social_profiles
+        response = await client.put(
+            f'/social_profiles/{facebook.id}',
+            json={'profile_url': 'https://www.twitter.com/testuser/'},
+            headers=headers
+        )
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert response.json() == {'detail': 'A social profile with this URL already exists'}
+
+        await db_session.refresh(facebook)
+        assert facebook.profile_url == 'https://facebook.com/testuser'
+
     async def test_update_social_profile_not_found(self, client: AsyncClient, test_user: User):
         payload = {
             'username': test_user.email,
@@ -141,6 +634,24 @@ class TestDeleteSocialProfile:
         profiles = result.json()
         assert all(profile['id'] != test_social_profile.id for profile in profiles)
 
+    async def test_delete_social_profile_single_statement(
+            self, client: AsyncClient, test_user: User, test_social_profile: SocialProfile, query_counter: list[str]
+    ):
+        response = await client.post('/auth/login', data={'username': test_user.email, 'password': 'Newpassword1!'})
+        headers = {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+        query_counter.clear()
+        response = await client.delete(f'/social_profiles/{test_social_profile.id}', headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['id'] == test_social_profile.id
+        assert len(query_counter) == 1
+        assert query_counter[0].startswith('DELETE FROM social_profiles')
+
+        query_counter.clear()
+        response = await client.delete(f'/social_profiles/{test_social_profile.id}', headers=headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert len(query_counter) == 1
+
     async def test_delete_social_profile_not_found(self, client: AsyncClient, test_user: User):
         payload = {
             'username': test_user.email,
@@ -153,3 +664,418 @@ class TestDeleteSocialProfile:
         response = await client.delete('/social_profiles/9999', headers=headers)
         assert response.status_code == status.HTTP_404_NOT_FOUND
         assert response.json() == {'detail': 'Profile not found'}
+
+
+class TestSocialProfileStats:
+
+    async def test_stats(
+            self, client: AsyncClient, test_user: User, test_social_profiles: list[SocialProfile],
+            query_counter: list[str]
+    ):
+        response = await client.post('/auth/login', data={'username': test_user.email, 'password': 'Newpassword1!'})
+        headers = {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+        operations = [
+            {
+                'op': 'create',
+                'data': {'platform': 'Twitter', 'profile_url': 'https://twitter.com/other', 'profile_type': 'personal'}
+            },
+            {'op': 'update', 'id': test_social_profiles[1].id, 'data': {'platform': 'Github'}},
+        ]
+        response = await client.post('/social_profiles/batch', json={'operations': operations}, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+
+        query_counter.clear()
+        response = await client.get('/social_profiles/stats', headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            'total': 3,
+            'stats': [
+                {'platform': 'Github', 'profile_type': 'business', 'count': 1},
+                {'platform': 'Twitter', 'profile_type': 'personal', 'count': 2},
+            ]
+        }
+        assert len(query_counter) == 1
+
+    async def test_stats_without_profiles(self, client: AsyncClient, test_user: User):
+        response = await client.post('/auth/login', data={'username': test_user.email, 'password': 'Newpassword1!'})
+        headers = {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+        response = await client.get('/social_profiles/stats', headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {'total': 0, 'stats': []}
+
+    async def test_stats_no_auth(self, client: AsyncClient):
+        response = await client.get('/social_profiles/stats')
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+class TestBatchSocialProfiles:
+
+    async def _login(self, client: AsyncClient, user: User) -> dict:
+        response = await client.post('/auth/login', data={'username': user.email, 'password': 'Newpassword1!'})
+        return {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+    async def test_batch_success(
+            self, client: AsyncClient, db_session: AsyncSession, test_user: User,
+            test_social_profiles: list[SocialProfile]
+    ):
+        headers = await self._login(client, test_user)
+        updated, deleted = test_social_profiles
+        operations = [
+            {
+                'op': 'create',
+                'data': {'platform': 'github', 'profile_url': 'https://github.com/testuser', 'profile_type': 'personal'}
+            },
+            {'op': 'update', 'id': updated.id, 'data': {'profile_type': 'Creator'}},
+            {'op': 'delete', 'id': deleted.id},
+            {
+                'op': 'create',
+                'data': {'platform': 'Gitlab', 'profile_url': 'https://gitlab.com/testuser', 'profile_type': 'personal'}
+            },
+        ]
+        response = await client.post('/social_profiles/batch', json={'operations': operations}, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+
+        results = response.json()['results']
+        assert [result['status_code'] for result in results] == [201, 200, 200, 201]
+        assert [result['index'] for result in results] == [0, 1, 2, 3]
+        assert results[0]['profile']['platform'] == 'Github'
+        assert results[3]['profile']['platform'] == 'Gitlab'
+        assert results[1]['profile'] == {
+            'id': updated.id,
+            'platform': updated.platform,
+            'profile_url': updated.profile_url,
+            'profile_type': 'creator'
+        }
+        assert results[2]['profile']['id'] == deleted.id
+
+        profiles = (await db_session.execute(
+            select(SocialProfile.id, SocialProfile.profile_type)
+            .where(SocialProfile.user_id == test_user.id)
+            .order_by(SocialProfile.id)
+        )).all()
+        assert [tuple(profile) for profile in profiles] == [
+            (updated.id, 'creator'),
+            (results[0]['profile']['id'], 'personal'),
+            (results[3]['profile']['id'], 'personal'),
+        ]
+
+    async def test_batch_reports_item_errors(
+            self, client: AsyncClient, db_session: AsyncSession, test_user: User, test_social_profile: SocialProfile
+    ):
+        headers = await self._login(client, test_user)
+        operations = [
+            {'op': 'create', 'data': {'platform': 'Twitter', 'profile_url': 'not a url', 'profile_type': 'personal'}},
+            {'op': 'update', 'data': {'profile_type': 'business'}},
+            {'op': 'update', 'id': 999999, 'data': {'profile_type': 'business'}},
+            {'op': 'delete', 'id': test_social_profile.id},
+            {'op': 'update', 'id': test_social_profile.id, 'data': {'profile_type': 'business'}},
+            {'op': 'update', 'id': 999998, 'data': {'profile_type': 'unknown'}},
+        ]
+        response = await client.post('/social_profiles/batch', json={'operations': operations}, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+
+        results = response.json()['results']
+        assert [result['status_code'] for result in results] == [422, 422, 404, 200, 400, 422]
+        assert results[0]['error'].startswith('profile_url: ')
+        assert results[1]['error'] == 'id: Field required'
+        assert results[2]['error'] == 'Profile not found'
+        assert results[4]['error'] == 'Profile appears more than once in the batch'
+        assert all(result['profile'] is None for i, result in enumerate(results) if i != 3)
+
+        assert await db_session.scalar(select(SocialProfile.id).where(SocialProfile.user_id == test_user.id)) is None
+
+    async def test_batch_other_users_profiles(
+            self, client: AsyncClient, db_session: AsyncSession, test_user: User, test_social_profile: SocialProfile
+    ):
+        other_user = User(
+            email='other@example.com',
+            username='otheruser',
+            password=test_user.password,
+            phone_number='+1987654321',
+            date_of_birth=test_user.date_of_birth
+        )
+        db_session.add(other_user)
+        await db_session.commit()
+
+        headers = await self._login(client, other_user)
+        operations = [
+            {'op': 'update', 'id': test_social_profile.id, 'data': {'profile_type': 'business'}},
+            {'op': 'delete', 'id': test_social_profile.id},
+        ]
+        response = await client.post('/social_profiles/batch', json={'operations': operations[:1]}, headers=headers)
+        assert response.json()['results'][0]['status_code'] == status.HTTP_404_NOT_FOUND
+
+        response = await client.post('/social_profiles/batch', json={'operations': operations[1:]}, headers=headers)
+        assert response.json()['results'][0]['status_code'] == status.HTTP_404_NOT_FOUND
+
+        await db_session.refresh(test_social_profile)
+        assert test_social_profile.profile_type == 'personal'
+
+    async def test_batch_duplicate_urls(
+            self, client: AsyncClient, db_session: AsyncSession, test_user: User,
+            test_social_profiles: list[SocialProfile]
+    ):
+        headers = await self._login(client, test_user)
+        twitter, facebook = test_social_profiles
+        operations = [
+            {
+                'op': 'create',
+                'data': {'platform': 'Twitter', 'profile_url': 'https://x.com/TestUser', 'profile_type': 'personal'}
+            },
+            {
+                'op': 'create',
+                'data': {'platform': 'Github', 'profile_url': 'https://github.com/TestUser', 'profile_type': 'personal'}
+            },
+            {'op': 'update', 'id': facebook.id, 'data': {'profile_url': 'https://www.github.com/testuser/'}},
+            {'op': 'update', 'id': twitter.id, 'data': {'profile_url': 'https://twitter.com/TestUser?s=20'}},
+        ]
+        response = await client.post('/social_profiles/batch', json={'operations': operations}, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+
+        results = response.json()['results']
+        assert [result['status_code'] for result in results] == [409, 201, 409, 200]
+        assert results[0]['error'] == 'A social profile with this URL already exists'
+        assert results[1]['profile']['profile_url'] == 'https://github.com/testuser'
+        assert results[3]['profile']['profile_url'] == 'https://twitter.com/testuser'
+
+        urls = (await db_session.scalars(
+            select(SocialProfile.profile_url).where(SocialProfile.user_id == test_user.id).order_by(SocialProfile.id)
+        )).all()
+        assert urls == ['https://twitter.com/testuser', 'https://facebook.com/testuser', 'https://github.com/testuser']
+
+    async def test_batch_too_many_operations(self, client: AsyncClient, test_user: User):
+        headers = await self._login(client, test_user)
+        operations = [{'op': 'delete', 'id': i} for i in range(MAX_BATCH_OPERATIONS + 1)]
+        response = await client.post('/social_profiles/batch', json={'operations': operations}, headers=headers)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+class TestSearchSocialProfiles:
+
+    @pytest.fixture(scope='function')
+    async def profiles(self, db_session: AsyncSession, test_user: User) -> list[SocialProfile]:
+        profiles = [
+            SocialProfile(user_id=test_user.id, platform=platform, profile_url=url, profile_type=profile_type)
+            for platform, url, profile_type in [
+                ('Twitter', 'https://twitter.com/acme_corp', 'business'),
+                ('Twitter', 'https://twitter.com/AcmeFan', 'personal'),
+                ('Github', 'https://github.com/acme', 'organization'),
+                ('Twitter', 'https://twitter.com/100%25real', 'personal'),
+            ]
+        ]
+        db_session.add_all(profiles)
+        await db_session.commit()
+        return profiles
+
+    async def _search(self, client: AsyncClient, headers: dict, **params) -> list[str]:
+        response = await client.get('/social_profiles/search', params=params, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        return [profile['profile_url'] for profile in response.json()]
+
+    async def test_search_filters(self, client: AsyncClient, admin_headers: dict, profiles: list[SocialProfile]):
+        assert await self._search(client, admin_headers, platform='twitter', profile_type='Personal') == [
+            'https://twitter.com/AcmeFan', 'https://twitter.com/100%25real'
+        ]
+        assert await self._search(client, admin_headers, url_contains='ACME') == [
+            'https://twitter.com/acme_corp', 'https://twitter.com/AcmeFan', 'https://github.com/acme'
+        ]
+        assert await self._search(client, admin_headers, url_contains='acme_', platform='Twitter') == [
+            'https://twitter.com/acme_corp'
+        ]
+        assert await self._search(client, admin_headers, url_prefix='https://github.com/') == ['https://github.com/acme']
+        assert await self._search(client, admin_headers, url_contains='0%2') == ['https://twitter.com/100%25real']
+
+    async def test_search_unknown_platform_or_type(
+            self, client: AsyncClient, admin_headers: dict, profiles: list[SocialProfile]
+    ):
+        assert await self._search(client, admin_headers, platform='Myspace') == []
+        assert await self._search(client, admin_headers, profile_type='unknown', url_contains='acme') == []
+
+    async def test_search_result_includes_owner(
+            self, client: AsyncClient, admin_headers: dict, test_user: User, profiles: list[SocialProfile]
+    ):
+        response = await client.get('/social_profiles/search', params={'platform': 'Github'}, headers=admin_headers)
+        assert response.json() == [{
+            'id': profiles[2].id,
+            'user_id': test_user.id,
+            'platform': 'Github',
+            'profile_url': 'https://github.com/acme',
+            'profile_type': 'organization'
+        }]
+
+    async def test_search_pages(self, client: AsyncClient, admin_headers: dict, profiles: list[SocialProfile]):
+        params = {'platform': 'Twitter', 'limit': 2}
+        response = await client.get('/social_profiles/search', params=params, headers=admin_headers)
+        assert len(response.json()) == 2
+
+        params['cursor'] = response.headers['X-Next-Cursor']
+        response = await client.get('/social_profiles/search', params=params, headers=admin_headers)
+        assert [profile['id'] for profile in response.json()] == [profiles[3].id]
+        assert 'X-Next-Cursor' not in response.headers
+
+    async def test_search_requires_filter(self, client: AsyncClient, admin_headers: dict):
+        response = await client.get('/social_profiles/search', headers=admin_headers)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {
+            'detail': 'At least one of platform, profile_type, url_contains or url_prefix is required'
+        }
+
+    async def test_search_requires_admin(self, client: AsyncClient, test_user: User):
+        response = await client.post('/auth/login', data={'username': test_user.email, 'password': 'Newpassword1!'})
+        headers = {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+        response = await client.get('/social_profiles/search', params={'platform': 'Twitter'}, headers=headers)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert response.json() == {'detail': 'Not enough permissions'}
+
+
+class TestExportSocialProfiles:
+
+    @pytest.fixture(scope='function')
+    async def other_profile(self, db_session: AsyncSession, admin_headers: dict) -> SocialProfile:
+        admin = await db_session.scalar(select(User).where(User.email == 'admin@example.com'))
+        profile = SocialProfile(
+            user_id=admin.id, platform='Github', profile_url='https://github.com/a,b', profile_type='personal'
+        )
+        db_session.add(profile)
+        await db_session.commit()
+        return profile
+
+    async def test_export_ndjson(
+            self, client: AsyncClient, admin_headers: dict, test_social_profiles: list[SocialProfile],
+            other_profile: SocialProfile
+    ):
+        response = await client.get('/social_profiles/export', headers=admin_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers['content-type'] == 'application/x-ndjson'
+        assert response.headers['content-disposition'] == 'attachment; filename="social_profiles.ndjson"'
+
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert rows == [
+            {
+                'id': profile.id,
+                'user_id': profile.user_id,
+                'platform': profile.platform,
+                'profile_url': profile.profile_url,
+                'profile_type': profile.profile_type
+            }
+            for profile in [*test_social_profiles, other_profile]
+        ]
+
+    async def test_export_csv_of_one_user(
+            self, client: AsyncClient, admin_headers: dict, test_social_profiles: list[SocialProfile],
+            other_profile: SocialProfile
+    ):
+        response = await client.get(
+            '/social_profiles/export', params={'format': 'csv', 'user_id': other_profile.user_id}, headers=admin_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers['content-type'] == 'text/csv; charset=utf-8'
+        assert response.headers['content-disposition'] == (
+            f'attachment; filename="social_profiles_{other_profile.user_id}.csv"'
+        )
+        assert list(csv.reader(io.StringIO(response.text))) == [
+            ['id', 'user_id', 'platform', 'profile_url', 'profile_type'],
+            [str(other_profile.id), str(other_profile.user_id), 'Github', 'https://github.com/a,b', 'personal'],
+        ]
+
+    async def test_export_requires_admin(self, client: AsyncClient, test_user: User):
+        response = await client.post('/auth/login', data={'username': test_user.email, 'password': 'Newpassword1!'})
+        headers = {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+        response = await client.get('/social_profiles/export', headers=headers)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    async def test_export_invalid_format(self, client: AsyncClient, admin_headers: dict):
+        response = await client.get('/social_profiles/export', params={'format': 'xml'}, headers=admin_headers)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    async def test_export_own_profiles(
+            self, client: AsyncClient, test_user: User, test_social_profiles: list[SocialProfile],
+            other_profile: SocialProfile
+    ):
+        response = await client.post('/auth/login', data={'username': test_user.email, 'password': 'Newpassword1!'})
+        headers = {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+        response = await client.get('/social_profiles/export/me', params={'format': 'csv'}, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [int(row['id']) for row in rows] == [profile.id for profile in test_social_profiles]
+        assert {row['user_id'] for row in rows} == {str(test_user.id)}
+
+
+class TestProfilePlatforms:
+
+    @pytest.fixture(scope='function')
+    async def headers(self, client: AsyncClient, test_user: User) -> dict:
+        response = await client.post('/auth/login', data={'username': test_user.email, 'password': 'Newpassword1!'})
+        return {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+    async def test_platforms_are_encoded_by_the_application(
+            self, client: AsyncClient, headers: dict, query_counter: list[str]
+    ):
+        payload = {'platform': 'Mastodon', 'profile_url': 'https://mastodon.social/@testuser', 'profile_type': 'personal'}
+        response = await client.post('/social_profiles/create', json=payload, headers=headers)
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()['platform'] == 'Mastodon'
+        assert 'Mastodon' in platform_codes
+
+        response = await client.get('/social_profiles/', headers=headers)
+        assert [profile['platform'] for profile in response.json()] == ['Mastodon']
+        assert not [query for query in query_counter if 'platform_code(' in query or 'platform_name(' in query]
+
+    async def test_rolled_back_platform_is_not_kept(
+            self, client: AsyncClient, headers: dict, test_social_profile: SocialProfile, db_session: AsyncSession
+    ):
+        payload = {'platform': 'Mastodon', 'profile_url': test_social_profile.profile_url, 'profile_type': 'personal'}
+        response = await client.post('/social_profiles/create', json=payload, headers=headers)
+        assert response.status_code == status.HTTP_409_CONFLICT
+
+        assert 'Mastodon' not in platform_codes
+        assert await db_session.scalar(select(Platform.id).where(Platform.name == 'Mastodon')) is None
+
+    async def test_platforms_added_by_other_workers(
+            self, client: AsyncClient, headers: dict, admin_headers: dict, test_social_profiles: list[SocialProfile]
+    ):
+        # Another worker added the platforms after this one loaded its map.
+        platform_codes.clear()
+        expected = ['Twitter', 'Facebook']
+
+        response = await client.get('/social_profiles/', headers=headers)
+        assert [profile['platform'] for profile in response.json()] == expected
+        platform_codes.clear()
+        response = await client.get('/social_profiles/', params={'stream': 'true'}, headers=headers)
+        assert [json.loads(line)['platform'] for line in response.text.splitlines()] == expected
+        platform_codes.clear()
+        response = await client.get('/social_profiles/export/me', headers=headers)
+        assert [json.loads(line)['platform'] for line in response.text.splitlines()] == expected
+        platform_codes.clear()
+        response = await client.get('/social_profiles/search', params={'platform': 'twitter'}, headers=admin_headers)
+        assert [profile['platform'] for profile in response.json()] == ['Twitter']
+        platform_codes.clear()
+        response = await client.get('/social_profiles/stats', headers=headers)
+        assert [stat['platform'] for stat in response.json()['stats']] == ['Facebook', 'Twitter']
+        platform_codes.clear()
+        response = await client.put(
+            f'/social_profiles/{test_social_profiles[0].id}', json={'profile_type': 'business'}, headers=headers
+        )
+        assert response.json()['platform'] == 'Twitter'
+        platform_codes.clear()
+        response = await client.delete(f'/social_profiles/{test_social_profiles[1].id}', headers=headers)
+        assert response.json()['platform'] == 'Facebook'
+
+    async def test_new_platforms_are_limited(
+            self, client: AsyncClient, headers: dict, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(platform_codes, 'max_new_per_hour', 1)
+        payload = {'platform': 'Mastodon', 'profile_url': 'https://mastodon.social/@testuser', 'profile_type': 'personal'}
+        response = await client.post('/social_profiles/create', json=payload, headers=headers)
+        assert response.status_code == status.HTTP_201_CREATED
+
+        payload = {'platform': 'Bluesky', 'profile_url': 'https://bsky.app/profile/testuser', 'profile_type': 'personal'}
+        response = await client.post('/social_profiles/create', json=payload, headers=headers)
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert 'retry-after' in response.headers
+        assert 'Bluesky' not in platform_codes
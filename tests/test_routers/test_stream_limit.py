@@ -0,0 +1,104 @@
+import anyio
+import pytest
+
+from fastapi import HTTPException, status
+
+from httpx import AsyncClient
+
+from typing import AsyncIterator
+
+from app.routers.auth.utils import create_access_token
+from app.routers.stream_limit import StreamLimiter, stream_limiter
+from app.models.user import User
+
+pytestmark = pytest.mark.anyio
+
+
+async def _body(chunks: list[bytes], closed: list[bool]) -> AsyncIterator[bytes]:
+    try:
+        for chunk in chunks:
+            yield chunk
+    finally:
+        closed.append(True)
+
+
+async def _send(message: dict) -> None:
+    pass
+
+
+async def _receive() -> dict:
+    # The client stays connected.
+    await anyio.sleep_forever()
+
+
+class TestStreamLimiter:
+
+    async def test_releases_slot_once_sent(self):
+        limiter = StreamLimiter(capacity=1)
+        closed = []
+        response = limiter.response(_body([b'a', b'b'], closed))
+        assert limiter.active == 1
+
+        await response({'type': 'http'}, _receive, _send)
+        assert limiter.active == 0
+        assert closed == [True]
+
+    async def test_rejects_when_full(self):
+        limiter = StreamLimiter(capacity=1)
+        limiter.response(_body([], []))
+
+        with pytest.raises(HTTPException) as exc_info:
+            limiter.response(_body([], []))
+        assert exc_info.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert exc_info.value.headers == {'Retry-After': '5'}
+        assert limiter.rejected == 1
+
+    async def test_slot(self):
+        limiter = StreamLimiter(capacity=1)
+        with pytest.raises(RuntimeError):
+            with limiter.slot():
+                assert limiter.active == 1
+                with pytest.raises(HTTPException):
+                    with limiter.slot():
+                        pass
+                raise RuntimeError
+        assert (limiter.active, limiter.rejected) == (0, 1)
+
+    async def test_releases_slot_when_client_is_gone(self):
+        async def broken_send(message: dict) -> None:
+            raise OSError('connection reset')
+
+        limiter = StreamLimiter(capacity=1)
+        closed = []
+        response = limiter.response(_body([b'a'], closed))
+
+        with pytest.raises(ExceptionGroup):
+            await response({'type': 'http'}, _receive, broken_send)
+        assert limiter.active == 0
+        # The body was never started, so there was nothing to close.
+        assert closed == []
+
+
+class TestStreamRoutes:
+
+    @pytest.fixture(scope='function')
+    def headers(self, test_user: User) -> dict:
+        return {'Authorization': f'Bearer {create_access_token({"sub": test_user.email, "id": test_user.id})}'}
+
+    @pytest.fixture(scope='function')
+    def full(self) -> None:
+        active = stream_limiter.active
+        stream_limiter.active = stream_limiter.capacity
+        yield
+        stream_limiter.active = active
+
+    async def test_stream_releases_slot(self, client: AsyncClient, headers: dict):
+        response = await client.get('/social_profiles/export/me', headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert stream_limiter.active == 0
+
+    @pytest.mark.parametrize('url', ['/social_profiles/?stream=true', '/social_profiles/export/me'])
+    async def test_rejects_when_full(self, client: AsyncClient, headers: dict, full: None, url: str):
+        response = await client.get(url, headers=headers)
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.headers['retry-after'] == '5'
@@ -3,7 +3,7 @@ import pytest
 from pydantic import ValidationError
 from pydantic.networks import HttpUrl
 
-from app.schemas.social_profiles import SocialProfileCreate, SocialProfileUpdate, SocialProfileResponse
+from app.schemas.social_profiles import SocialProfileCreate, SocialProfileUpdate, SocialProfileResponse, MAX_LENGTH_PLATFORM
 
 
 class TestSocialProfileCreateSchema:
@@ -70,6 +70,17 @@ class TestSocialProfileCreateSchema:
         with pytest.raises(ValidationError):
             SocialProfileCreate(**invalid_data)
 
+    def test_long_platform_name(self):
+        invalid_data = {
+            'platform': 'a' * (MAX_LENGTH_PLATFORM + 1),
+            'profile_url': 'https://www.facebook.com/group/123456789',
+            'profile_type': 'group',
+        }
+        with pytest.raises(ValidationError):
+            SocialProfileCreate(**invalid_data)
+        with pytest.raises(ValidationError):
+            SocialProfileUpdate(platform=invalid_data['platform'])
+
     def test_capitalize_platform_name(self):
         valid_data = {
             'platform': 'linkedIn',
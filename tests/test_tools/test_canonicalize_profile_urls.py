@@ -0,0 +1,80 @@
+import io
+import json
+
+import pytest
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.models.social_profile import SocialProfile
+from app.models.user import User
+from app.tools.canonicalize_profile_urls import canonicalize_profile_urls
+
+pytestmark = pytest.mark.anyio
+
+
+class TestCanonicalizeProfileUrls:
+
+    @pytest.fixture(scope='function')
+    async def profiles(self, db_session: AsyncSession, test_user: User) -> list[SocialProfile]:
+        # Profiles stored before URLs were canonicalized; the model stores URLs as given.
+        profiles = [
+            SocialProfile(owner=test_user, platform='Twitter', profile_url=url, profile_type='personal')
+            for url in (
+                'https://www.twitter.com/TestUser/?utm_source=share',
+                'https://twitter.com/testuser',
+                'https://GitHub.com/TestUser/',
+                'https://www.github.com/testuser',
+                'https://example.com/TestUser',
+            )
+        ]
+        db_session.add_all(profiles)
+        await db_session.commit()
+        return profiles
+
+    async def _urls(self, db_session: AsyncSession) -> list[tuple[int, str]]:
+        return [tuple(row) for row in await db_session.execute(
+            select(SocialProfile.id, SocialProfile.profile_url).order_by(SocialProfile.id)
+        )]
+
+    async def test_reports_duplicates(
+            self, db_engine: AsyncEngine, db_session: AsyncSession, profiles: list[SocialProfile]
+    ):
+        report = io.StringIO()
+        stats = await canonicalize_profile_urls(report, batch_size=2, db_engine=db_engine)
+
+        assert (stats.scanned, stats.rewritten, stats.duplicates, stats.removed) == (5, 1, 2, 0)
+        duplicates = [json.loads(line) for line in report.getvalue().splitlines()]
+        assert [(row['id'], row['duplicate_of']) for row in duplicates] == [
+            (profiles[0].id, profiles[1].id), (profiles[3].id, profiles[2].id)
+        ]
+        assert await self._urls(db_session) == [
+            (profiles[0].id, 'https://www.twitter.com/TestUser/?utm_source=share'),
+            (profiles[1].id, 'https://twitter.com/testuser'),
+            (profiles[2].id, 'https://github.com/testuser'),
+            (profiles[3].id, 'https://www.github.com/testuser'),
+            (profiles[4].id, 'https://example.com/TestUser'),
+        ]
+
+    async def test_removes_duplicates(
+            self, db_engine: AsyncEngine, db_session: AsyncSession, profiles: list[SocialProfile]
+    ):
+        stats = await canonicalize_profile_urls(io.StringIO(), batch_size=2, remove_duplicates=True, db_engine=db_engine)
+
+        assert (stats.duplicates, stats.removed) == (2, 2)
+        assert await self._urls(db_session) == [
+            (profiles[1].id, 'https://twitter.com/testuser'),
+            (profiles[2].id, 'https://github.com/testuser'),
+            (profiles[4].id, 'https://example.com/TestUser'),
+        ]
+        hashes = (await db_session.scalars(text('SELECT url_hash = profile_url_hash(profile_url) FROM social_profiles'))).all()
+        assert hashes == [True] * 3
+
+    async def test_dry_run(self, db_engine: AsyncEngine, db_session: AsyncSession, profiles: list[SocialProfile]):
+        before = await self._urls(db_session)
+        stats = await canonicalize_profile_urls(
+            io.StringIO(), batch_size=2, remove_duplicates=True, dry_run=True, db_engine=db_engine
+        )
+
+        assert (stats.rewritten, stats.duplicates, stats.removed) == (1, 2, 2)
+        assert await self._urls(db_session) == before
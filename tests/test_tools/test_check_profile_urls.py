@@ -0,0 +1,88 @@
+import io
+import json
+
+import pytest
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from datetime import datetime, timedelta, timezone
+
+from app.backend.url_checker import UrlChecker
+from app.models.social_profile import SocialProfile
+from app.models.user import User
+from app.tools.check_profile_urls import check_profile_urls
+
+from tests.conftest import HttpStandIn
+
+pytestmark = pytest.mark.anyio
+
+
+class TestCheckProfileUrls:
+
+    @pytest.fixture(scope='function')
+    async def profiles(self, db_session: AsyncSession, test_user: User, http_stand_in: HttpStandIn) -> dict[str, int]:
+        paths = ['/status/200', '/head/405', '/status/404', '/drop', '/redirect/410']
+        profiles = [
+            SocialProfile(
+                user_id=test_user.id, platform='Twitter', profile_url=http_stand_in.url(path), profile_type='personal'
+            )
+            for path in paths
+        ]
+        db_session.add_all(profiles)
+        await db_session.commit()
+        return {path: profile.id for path, profile in zip(paths, profiles)}
+
+    async def _checks(self, db_session: AsyncSession) -> dict[int, tuple]:
+        rows = await db_session.execute(
+            select(SocialProfile.id, SocialProfile.status, SocialProfile.last_checked_at)
+            .execution_options(populate_existing=True)
+        )
+        return {profile_id: (status, checked_at) for profile_id, status, checked_at in rows}
+
+    async def test_records_status(
+            self, db_engine: AsyncEngine, db_session: AsyncSession, test_user: User, profiles: dict[str, int]
+    ):
+        await db_session.refresh(test_user)
+        version = test_user.profiles_version
+        report = io.StringIO()
+        async with UrlChecker(host_delay=0, allowed_networks=[HttpStandIn.network]) as checker:
+            stats = await check_profile_urls(checker, report, batch_size=2, db_engine=db_engine)
+
+        assert (stats.checked, stats.reachable, stats.unreachable) == (5, 2, 3)
+        assert stats.urls_per_second > 0
+
+        checks = await self._checks(db_session)
+        assert {path: checks[profile_id][0] for path, profile_id in profiles.items()} == {
+            '/status/200': 200, '/head/405': 200, '/status/404': 404, '/drop': None, '/redirect/410': 410
+        }
+        assert all(checked_at is not None for _, checked_at in checks.values())
+
+        rows = [json.loads(line) for line in report.getvalue().splitlines()]
+        assert {(row['id'], row['status'], row['error']) for row in rows} == {
+            (profiles['/status/404'], 404, None),
+            (profiles['/drop'], None, 'RemoteProtocolError'),
+            (profiles['/redirect/410'], 410, None),
+        }
+
+        # Recording checks does not change what owners see, so cached profile lists stay valid.
+        await db_session.refresh(test_user)
+        assert test_user.profiles_version == version
+
+    async def test_skips_fresh_checks(
+            self, db_engine: AsyncEngine, db_session: AsyncSession, profiles: dict[str, int], http_stand_in: HttpStandIn
+    ):
+        await db_session.execute(
+            update(SocialProfile)
+            .where(SocialProfile.id != profiles['/status/404'])
+            .values(last_checked_at=datetime.now(timezone.utc) - timedelta(hours=1), status=200)
+        )
+        await db_session.commit()
+
+        async with UrlChecker(host_delay=0, allowed_networks=[HttpStandIn.network]) as checker:
+            stats = await check_profile_urls(checker, io.StringIO(), max_age=timedelta(days=1), db_engine=db_engine)
+            assert stats.checked == 1
+            assert http_stand_in.requests == [('HEAD', '/status/404'), ('GET', '/status/404')]
+
+            stats = await check_profile_urls(checker, io.StringIO(), max_age=timedelta(0), db_engine=db_engine)
+            assert stats.checked == 5
@@ -0,0 +1,65 @@
+import io
+import json
+
+import pytest
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.models.user import User
+from app.routers.auth.utils import verify_password
+from app.tools.import_users import import_users
+
+pytestmark = pytest.mark.anyio
+
+CSV_HEADER = 'email,username,password,phone_number,date_of_birth\n'
+
+
+class TestImportUsers:
+
+    async def test_import_csv(self, db_engine: AsyncEngine, db_session: AsyncSession, test_user: User):
+        source = io.StringIO(
+            CSV_HEADER
+            + 'first@example.com,firstuser,Newpassword1!,+1000000001,1990-01-01\n'
+            + 'second@example.com,seconduser,Newpassword1!,+1000000002,1990-01-01\n'
+            + 'invalid-email,thirduser,Newpassword1!,+1000000003,1990-01-01\n'
+            + f'{test_user.email},fourthuser,Newpassword1!,+1000000004,1990-01-01\n'
+            + 'first@example.com,fifthuser,Newpassword1!,+1000000005,1990-01-01\n'
+            + 'sixth@example.com,sixthuser,Newpassword1!,+1000000006,1990-01-01\n'
+        )
+        report = io.StringIO()
+
+        stats = await import_users(source, 'csv', report, batch_size=2, workers=2, db_engine=db_engine)
+
+        assert (stats.read, stats.inserted, stats.invalid, stats.conflicts) == (6, 3, 1, 2)
+        assert stats.rows_per_second > 0
+
+        rejected = {row['line']: row['error'] for row in map(json.loads, report.getvalue().splitlines())}
+        assert set(rejected) == {4, 5, 6}
+        assert rejected[4].startswith('email:')
+        assert rejected[5] == 'email already registered'
+        assert rejected[6] == 'email already registered'
+
+        emails = set(await db_session.scalars(select(User.email)))
+        assert emails == {test_user.email, 'first@example.com', 'second@example.com', 'sixth@example.com'}
+
+        user = await db_session.scalar(select(User).where(User.email == 'first@example.com'))
+        assert user.username == 'firstuser'
+        assert verify_password('Newpassword1!', user.password) is True
+
+    async def test_import_ndjson(self, db_engine: AsyncEngine, db_session: AsyncSession):
+        rows = [
+            {'email': 'first@example.com', 'username': 'firstuser', 'password': 'Newpassword1!',
+             'phone_number': '+1000000001', 'date_of_birth': '1990-01-01'},
+            {'email': 'second@example.com', 'username': 'firstuser', 'password': 'Newpassword1!',
+             'phone_number': '+1000000002', 'date_of_birth': '1990-01-01'},
+        ]
+        source = io.StringIO('\n'.join(map(json.dumps, rows)) + '\nnot json\n')
+        report = io.StringIO()
+
+        stats = await import_users(source, 'ndjson', report, batch_size=10, workers=1, db_engine=db_engine)
+
+        assert (stats.read, stats.inserted, stats.invalid, stats.conflicts) == (3, 1, 2, 0)
+        rejected = [json.loads(row) for row in report.getvalue().splitlines()]
+        assert rejected[0] == {'line': 2, 'error': 'username repeated in file'}
+        assert rejected[1]['line'] == 3
@@ -0,0 +1,58 @@
+import io
+import json
+
+import pytest
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.models.profile_stat import ProfileStat
+from app.models.social_profile import SocialProfile
+from app.models.user import User
+from app.tools.verify_profile_stats import verify_profile_stats
+
+pytestmark = pytest.mark.anyio
+
+
+class TestVerifyProfileStats:
+
+    async def _stats(self, db_session: AsyncSession) -> set[tuple]:
+        return set(map(tuple, await db_session.execute(
+            select(ProfileStat.user_id, ProfileStat.platform, ProfileStat.profile_type, ProfileStat.profile_count)
+        )))
+
+    @pytest.fixture(scope='function')
+    async def drifted(self, db_session: AsyncSession, test_user: User, test_social_profiles: list[SocialProfile]) -> set:
+        expected = await self._stats(db_session)
+
+        # Counters changed outside the triggers: one wrong, one missing and one stale.
+        await db_session.execute(text('UPDATE profile_stats SET profile_count = 5 WHERE profile_type = \'personal\''))
+        await db_session.execute(text('DELETE FROM profile_stats WHERE profile_type = \'business\''))
+        await db_session.execute(text('''
+            INSERT INTO profile_stats (user_id, platform, profile_type, profile_count)
+            SELECT :user_id, platform_code('Github'), 'creator', 2
+        '''), {'user_id': test_user.id})
+        await db_session.commit()
+        return expected
+
+    async def test_repairs_drift(self, db_engine: AsyncEngine, db_session: AsyncSession, drifted: set, test_user: User):
+        report = io.StringIO()
+        stats = await verify_profile_stats(report, batch_size=1, db_engine=db_engine)
+
+        assert (stats.users, stats.drifted, stats.repaired) == (1, 3, 3)
+        assert await self._stats(db_session) == drifted
+
+        rows = [json.loads(line) for line in report.getvalue().splitlines()]
+        assert {(row['platform'], row['profile_type'], row['stored'], row['actual']) for row in rows} == {
+            ('Twitter', 'personal', 5, 1), ('Facebook', 'business', None, 1), ('Github', 'creator', 2, None)
+        }
+
+        stats = await verify_profile_stats(io.StringIO(), db_engine=db_engine)
+        assert stats.drifted == 0
+
+    async def test_dry_run(self, db_engine: AsyncEngine, db_session: AsyncSession, drifted: set):
+        before = await self._stats(db_session)
+        stats = await verify_profile_stats(io.StringIO(), dry_run=True, db_engine=db_engine)
+
+        assert (stats.drifted, stats.repaired) == (3, 0)
+        assert await self._stats(db_session) == before